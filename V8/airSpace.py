@@ -1,9 +1,35 @@
-from navPoint import NavPoint, LoadNavPoints, PlotNavPoint
-from navSegment import NavSegment, LoadNavSegments, PlotNavSegment
+from navPoint import NavPoint, NavPointsFromColumns, PlotNavPoint
+from navSegment import NavSegment, LinkNavSegments, PlotNavSegment
 from navAirport import NavAirport, LoadNavAirports, PlotNavAirport
-import matplotlib.pyplot as plt
-from typing import Optional, Tuple, List
+from navStore import NavStore, StringTable
+from bulkParser import ParseNavPoints, ParseNavSegments
+from csrGraph import CSRGraph
+from spatialIndex import GeoIndex
+from snapshot import SnapshotPath, SourceKey, SourcesMatch, WriteSnapshot, ReadSnapshot
+from dataSource import IsPath, OpenArchive
+from loadProgress import LoadProgress
+from typing import Optional, Tuple, List, Dict
 import numpy as np
+import gc
+import os
+from contextlib import contextmanager
+
+# Average memory per object including its lookup index entries, measured with
+# tracemalloc on a synthetic 20k point / 100k segment airspace
+_POINT_BYTES = 500
+_SEGMENT_BYTES = 250
+_AIRPORT_BYTES = 1000
+
+@contextmanager
+def _gc_paused():
+    """Disable the cyclic garbage collector for the duration of a bulk load."""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
 
 class AirSpace:
     def __init__(self, name: str = "AirSpace"):
@@ -13,41 +39,543 @@ class AirSpace:
             name (str): Name of the airspace (e.g., "Catalunya", "España", "Europe")
         """
         self.name = name
-        self.nav_points: List[NavPoint] = []
-        self.nav_segments: List[NavSegment] = []
-        self.nav_airports: List[NavAirport] = []
+        self._nav_points: List[NavPoint] = []
+        self._nav_segments: List[NavSegment] = []
+        self._nav_airports: List[NavAirport] = []
+        self._mapped = None  # Arrays of a mapped file whose objects have not been built yet
+        
+        # Lookup indexes, rebuilt by load_data and kept in sync by the add_/remove_ methods
+        self._points_by_number: Dict[int, NavPoint] = {}
+        self._points_by_name: Dict[str, NavPoint] = {}
+        self._airports_by_icao: Dict[str, NavAirport] = {}
+        self._segments_from: Dict[int, List[NavSegment]] = {}
+        self._segments_to: Dict[int, List[NavSegment]] = {}
+        
+        # Bumped on every change so that derived structures know when to rebuild
+        self._version = 0
+        self._store = None
+        self._store_version = -1
+        self._graph = None
+        self._graph_version = -1
+        self._spatial_index = None
+        self._spatial_index_version = -1
+        self._hierarchy = None  # Contraction hierarchy, kept (possibly stale) across changes
+        
+    @property
+    def nav_points(self) -> List[NavPoint]:
+        """Navigation points (built on first access for airspaces opened from a file)."""
+        self._materialize()
+        return self._nav_points
+        
+    @nav_points.setter
+    def nav_points(self, value: List[NavPoint]):
+        self._materialize()
+        self._nav_points = value
         
-    def load_data(self, nav_file: str, seg_file: str, aer_file: str) -> bool:
+    @property
+    def nav_segments(self) -> List[NavSegment]:
+        """Navigation segments (built on first access for airspaces opened from a file)."""
+        self._materialize()
+        return self._nav_segments
+        
+    @nav_segments.setter
+    def nav_segments(self, value: List[NavSegment]):
+        self._materialize()
+        self._nav_segments = value
+        
+    @property
+    def nav_airports(self) -> List[NavAirport]:
+        """Airports (built on first access for airspaces opened from a file)."""
+        self._materialize()
+        return self._nav_airports
+        
+    @nav_airports.setter
+    def nav_airports(self, value: List[NavAirport]):
+        self._materialize()
+        self._nav_airports = value
+        
+    def load_data(self, nav_file, seg_file, aer_file, use_snapshot: bool = True,
+                  progress: LoadProgress = None) -> bool:
         """Load all airspace data from files.
         
+        After a successful parse a binary snapshot is written next to nav_file
+        (see snapshot.py). Later loads memory-map the snapshot instead of
+        parsing the text files, as long as none of the three files changed.
+        
+        Each source may be a path (.gz/.xz/.bz2 files are decompressed while
+        parsing) or an open file such as an archive member; snapshots are only
+        used when all three are paths.
+        
         Args:
-            nav_file (str): Path to navigation points file
-            seg_file (str): Path to segments file
-            aer_file (str): Path to airports file
+            nav_file: Path to navigation points file
+            seg_file: Path to segments file
+            aer_file: Path to airports file
+            use_snapshot (bool): Read and write the binary snapshot
+            progress (LoadProgress): Receives the current phase and lines read
             
         Returns:
             bool: True if all files were loaded successfully
+            
+        Raises:
+            LoadCancelled: If progress was cancelled; the airspace is then
+                partially loaded and should be discarded
         """
+        progress = progress or LoadProgress()
+        sources = [nav_file, seg_file, aer_file]
+        use_snapshot = use_snapshot and all(IsPath(source) for source in sources)
+        self._mapped = None  # Replaced below, no need to build its objects
+        # Building millions of linked objects triggers needless cyclic GC passes
+        with _gc_paused():
+            snapshot_path = SnapshotPath(nav_file) if use_snapshot else None
+            if use_snapshot:
+                progress.start_phase("Reading snapshot")
+                if self._load_snapshot(snapshot_path, sources):
+                    return True
+            source_keys = self._source_keys(sources) if use_snapshot else None
+            return self._parse_sources(nav_file, seg_file, aer_file, snapshot_path, source_keys, progress)
+        
+    def load_archive(self, path: str, use_snapshot: bool = True, progress: LoadProgress = None) -> bool:
+        """Load an airspace from a zip or tar archive without extracting it.
+        
+        The archive must hold *_nav.txt, *_seg.txt and *_aer.txt members (e.g.
+        Spain_graph.zip); tar archives may be .gz, .xz or .bz2 compressed.
+        Members are decompressed straight into the parsers. The snapshot is
+        written next to the archive and keyed by the archive file.
+        
+        Args:
+            path (str): Archive file
+            use_snapshot (bool): Read and write the binary snapshot
+            progress (LoadProgress): Receives the current phase and lines read
+            
+        Returns:
+            bool: True if the archive was loaded successfully
+            
+        Raises:
+            LoadCancelled: If progress was cancelled
+        """
+        import tarfile
+        import zipfile
+        progress = progress or LoadProgress()
+        self._mapped = None
+        with _gc_paused():
+            snapshot_path = SnapshotPath(path)
+            if use_snapshot:
+                progress.start_phase("Reading snapshot")
+                if self._load_snapshot(snapshot_path, [path]):
+                    return True
+            source_keys = self._source_keys([path]) if use_snapshot else None
+            try:
+                with OpenArchive(path) as members:
+                    return self._parse_sources(members['nav'], members['seg'], members['aer'],
+                                               snapshot_path, source_keys, progress)
+            except (OSError, ValueError, EOFError, zipfile.BadZipFile, tarfile.TarError) as e:
+                print(f"Error reading archive '{path}': {e}")
+                return False
+        
+    @staticmethod
+    def _source_keys(paths: list) -> Optional[list]:
+        """SourceKeys taken before parsing, so a file changed meanwhile invalidates the snapshot."""
+        try:
+            return [SourceKey(path) for path in paths]
+        except OSError:
+            return None
+        
+    def _parse_sources(self, nav_source, seg_source, aer_source, snapshot_path: str, source_keys: list,
+                       progress: LoadProgress) -> bool:
+        """Parse the three text sources, then write the snapshot if source_keys is set."""
         # Load navigation points first
-        self.nav_points = LoadNavPoints(nav_file)
+        progress.start_phase("Parsing navigation points")
+        points, report = ParseNavPoints(nav_source, progress)
+        if not report.ok:
+            print(report)
+        self.nav_points = NavPointsFromColumns(points)
         if not self.nav_points:
             print("Error: Failed to load navigation points")
             return False
-            
+        
         # Load segments (requires nav_points)
-        self.nav_segments = LoadNavSegments(seg_file, self.nav_points)
+        progress.start_phase("Parsing segments")
+        segments, report = ParseNavSegments(seg_source, progress)
+        if not report.ok:
+            print(report)
+        self.nav_segments = LinkNavSegments(segments, self.nav_points)
         if not self.nav_segments:
             print("Error: Failed to load navigation segments")
             return False
-            
+        
         # Load airports (requires nav_points)
-        self.nav_airports = LoadNavAirports(aer_file, self.nav_points)
+        progress.start_phase("Parsing airports")
+        self.nav_airports = LoadNavAirports(aer_source, self.nav_points, progress)
         if not self.nav_airports:
             print("Error: Failed to load airports")
             return False
+        
+        progress.start_phase("Building indexes")
+        self._build_indexes()
+        # The parsed columns already hold the store, no need to gather it back from the objects
+        self._store = NavStore.from_columns(points, segments, self._nav_airports)
+        self._store_version = self._version
+        if source_keys is not None:
+            progress.start_phase("Writing snapshot")
+            self.save(snapshot_path, source_keys)
+        return True
+        
+    def save(self, path: str, source_keys: list = ()) -> bool:
+        """Write the airspace to a memory-mappable binary file.
+        
+        Besides the point, segment and airport sections the file holds the
+        compiled CSR graph and the number index, so AirSpace.open can serve
+        get_store(), get_graph() and routing straight from the mapped pages.
+        
+        Args:
+            path (str): File to write
+            source_keys (list): snapshot.SourceKey of each file the data came from,
+                used to validate snapshots written by load_data
             
+        Returns:
+            bool: True if the file was written
+        """
+        store = self.get_store()
+        graph = self.get_graph()
+        sids = [airport.sids for airport in self.nav_airports]
+        stars = [airport.stars for airport in self.nav_airports]
+        airport_names = StringTable.from_strings(airport.name for airport in self.nav_airports)
+        sid_table = StringTable.from_strings(name for names in sids for name in names)
+        star_table = StringTable.from_strings(name for names in stars for name in names)
+        arrays = {
+            'numbers': store.numbers, 'latitudes': store.latitudes, 'longitudes': store.longitudes,
+            'number_order': np.argsort(store.numbers, kind='stable'),
+            'name_offsets': store.names.offsets, 'name_data': store.names.data,
+            'seg_origins': store.seg_origins, 'seg_destinations': store.seg_destinations,
+            'seg_distances': store.seg_distances,
+            'airport_icao_offsets': store.airport_icaos.offsets, 'airport_icao_data': store.airport_icaos.data,
+            'airport_points': store.airport_points,
+            'airport_name_offsets': airport_names.offsets, 'airport_name_data': airport_names.data,
+            'airport_coordinates': np.array([(a.latitude, a.longitude, a.elevation) for a in self.nav_airports],
+                                            dtype=np.float64).reshape(-1, 3),
+            'sid_starts': np.cumsum([0] + [len(names) for names in sids], dtype=np.int64),
+            'sid_offsets': sid_table.offsets, 'sid_data': sid_table.data,
+            'star_starts': np.cumsum([0] + [len(names) for names in stars], dtype=np.int64),
+            'star_offsets': star_table.offsets, 'star_data': star_table.data,
+        }
+        arrays.update({f"csr_{name}": a for name, a in graph.arrays().items()})
+        try:
+            WriteSnapshot(path, arrays, list(source_keys), meta={'name': self.name})
+        except OSError as e:
+            print(f"Warning: could not write snapshot '{path}': {e}")
+            return False
         return True
         
+    @classmethod
+    def open(cls, path: str, name: str = None) -> 'AirSpace':
+        """Open an airspace file written by save() without deserializing it.
+        
+        The file is memory-mapped, so opening takes about the same time for any
+        size and processes opening the same file share one copy in the page
+        cache. get_store(), get_graph(), get_spatial_index() and routing work on
+        the mapped arrays; the NavPoint/NavSegment/NavAirport objects are only
+        built the first time the object API (nav_points, get_nav_point, ...) is used.
+        
+        Args:
+            path (str): File written by AirSpace.save or load_data
+            name (str): Airspace name, defaults to the name stored in the file
+            
+        Returns:
+            AirSpace: The mapped airspace
+            
+        Raises:
+            ValueError: If the file is not a valid airspace file
+        """
+        header, arrays = ReadSnapshot(path)
+        airspace = cls(name or header['meta'].get('name', "AirSpace"))
+        try:
+            airspace._attach(arrays)
+        except KeyError as e:
+            raise ValueError(f"'{path}' is missing the {e} section")
+        return airspace
+        
+    def _load_snapshot(self, path: str, sources: list) -> bool:
+        """Map a snapshot in place of the airspace contents if it matches the source files."""
+        if not os.path.exists(path):
+            return False
+        try:
+            header, arrays = ReadSnapshot(path)
+        except (OSError, ValueError) as e:
+            print(f"Warning: ignoring snapshot '{path}': {e}")
+            return False
+        if not SourcesMatch(header['sources'], sources):
+            return False
+        try:
+            self._attach(arrays)
+        except KeyError as e:
+            print(f"Warning: ignoring snapshot '{path}': missing the {e} section")
+            return False
+        return True
+        
+    def _attach(self, arrays: dict):
+        """Use mapped arrays as the store and graph; objects are built later by _materialize."""
+        store = NavStore(arrays['numbers'], arrays['latitudes'], arrays['longitudes'],
+                         StringTable(arrays['name_offsets'], arrays['name_data']),
+                         arrays['seg_origins'], arrays['seg_destinations'], arrays['seg_distances'],
+                         StringTable(arrays['airport_icao_offsets'], arrays['airport_icao_data']),
+                         arrays['airport_points'])
+        store._number_order = arrays['number_order']
+        graph = CSRGraph.from_arrays(len(store), {name[4:]: a for name, a in arrays.items()
+                                                  if name.startswith('csr_')},
+                                     store.latitudes, store.longitudes)
+        for name in ('airport_name_offsets', 'airport_name_data', 'airport_coordinates', 'sid_starts',
+                     'sid_offsets', 'sid_data', 'star_starts', 'star_offsets', 'star_data'):
+            arrays[name]  # Fail now rather than on first access
+            
+        self._nav_points, self._nav_segments, self._nav_airports = [], [], []
+        self._mapped = arrays
+        self._index_objects()
+        self._version += 1
+        self._store, self._store_version = store, self._version
+        self._graph, self._graph_version = graph, self._version
+        
+    def materialize(self):
+        """Build the objects of a mapped file now instead of on first access.
+        
+        Call it in a worker thread before handing the airspace to code (like the
+        Tk main loop) that should not pay for building them.
+        """
+        self._materialize()
+        
+    def _materialize(self):
+        """Build the NavPoint, NavSegment and NavAirport objects of a mapped file."""
+        if self._mapped is None:
+            return
+        arrays, self._mapped = self._mapped, None
+        with _gc_paused():
+            names = StringTable(arrays['name_offsets'], arrays['name_data'])
+            points = [NavPoint(number, name, lat, lon) for number, name, lat, lon in
+                      zip(arrays['numbers'].tolist(), names, arrays['latitudes'].tolist(),
+                          arrays['longitudes'].tolist())]
+            
+            segments = []
+            append = segments.append
+            for i, j, distance in zip(arrays['seg_origins'].tolist(), arrays['seg_destinations'].tolist(),
+                                      arrays['seg_distances'].tolist()):
+                origin, destination = points[i], points[j]
+                segment = NavSegment(origin.number, destination.number, distance)
+                segment.origin, segment.destination = origin, destination
+                origin.neighbors.append(destination)
+                append(segment)
+                
+            sids = list(StringTable(arrays['sid_offsets'], arrays['sid_data']))
+            stars = list(StringTable(arrays['star_offsets'], arrays['star_data']))
+            sid_starts, star_starts = arrays['sid_starts'].tolist(), arrays['star_starts'].tolist()
+            airports = []
+            for i, (icao, name, (lat, lon, elevation), point) in enumerate(zip(
+                    StringTable(arrays['airport_icao_offsets'], arrays['airport_icao_data']),
+                    StringTable(arrays['airport_name_offsets'], arrays['airport_name_data']),
+                    arrays['airport_coordinates'].tolist(), arrays['airport_points'].tolist())):
+                airport = NavAirport(icao, name, lat, lon, elevation, points[point] if point >= 0 else None)
+                airport.sids = sids[sid_starts[i]:sid_starts[i + 1]]
+                airport.stars = stars[star_starts[i]:star_starts[i + 1]]
+                airports.append(airport)
+                
+            self._nav_points, self._nav_segments, self._nav_airports = points, segments, airports
+            # Same data as the mapped store and graph, so the version stays the same
+            self._index_objects()
+        
+    def _build_indexes(self):
+        """Rebuild the lookup indexes after the object lists were replaced."""
+        self._index_objects()
+        self._version += 1
+        
+    def _index_objects(self):
+        """Rebuild the number/name/ICAO indexes and the forward/reverse adjacency tables."""
+        self._points_by_number = {}
+        self._points_by_name = {}
+        for point in self._nav_points:
+            # Keep the first occurrence, like the old linear scans did
+            self._points_by_number.setdefault(point.number, point)
+            self._points_by_name.setdefault(point.name, point)
+            
+        self._airports_by_icao = {}
+        for airport in self._nav_airports:
+            self._airports_by_icao.setdefault(airport.icao, airport)
+            
+        self._segments_from = {}
+        self._segments_to = {}
+        for segment in self._nav_segments:
+            self._segments_from.setdefault(segment.origin_number, []).append(segment)
+            self._segments_to.setdefault(segment.destination_number, []).append(segment)
+            
+    def add_nav_point(self, point: NavPoint) -> bool:
+        """Add a navigation point to the airspace.
+        
+        Args:
+            point (NavPoint): Navigation point to add
+            
+        Returns:
+            bool: False if a point with the same number already exists
+        """
+        self._materialize()
+        if point.number in self._points_by_number:
+            return False
+        self.nav_points.append(point)
+        self._points_by_number[point.number] = point
+        self._points_by_name.setdefault(point.name, point)
+        self._version += 1
+        return True
+        
+    def add_segment(self, segment: NavSegment) -> bool:
+        """Add a segment between two existing navigation points.
+        
+        Args:
+            segment (NavSegment): Segment to add
+            
+        Returns:
+            bool: False if either end point is not part of the airspace
+        """
+        self._materialize()
+        origin = self._points_by_number.get(segment.origin_number)
+        destination = self._points_by_number.get(segment.destination_number)
+        if origin is None or destination is None:
+            return False
+        segment.origin = origin
+        segment.destination = destination
+        origin.neighbors.append(destination)
+        self.nav_segments.append(segment)
+        self._segments_from.setdefault(segment.origin_number, []).append(segment)
+        self._segments_to.setdefault(segment.destination_number, []).append(segment)
+        self._version += 1
+        return True
+        
+    def remove_segment(self, segment: NavSegment) -> bool:
+        """Remove a segment from the airspace.
+        
+        Args:
+            segment (NavSegment): Segment to remove (matched by origin and destination)
+            
+        Returns:
+            bool: False if the segment was not found
+        """
+        self._materialize()
+        outgoing = self._segments_from.get(segment.origin_number, [])
+        if segment not in outgoing:
+            return False
+        stored = outgoing[outgoing.index(segment)]
+        outgoing.remove(stored)
+        self._segments_to[segment.destination_number].remove(stored)
+        self.nav_segments.remove(stored)
+        if stored.origin is not None and stored.destination in stored.origin.neighbors:
+            stored.origin.neighbors.remove(stored.destination)
+        self._version += 1
+        return True
+        
+    def add_airport(self, airport: NavAirport) -> bool:
+        """Add an airport to the airspace.
+        
+        Args:
+            airport (NavAirport): Airport to add
+            
+        Returns:
+            bool: False if an airport with the same ICAO code already exists
+        """
+        self._materialize()
+        if airport.icao in self._airports_by_icao:
+            return False
+        self.nav_airports.append(airport)
+        self._airports_by_icao[airport.icao] = airport
+        self._version += 1
+        return True
+        
+    def get_store(self) -> NavStore:
+        """Get the columnar (struct-of-arrays) view of the airspace.
+        
+        The store is built on first use and rebuilt after any change made
+        through the add_/remove_ methods or load_data.
+        
+        Returns:
+            NavStore: Arrays of point coordinates, segment indices and distances
+        """
+        if self._store is None or self._store_version != self._version:
+            self._store = NavStore.from_objects(self.nav_points, self.nav_segments, self.nav_airports)
+            self._store_version = self._version
+        return self._store
+        
+    def get_graph(self) -> CSRGraph:
+        """Get the compiled routing graph of the airspace.
+        
+        The segments are compiled once into forward and reverse CSR arrays
+        (see csrGraph.CSRGraph) whose nodes are the row indices of get_store().
+        The graph is cached and recompiled after any change to the airspace.
+        
+        Returns:
+            CSRGraph: Compressed-sparse-row graph of the segments
+        """
+        if self._graph is None or self._graph_version != self._version:
+            self._graph = CSRGraph.from_store(self.get_store())
+            self._graph_version = self._version
+        return self._graph
+        
+    def get_spatial_index(self) -> GeoIndex:
+        """Get the spatial index of the navigation points.
+        
+        The index is built on first use over the rows of get_store() (row i is
+        nav_points[i]) and rebuilt after any change to the airspace.
+        
+        Returns:
+            GeoIndex: Grid index answering nearest, radius and box queries
+        """
+        if self._spatial_index is None or self._spatial_index_version != self._version:
+            store = self.get_store()
+            self._spatial_index = GeoIndex(store.latitudes, store.longitudes)
+            self._spatial_index_version = self._version
+        return self._spatial_index
+        
+    def find_nearest(self, latitude: float, longitude: float, k: int = 1) -> List[Tuple[NavPoint, float]]:
+        """Find the navigation points closest to a position.
+        
+        Args:
+            latitude (float): Latitude in degrees
+            longitude (float): Longitude in degrees
+            k (int): Number of points to return
+            
+        Returns:
+            List[Tuple[NavPoint, float]]: Up to k (point, distance in km) pairs, nearest first
+        """
+        indices, distances = self.get_spatial_index().nearest(latitude, longitude, k)
+        return [(self.nav_points[i], float(d)) for i, d in zip(indices.tolist(), distances)]
+        
+    def get_closest(self, latitude: float, longitude: float) -> Optional[NavPoint]:
+        """Get the navigation point closest to a position, or None if there are no points."""
+        nearest = self.find_nearest(latitude, longitude, 1)
+        return nearest[0][0] if nearest else None
+        
+    def find_within(self, latitude: float, longitude: float, radius_km: float) -> List[Tuple[NavPoint, float]]:
+        """Find the navigation points at most radius_km from a position.
+        
+        Args:
+            latitude (float): Latitude in degrees
+            longitude (float): Longitude in degrees
+            radius_km (float): Search radius in kilometers
+            
+        Returns:
+            List[Tuple[NavPoint, float]]: (point, distance in km) pairs, nearest first
+        """
+        indices, distances = self.get_spatial_index().within_radius(latitude, longitude, radius_km)
+        return [(self.nav_points[i], float(d)) for i, d in zip(indices.tolist(), distances)]
+        
+    def find_in_box(self, lat_min: float, lat_max: float, lon_min: float, lon_max: float) -> List[NavPoint]:
+        """Find the navigation points inside a latitude/longitude box.
+        
+        Args:
+            lat_min (float): Southern edge in degrees
+            lat_max (float): Northern edge in degrees
+            lon_min (float): Western edge in degrees
+            lon_max (float): Eastern edge in degrees
+            
+        Returns:
+            List[NavPoint]: Points inside the box, in file order
+        """
+        indices = self.get_spatial_index().in_box(lat_min, lat_max, lon_min, lon_max)
+        return [self.nav_points[i] for i in indices.tolist()]
+        
     def get_nav_point(self, number: int) -> Optional[NavPoint]:
         """Get a navigation point by its number.
         
@@ -57,10 +585,20 @@ class AirSpace:
         Returns:
             Optional[NavPoint]: The navigation point if found, None otherwise
         """
-        for point in self.nav_points:
-            if point.number == number:
-                return point
-        return None
+        self._materialize()
+        return self._points_by_number.get(number)
+        
+    def get_nav_point_by_name(self, name: str) -> Optional[NavPoint]:
+        """Get a navigation point by its name.
+        
+        Args:
+            name (str): Navigation point name
+            
+        Returns:
+            Optional[NavPoint]: The navigation point if found, None otherwise
+        """
+        self._materialize()
+        return self._points_by_name.get(name)
         
     def get_airport(self, icao: str) -> Optional[NavAirport]:
         """Get an airport by its ICAO code.
@@ -71,10 +609,8 @@ class AirSpace:
         Returns:
             Optional[NavAirport]: The airport if found, None otherwise
         """
-        for airport in self.nav_airports:
-            if airport.icao == icao:
-                return airport
-        return None
+        self._materialize()
+        return self._airports_by_icao.get(icao)
         
     def get_segments_from(self, origin_number: int) -> List[NavSegment]:
         """Get all segments starting from a navigation point.
@@ -85,7 +621,8 @@ class AirSpace:
         Returns:
             List[NavSegment]: List of segments starting from the origin
         """
-        return [seg for seg in self.nav_segments if seg.origin_number == origin_number]
+        self._materialize()
+        return list(self._segments_from.get(origin_number, ()))
         
     def get_segments_to(self, destination_number: int) -> List[NavSegment]:
         """Get all segments ending at a navigation point.
@@ -96,7 +633,128 @@ class AirSpace:
         Returns:
             List[NavSegment]: List of segments ending at the destination
         """
-        return [seg for seg in self.nav_segments if seg.destination_number == destination_number]
+        self._materialize()
+        return list(self._segments_to.get(destination_number, ()))
+        
+    def get_reachable(self, origin_numbers, max_hops: int = None,
+                      max_distance: float = None) -> np.ndarray:
+        """Find the navigation points reachable from one or more origins.
+        
+        Args:
+            origin_numbers: A navigation number or a list of them
+            max_hops (int): Only follow routes of at most this many segments
+            max_distance (float): Only keep points at most this many km away
+            
+        Returns:
+            np.ndarray: Boolean mask over the rows of get_store(), True for
+                reachable points (origins included)
+        """
+        from reachability import ReachableMask
+        store = self.get_store()
+        sources = store.indices_of(np.atleast_1d(origin_numbers))
+        if (sources < 0).any():
+            raise ValueError(f"Point {np.atleast_1d(origin_numbers)[sources < 0][0]} not found")
+        return ReachableMask(self.get_graph(), sources, max_hops=max_hops, max_distance=max_distance)
+
+    def get_distance_matrix(self, icaos: List[str] = None, workers: int = None, use_cache: bool = True,
+                            cache_dir: str = None):
+        """Shortest route distances between airports, from their SIDs to their STARs.
+        
+        Runs one Dijkstra per origin airport on a process pool. The result is
+        kept with the compiled graph and written to a compressed file in the
+        routing cache (see routeCache.py), keyed by the dataset version, so
+        later runs load it instead of recomputing it.
+        
+        Args:
+            icaos (List[str]): Airports of the rows and columns, all by default
+            workers (int): Worker processes, one per CPU by default
+            use_cache (bool): Read and write the routing cache file
+            cache_dir (str): Routing cache directory
+        
+        Returns:
+            DistanceMatrix: distances (NumPy array, km) and predecessor trees
+        
+        Raises:
+            ValueError: If an airport does not exist
+        """
+        from distanceMatrix import ComputeDistanceMatrix
+        graph = self.get_graph()
+        if icaos is None and 'distance_matrix' in graph.cache:
+            return graph.cache['distance_matrix']
+        matrix = ComputeDistanceMatrix(self, icaos, workers=workers, use_cache=use_cache, cache_dir=cache_dir)
+        if icaos is None:
+            graph.cache['distance_matrix'] = matrix
+        return matrix
+        
+    def get_landmarks(self, count: int = None, method: str = 'farthest', use_cache: bool = True,
+                      cache_dir: str = None):
+        """Landmark distance arrays for ALT routing (see landmarks.py).
+        
+        Built on first use and kept with the compiled graph; the arrays are
+        also written to the routing cache, keyed by the dataset version.
+        
+        Args:
+            count (int): Number of landmarks, landmarks.DEFAULT_LANDMARKS by default
+            method (str): 'farthest' or 'airports'
+            use_cache (bool): Read and write the routing cache file
+            cache_dir (str): Routing cache directory
+        
+        Returns:
+            LandmarkTable: Landmarks with their forward and backward distances
+        """
+        from landmarks import BuildLandmarks, DEFAULT_LANDMARKS
+        count = count or DEFAULT_LANDMARKS
+        graph = self.get_graph()
+        key = ('landmarks', count, method)
+        if key not in graph.cache:
+            graph.cache[key] = BuildLandmarks(self, count, method, use_cache=use_cache, cache_dir=cache_dir)
+        return graph.cache[key]
+        
+    def build_contraction_hierarchy(self, use_cache: bool = True, cache_dir: str = None):
+        """Contract the graph for fast queries (see contraction.py), or load the cached hierarchy.
+        
+        The hierarchy stays attached to the airspace after later changes;
+        routing with a stale hierarchy falls back to Dijkstra until this is
+        called again.
+        
+        Args:
+            use_cache (bool): Read and write the routing cache file
+            cache_dir (str): Routing cache directory
+            
+        Returns:
+            ContractionHierarchy: The hierarchy of the current graph
+        """
+        from contraction import ContractionHierarchy, BuildContractionHierarchy
+        from routeCache import DatasetVersion, CachePath
+        version = DatasetVersion(self)
+        if self._hierarchy is not None and self._hierarchy.version == version:
+            return self._hierarchy
+        path = CachePath(self, "hierarchy", version, cache_dir)
+        hierarchy = ContractionHierarchy.load(path) if use_cache else None
+        if hierarchy is None or hierarchy.version != version:
+            hierarchy = BuildContractionHierarchy(self.get_graph(), version)
+            if use_cache:
+                hierarchy.save(path)
+        self._hierarchy = hierarchy
+        return hierarchy
+        
+    def load_contraction_hierarchy(self, path: str) -> bool:
+        """Attach a hierarchy saved with ContractionHierarchy.save.
+        
+        Returns:
+            bool: True if it was read and matches the current graph
+        """
+        from contraction import ContractionHierarchy
+        from routeCache import DatasetVersion
+        hierarchy = ContractionHierarchy.load(path)
+        if hierarchy is None:
+            return False
+        self._hierarchy = hierarchy
+        return hierarchy.version == DatasetVersion(self)
+        
+    def get_contraction_hierarchy(self):
+        """The attached contraction hierarchy (possibly stale), or None."""
+        return self._hierarchy
         
     def plot(self, show_points: bool = True, show_segments: bool = True,
              show_airports: bool = True, figsize: Tuple[int, int] = (12, 8),
@@ -104,19 +762,21 @@ class AirSpace:
              airport_color: str = 'red', point_size: int = 20,
              segment_width: float = 0.5, airport_size: int = 100,
              point_alpha: float = 0.6, segment_alpha: float = 0.3,
-             airport_alpha: float = 0.8, fig: plt.Figure = None, ax: plt.Axes = None) -> plt.Figure:
+             airport_alpha: float = 0.8, fig: 'plt.Figure' = None, ax: 'plt.Axes' = None) -> 'plt.Figure':
         """Plot the entire airspace system."""
+        import matplotlib.pyplot as plt
         if fig is None or ax is None:
             fig = plt.figure(figsize=figsize)
             ax = fig.add_subplot(111)
 
+        store = self.get_store()
+        airport_lats = np.array([airport.latitude for airport in self.nav_airports], dtype=np.float64)
+        airport_lons = np.array([airport.longitude for airport in self.nav_airports], dtype=np.float64)
+
         # Calculate the bounds of the airspace, ignoring outliers
-        if self.nav_points:
-            lats = np.array([point.latitude for point in self.nav_points])
-            lons = np.array([point.longitude for point in self.nav_points])
-            if self.nav_airports:
-                lats = np.concatenate([lats, [airport.latitude for airport in self.nav_airports]])
-                lons = np.concatenate([lons, [airport.longitude for airport in self.nav_airports]])
+        if len(store):
+            lats = np.concatenate([store.latitudes, airport_lats])
+            lons = np.concatenate([store.longitudes, airport_lons])
             
             # Compute mean and std
             lat_mean, lat_std = np.mean(lats), np.std(lats)
@@ -125,42 +785,50 @@ class AirSpace:
             # Use only points within 2 std of the mean for axis limits
             lat_mask = (lats > lat_mean - 2*lat_std) & (lats < lat_mean + 2*lat_std)
             lon_mask = (lons > lon_mean - 2*lon_std) & (lons < lon_mean + 2*lon_std)
-            lats_in = lats[lat_mask]
-            lons_in = lons[lon_mask]
+            lats_in = lats[lat_mask] if lat_mask.any() else lats
+            lons_in = lons[lon_mask] if lon_mask.any() else lons
             
             # Add more padding to the longitude axis
-            lat_padding = (max(lats_in) - min(lats_in)) * 0.1
-            lon_padding = (max(lons_in) - min(lons_in)) * 0.25
+            lat_padding = (lats_in.max() - lats_in.min()) * 0.1
+            lon_padding = (lons_in.max() - lons_in.min()) * 0.25
             
             # Set a minimum longitude range (e.g., 1 degree)
             min_lon_range = 1.0
-            lon_min = min(lons_in) - lon_padding
-            lon_max = max(lons_in) + lon_padding
+            lon_min = lons_in.min() - lon_padding
+            lon_max = lons_in.max() + lon_padding
             if lon_max - lon_min < min_lon_range:
                 mid = (lon_max + lon_min) / 2
                 lon_min = mid - min_lon_range / 2
                 lon_max = mid + min_lon_range / 2
             
             ax.set_xlim(lon_min, lon_max)
-            ax.set_ylim(min(lats_in) - lat_padding, max(lats_in) + lat_padding)
+            ax.set_ylim(lats_in.min() - lat_padding, lats_in.max() + lat_padding)
 
-        # Plot elements
-        if show_segments:
-            for segment in self.nav_segments:
-                PlotNavSegment(segment, self.nav_points, ax, color=segment_color, width=segment_width, alpha=segment_alpha)
-        if show_points:
-            for point in self.nav_points:
-                PlotNavPoint(point, ax, color=point_color, size=point_size, alpha=point_alpha)
-        if show_airports:
+        # Plot elements, one artist per element type
+        if show_segments and store.num_segments:
+            from matplotlib.collections import LineCollection
+            ax.add_collection(LineCollection(store.segment_coordinates(), colors=segment_color,
+                                             linewidths=segment_width, alpha=segment_alpha, zorder=1))
+        if show_points and len(store):
+            ax.scatter(store.longitudes, store.latitudes, color=point_color, s=point_size,
+                       alpha=point_alpha, zorder=2)
+            for name, lon, lat in zip(store.names, store.longitudes.tolist(), store.latitudes.tolist()):
+                ax.annotate(name, (lon, lat), xytext=(5, 5), textcoords='offset points',
+                            fontsize=8, alpha=point_alpha, zorder=3)
+        airport_artist = None
+        if show_airports and self.nav_airports:
+            airport_artist = ax.scatter(airport_lons, airport_lats, color=airport_color, s=airport_size,
+                                        alpha=airport_alpha, zorder=2, label="Airport")
             for airport in self.nav_airports:
-                PlotNavAirport(airport, ax, color=airport_color, size=airport_size, alpha=airport_alpha)
+                ax.annotate(airport.icao, (airport.longitude, airport.latitude), xytext=(5, 5),
+                            textcoords='offset points', fontsize=8, alpha=airport_alpha, zorder=3)
 
         ax.set_title(f"{self.name} Airspace System", pad=20)
         ax.set_xlabel("Longitude", labelpad=10)
         ax.set_ylabel("Latitude", labelpad=10)
 
-        if show_airports and self.nav_airports:
-            ax.legend(["Airport"], loc='upper right', fontsize='small', bbox_to_anchor=(0.98, 0.98))
+        if airport_artist is not None:
+            ax.legend(handles=[airport_artist], loc='upper right', fontsize='small', bbox_to_anchor=(0.98, 0.98))
 
         ax.set_aspect('equal', adjustable='box')
         ax.grid(True, linestyle='--', alpha=0.3)
@@ -174,6 +842,7 @@ class AirSpace:
             filename (str): Path to save the plot
             **plot_kwargs: Additional arguments to pass to plot()
         """
+        import matplotlib.pyplot as plt
         fig = self.plot(**plot_kwargs)
         fig.savefig(filename, dpi=300, bbox_inches='tight')
         plt.close(fig)
@@ -184,6 +853,21 @@ class AirSpace:
         Returns:
             dict: Dictionary containing various statistics
         """
+        if self._mapped is not None:
+            # Answer from the mapped sections rather than building every object
+            arrays = self._mapped
+            airport_names = StringTable(arrays['airport_name_offsets'], arrays['airport_name_data'])
+            return {
+                'name': self.name,
+                'num_nav_points': len(arrays['numbers']),
+                'num_segments': len(arrays['seg_origins']),
+                'num_airports': len(arrays['airport_points']),
+                'airports': [f"{icao} ({name})" for icao, name in
+                             zip(StringTable(arrays['airport_icao_offsets'], arrays['airport_icao_data']),
+                                 airport_names)],
+                'total_sids': int(arrays['sid_starts'][-1]),
+                'total_stars': int(arrays['star_starts'][-1])
+            }
         return {
             'name': self.name,
             'num_nav_points': len(self.nav_points),
@@ -194,6 +878,24 @@ class AirSpace:
             'total_stars': sum(len(airport.stars) for airport in self.nav_airports)
         }
         
+    def memory_usage(self) -> int:
+        """Estimate the bytes held by the airspace.
+        
+        Objects are counted with measured per-object averages, arrays (store,
+        graph, spatial index, mapped file sections) by their exact size.
+        Mapped sections count too, as they occupy the page cache while used.
+        """
+        if self._mapped is not None:
+            # The store and graph are views of these sections
+            total = sum(a.nbytes for a in self._mapped.values())
+        else:
+            total = (len(self._nav_points) * _POINT_BYTES + len(self._nav_segments) * _SEGMENT_BYTES +
+                     len(self._nav_airports) * _AIRPORT_BYTES)
+            total += sum(part.nbytes for part in (self._store, self._graph) if part is not None)
+        if self._spatial_index is not None:
+            total += self._spatial_index.nbytes
+        return total
+        
     def __str__(self) -> str:
         """String representation of the airspace system."""
         stats = self.get_statistics()
@@ -0,0 +1,13 @@
+"""Aircraft performance estimates shared by the UI and the route optimisers."""
+
+# --- A320 Performance Data (Estimates) ---
+A320_CRUISING_SPEED_KMPH = 840 # Typical cruising speed in km/h
+A320_FUEL_CONSUMPTION_KGPH = 2086.5 # Typical fuel consumption in kg per hour (approx 4600 lbs/hr)
+
+def FlightTimeHours(distance: float, speed_kmph: float = A320_CRUISING_SPEED_KMPH) -> float:
+    """Flight time in hours of a distance in kilometers at a constant speed."""
+    return distance / speed_kmph
+
+def FuelBurnKg(hours: float, consumption_kgph: float = A320_FUEL_CONSUMPTION_KGPH) -> float:
+    """Fuel burnt in kilograms over a flight time in hours."""
+    return hours * consumption_kgph
@@ -0,0 +1,267 @@
+"""Session cache of loaded airspaces.
+
+The bundled datasets are described by Dataset entries in DATASETS. An
+AirspaceCache keeps the AirSpace objects loaded during a session, evicting the
+least recently used ones when their estimated memory exceeds a budget, and can
+load datasets in a background thread ahead of time, so that switching to a
+region that was already loaded (or prefetched) needs no parsing at all. Cached
+airspaces are materialized by the thread that loaded them, never on first use.
+"""
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, wait
+from typing import Optional
+from airSpace import AirSpace
+from loadProgress import LoadProgress, LoadCancelled
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MEMORY_BUDGET = 512 * 1024 * 1024  # bytes
+
+class Dataset:
+    def __init__(self, name: str, directory: str, files: tuple = None, archive: str = None):
+        """Describe an airspace dataset on disk.
+
+        Args:
+            name (str): Display name, also used as the AirSpace name
+            directory (str): Directory of the files, relative to this module
+            files (tuple): Names of the nav, seg and aer text files
+            archive (str): Name of a zip/tar archive holding them instead
+        """
+        self.name = name
+        self.directory = os.path.join(BASE_DIR, directory)
+        self.files = files
+        self.archive = archive
+
+    def paths(self) -> list:
+        """Full paths of the archive or of the three text files."""
+        names = [self.archive] if self.archive else list(self.files)
+        return [os.path.join(self.directory, name) for name in names]
+
+    def check(self):
+        """Raise FileNotFoundError naming the first missing file."""
+        for path in self.paths():
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Required file not found: {os.path.basename(path)}")
+
+    def load(self, progress: LoadProgress = None, use_snapshot: bool = True) -> Optional[AirSpace]:
+        """Load the dataset into a new AirSpace.
+
+        Args:
+            progress (LoadProgress): Receives the current phase and lines read
+            use_snapshot (bool): Read and write the binary snapshot next to the files
+
+        Returns:
+            AirSpace: The loaded airspace, or None if loading failed
+
+        Raises:
+            LoadCancelled: If progress was cancelled
+        """
+        airspace = AirSpace(name=self.name)
+        if self.archive:
+            success = airspace.load_archive(self.paths()[0], use_snapshot=use_snapshot, progress=progress)
+        else:
+            success = airspace.load_data(*self.paths(), use_snapshot=use_snapshot, progress=progress)
+        return airspace if success else None
+
+    def __repr__(self):
+        return f"Dataset('{self.name}', {self.paths()})"
+
+DATASETS = {
+    "Catalunya": Dataset("Catalunya", "airspace_catalonia", files=("Cat_nav.txt", "Cat_seg.txt", "Cat_aer.txt")),
+    "España": Dataset("España", "Airspace Spain", archive="Spain_graph.zip"),
+    "Europe": Dataset("Europe", "ECAC airspace", files=("ECAC_nav.txt", "ECAC_seg.txt", "ECAC_aer.txt")),
+}
+
+class AirspaceCache:
+    def __init__(self, datasets: dict = None, memory_budget: int = DEFAULT_MEMORY_BUDGET):
+        """Initialize an empty cache.
+
+        Args:
+            datasets (dict): Name -> Dataset, DATASETS by default
+            memory_budget (int): Bytes of AirSpace.memory_usage() to keep; the
+                most recently used airspace is kept even if it alone exceeds it
+        """
+        self.datasets = DATASETS if datasets is None else datasets
+        self.memory_budget = memory_budget
+        self._entries = OrderedDict()  # Name -> AirSpace, least recently used first
+        self._pending = {}  # Name -> (Future, LoadProgress) of background loads
+        self._queue = []  # Names waiting for the prefetch thread
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def names(self) -> list:
+        """Names of the cached airspaces, least recently used first."""
+        with self._lock:
+            return list(self._entries)
+
+    def get(self, name: str) -> Optional[AirSpace]:
+        """Return a cached airspace and mark it as most recently used, or None."""
+        with self._lock:
+            airspace = self._entries.get(name)
+            if airspace is not None:
+                self._entries.move_to_end(name)
+            return airspace
+
+    def put(self, name: str, airspace: AirSpace, recent: bool = True):
+        """Add an airspace and evict others to stay within the memory budget.
+
+        Args:
+            name (str): Cache key
+            airspace (AirSpace): Loaded airspace
+            recent (bool): Insert as most recently used; prefetched airspaces are
+                inserted as least recently used so they never evict one in use
+        """
+        with self._lock:
+            self._entries[name] = airspace
+            self._entries.move_to_end(name, last=recent)
+            self._evict()
+
+    def evict(self, name: str) -> bool:
+        """Drop an airspace from the cache."""
+        with self._lock:
+            return self._entries.pop(name, None) is not None
+
+    def memory_usage(self) -> int:
+        """Estimated bytes held by all cached airspaces."""
+        with self._lock:
+            return sum(airspace.memory_usage() for airspace in self._entries.values())
+
+    def _evict(self):
+        """Drop least recently used entries while over budget (lock held)."""
+        sizes = {name: airspace.memory_usage() for name, airspace in self._entries.items()}
+        total = sum(sizes.values())
+        while total > self.memory_budget and len(self._entries) > 1:
+            name, _ = self._entries.popitem(last=False)
+            total -= sizes[name]
+            print(f"Airspace cache: evicted {name} ({sizes[name] / 1e6:.1f} MB)")
+
+    def load(self, name: str, progress: LoadProgress = None) -> Optional[AirSpace]:
+        """Return an airspace from the cache, loading it in this thread if needed.
+
+        If the airspace is being prefetched, waits for that load instead of
+        starting a second one, copying its phase and line count to progress.
+        If it is only queued for prefetching, it is taken off the queue and
+        loaded here.
+
+        Returns:
+            AirSpace: The airspace, or None if it could not be loaded
+
+        Raises:
+            LoadCancelled: If progress was cancelled (a prefetch being waited
+                for keeps running)
+        """
+        progress = progress or LoadProgress()
+        airspace = self.get(name)
+        if airspace is not None:
+            return airspace
+        queued = None
+        with self._lock:
+            pending = self._pending.get(name)
+            if name in self._queue:
+                # Not started yet: load it here rather than after the prefetches ahead of it
+                self._queue.remove(name)
+                queued, _ = self._pending.pop(name)
+                pending = None
+        if pending is not None:
+            future, background = pending
+            while not future.done():
+                progress.check()
+                progress.phase, progress.lines = f"Prefetching: {background.phase}", background.lines
+                wait([future], timeout=0.05)
+            airspace = self.get(name)
+            if airspace is not None:
+                return airspace
+
+        airspace = None
+        try:
+            airspace = self._load_dataset(name, progress)
+            if airspace is not None:
+                self.put(name, airspace)
+        finally:
+            if queued is not None:
+                queued.set_result(airspace)
+        return airspace
+
+    def _load_dataset(self, name: str, progress: LoadProgress) -> Optional[AirSpace]:
+        """Load a dataset with its objects built, so using it later does no work on the caller's thread."""
+        airspace = self.datasets[name].load(progress)
+        if airspace is not None:
+            progress.start_phase("Building objects")
+            airspace.materialize()
+        return airspace
+
+    def prefetch(self, names: list = None) -> list:
+        """Load datasets in a background thread, one after the other.
+
+        Datasets already cached or queued are skipped. Prefetched airspaces are
+        inserted as least recently used, so they are the first to go when the
+        budget is exceeded.
+
+        Args:
+            names (list): Dataset names, all datasets by default
+
+        Returns:
+            list: A Future per queued dataset, resolving to its AirSpace or None
+        """
+        futures = []
+        with self._lock:
+            for name in (list(self.datasets) if names is None else names):
+                if name in self._entries or name in self._pending:
+                    continue
+                future = Future()
+                self._pending[name] = (future, LoadProgress())
+                self._queue.append(name)
+                futures.append(future)
+            if self._queue and (self._worker is None or not self._worker.is_alive()):
+                self._worker = threading.Thread(target=self._prefetch_worker, name="airspace-prefetch",
+                                                daemon=True)
+                self._worker.start()
+        return futures
+
+    def pending(self, name: str) -> Optional[LoadProgress]:
+        """Progress of a queued or running prefetch of a dataset, or None."""
+        with self._lock:
+            entry = self._pending.get(name)
+        return entry[1] if entry else None
+
+    def cancel_prefetch(self):
+        """Cancel the running prefetch and drop the queued ones."""
+        with self._lock:
+            for name in self._queue:
+                future, _ = self._pending.pop(name)
+                future.set_result(None)
+            self._queue.clear()
+            for _, progress in self._pending.values():
+                progress.cancel()
+
+    def _prefetch_worker(self):
+        """Body of the prefetch thread: load queued datasets until the queue is empty."""
+        while True:
+            with self._lock:
+                if not self._queue:
+                    self._worker = None
+                    return
+                name = self._queue.pop(0)
+                future, progress = self._pending[name]
+            airspace = None
+            try:
+                # Loaded in the foreground meanwhile?
+                airspace = self.get(name) if name in self else self._load_dataset(name, progress)
+                if airspace is not None and name not in self:
+                    self.put(name, airspace, recent=False)
+            except LoadCancelled:
+                print(f"Airspace cache: prefetch of {name} cancelled")
+            except Exception as e:  # The thread must keep serving the queue
+                print(f"Airspace cache: prefetch of {name} failed: {e}")
+            with self._lock:
+                self._pending.pop(name, None)
+            future.set_result(airspace)
@@ -0,0 +1,169 @@
+"""K shortest loopless routes (Yen's algorithm) for alternative routing.
+
+Yen's algorithm finds the next route by deviating from the routes found so
+far: for each node of a route (the spur node) it searches the best way on to
+the destination that keeps the route's prefix (the root), avoids the root's
+other nodes, and leaves the spur node by a segment no earlier route with the
+same root took.
+
+Every spur search is an A* guided by one reverse shortest-path tree to the
+destination, computed once per query. The tree distances are exact on the
+full graph and stay a consistent lower bound when nodes and segments are
+blocked, so most spur searches walk almost straight to the destination.
+Following Lawler, a route only spurs from its own deviation point onwards;
+earlier spur nodes were already searched from its parent.
+"""
+from heapq import heappush, heappop
+import numpy as np
+from routing import RouteResult, ShortestPathTree
+
+MAX_CANDIDATES_FACTOR = 20  # With a dissimilarity threshold, examine at most k * this many routes
+
+def _as_nodes(nodes) -> list:
+    if isinstance(nodes, (int, np.integer)):
+        return [int(nodes)]
+    return sorted({int(n) for n in nodes})
+
+def _SpurSearch(lists, starts: list, blocked_nodes: set, blocked_heads: set, to_target: list, targets: set):
+    """A* from the start nodes to the nearest target, guided by exact tree distances.
+
+    Args:
+        lists: (offsets, heads, weights) lists of the graph
+        starts (list): Nodes starting at cost 0
+        blocked_nodes (set): Nodes the search may not enter
+        blocked_heads (set): Nodes the spur node (the single start) may not step to
+        to_target (list): Distance from every node to the nearest target
+        targets (set): Destination nodes
+
+    Returns:
+        tuple: (nodes, costs, settled), nodes being empty if no target is reachable
+    """
+    offsets, heads, weights = lists
+    inf = float('inf')
+    g = {s: 0.0 for s in starts}
+    parent = {}
+    settled = set()
+    heap = [(to_target[s], 0.0, s) for s in starts if to_target[s] != inf]
+    heap.sort()
+    spur = starts[0] if len(starts) == 1 else None
+    while heap:
+        _, g_u, u = heappop(heap)
+        if u in settled:
+            continue
+        settled.add(u)
+        if u in targets:
+            nodes = [u]
+            while nodes[-1] in parent:
+                nodes.append(parent[nodes[-1]])
+            nodes.reverse()
+            return nodes, [g[v] for v in nodes], len(settled)
+        for k in range(offsets[u], offsets[u + 1]):
+            v = heads[k]
+            if v in blocked_nodes or (u == spur and v in blocked_heads):
+                continue
+            g_v = g_u + weights[k]
+            if g_v < g.get(v, inf) and to_target[v] != inf:
+                g[v] = g_v
+                parent[v] = u
+                heappush(heap, (g_v + to_target[v], g_v, v))
+    return [], [], len(settled)
+
+def _SharedDistance(a: tuple, costs_a: tuple, b_edges: set) -> float:
+    """Total length of the segments of route a that route b also uses."""
+    return sum(costs_a[i + 1] - costs_a[i] for i in range(len(a) - 1) if (a[i], a[i + 1]) in b_edges)
+
+def KShortestRoutes(graph, sources, targets, k: int, min_dissimilarity: float = 0.0,
+                    max_candidates: int = None) -> list:
+    """The k shortest loopless routes from any source to any target, shortest first.
+
+    Args:
+        graph (CSRGraph): Graph to search
+        sources: Origin node, or nodes a route may start from
+        targets: Destination node, or nodes a route may end at
+        k (int): Number of routes wanted
+        min_dissimilarity (float): If > 0, a route is only returned when at most
+            a (1 - min_dissimilarity) share of its length runs along each
+            shorter returned route
+        max_candidates (int): Routes to examine at most, by default k without a
+            threshold and k * MAX_CANDIDATES_FACTOR with one
+
+    Returns:
+        list: Up to k RouteResults; settled counts the nodes settled by all
+        spur searches until that route was found
+    """
+    sources, targets = _as_nodes(sources), set(_as_nodes(targets))
+    if k <= 0 or not sources or not targets:
+        return []
+    if max_candidates is None:
+        max_candidates = k * MAX_CANDIDATES_FACTOR if min_dissimilarity > 0 else k
+    lists = graph.as_lists()
+    to_target, _ = ShortestPathTree(graph, sorted(targets), reverse=True)
+
+    routes, accepted_edges = [], []
+    branches = {}  # Root prefix -> next nodes taken after it by examined routes
+    seen = set()
+    candidates = []  # (cost, nodes, costs, deviation index)
+    nodes, costs, work = _SpurSearch(lists, sources, set(), set(), to_target, targets)
+    if nodes:
+        heappush(candidates, (costs[-1], tuple(nodes), tuple(costs), -1))
+        seen.add(tuple(nodes))
+    examined = 0
+    while candidates and len(routes) < k and examined < max_candidates:
+        cost, path, path_costs, deviation = heappop(candidates)
+        examined += 1
+        edges = set(zip(path, path[1:]))
+        if all(_SharedDistance(path, path_costs, other) <= (1.0 - min_dissimilarity) * cost
+               for other in accepted_edges):
+            routes.append(RouteResult(list(path), cost, work))
+            accepted_edges.append(edges)
+        for i in range(-1, len(path) - 1):
+            branches.setdefault(path[:i + 1], set()).add(path[i + 1])
+        if len(routes) == k or examined == max_candidates:
+            break
+        # Spur from every node at or after the deviation point (-1: choose another source)
+        for i in range(deviation, len(path) - 1):
+            root = path[:i + 1]
+            if i < 0:
+                starts = [s for s in sources if s not in branches[root]]
+                if not starts:
+                    continue
+                spur_nodes, spur_costs, count = _SpurSearch(lists, starts, set(), set(), to_target, targets)
+                root_cost = 0.0
+            else:
+                spur_nodes, spur_costs, count = _SpurSearch(lists, [path[i]], set(root[:-1]), branches[root],
+                                                            to_target, targets)
+                root_cost = path_costs[i]
+                root = root[:-1]
+            work += count
+            if not spur_nodes:
+                continue
+            new = root + tuple(spur_nodes)
+            if new not in seen:
+                seen.add(new)
+                heappush(candidates, (root_cost + spur_costs[-1], new,
+                                      path_costs[:len(root)] + tuple(root_cost + c for c in spur_costs), i))
+    return routes
+
+def AlternativeRoutes(airspace, origin_number: int, destination_number: int, k: int,
+                      min_dissimilarity: float = 0.0) -> list:
+    """The k shortest loopless routes between two navigation points of an AirSpace.
+
+    Raises:
+        ValueError: If a point does not exist
+    """
+    store = airspace.get_store()
+    source, target = store.index_of(origin_number), store.index_of(destination_number)
+    if source < 0 or target < 0:
+        raise ValueError(f"Point {origin_number if source < 0 else destination_number} not found")
+    return KShortestRoutes(airspace.get_graph(), source, target, k, min_dissimilarity)
+
+def AirportAlternativeRoutes(airspace, origin_icao: str, destination_icao: str, k: int,
+                             min_dissimilarity: float = 0.0) -> list:
+    """The k shortest loopless routes from any SID of one airport to any STAR of another.
+
+    Raises:
+        ValueError: If an airport does not exist
+    """
+    from distanceMatrix import AirportEndpoints
+    _, departures, arrivals = AirportEndpoints(airspace, [origin_icao, destination_icao])
+    return KShortestRoutes(airspace.get_graph(), departures[0], arrivals[1], k, min_dissimilarity)
@@ -0,0 +1,186 @@
+"""Batch routing of many origin/destination pairs, optionally across processes.
+
+Pairs are grouped by origin: an origin with several destinations is answered by
+one Dijkstra tree (routing.RoutesFromSource), a lone pair by A*. The groups are
+packed into chunks that worker processes route independently.
+
+Workers get the compiled CSRGraph without pickling it per task: with the 'fork'
+start method they inherit it from the parent, otherwise its arrays are copied
+once into shared memory and every worker maps them. Results are yielded in the
+order of the input pairs as soon as every earlier pair has been answered.
+"""
+import multiprocessing
+import os
+import numpy as np
+from csrGraph import CSRGraph
+from routing import AStar, RouteResult, RoutesFromSource
+
+DEFAULT_CHUNK_SIZE = 256  # Queries per task sent to a worker
+
+_worker_graph = None  # Graph used by RouteChunk in this process
+
+def _SetWorkerGraph(graph):
+    global _worker_graph
+    _worker_graph = graph
+
+def _AttachSharedGraph(num_nodes: int, specs: dict):
+    """Pool initializer: rebuild the graph from the shared memory blocks named in specs."""
+    from multiprocessing import shared_memory
+    blocks, arrays = [], {}
+    for name, (block_name, dtype, shape) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)  # Keep the mappings open for the life of the worker
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    latitudes, longitudes = arrays.pop('latitudes', None), arrays.pop('longitudes', None)
+    graph = CSRGraph.from_arrays(num_nodes, arrays, latitudes, longitudes)
+    graph.cache['shared_blocks'] = blocks
+    _SetWorkerGraph(graph)
+
+def RouteChunk(chunk: list) -> list:
+    """Route one chunk of origin groups on the worker graph.
+
+    Args:
+        chunk (list): (source, [(position, target), ...]) groups
+
+    Returns:
+        list: (position, RouteResult) for every query of the chunk
+    """
+    graph = WorkerGraph()
+    answers = []
+    for source, queries in chunk:
+        if len(queries) == 1:
+            position, target = queries[0]
+            answers.append((position, AStar(graph, source, target)))
+        else:
+            results = RoutesFromSource(graph, source, [target for _, target in queries])
+            answers.extend((position, result) for (position, _), result in zip(queries, results))
+    return answers
+
+def GroupByOrigin(pairs, chunk_size: int = DEFAULT_CHUNK_SIZE) -> list:
+    """Group (source, target) pairs by source and pack the groups into chunks.
+
+    Groups are ordered by the first position of their source, so the chunks
+    complete the input roughly from front to back. Groups larger than
+    chunk_size stay whole: splitting them would repeat their tree.
+
+    Returns:
+        list: Chunks, each a list of (source, [(position, target), ...])
+    """
+    groups = {}
+    for position, (source, target) in enumerate(pairs):
+        groups.setdefault(source, []).append((position, target))
+    chunks, chunk, size = [], [], 0
+    for source, queries in groups.items():
+        chunk.append((source, queries))
+        size += len(queries)
+        if size >= chunk_size:
+            chunks.append(chunk)
+            chunk, size = [], 0
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+class BatchRouter:
+    def __init__(self, graph: CSRGraph, workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """Route batches of node pairs over a graph.
+
+        Args:
+            graph (CSRGraph): Graph to route on
+            workers (int): Worker processes, os.cpu_count() by default; 1 routes
+                in the calling process
+            chunk_size (int): Queries per task
+        """
+        self.graph = graph
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.chunk_size = chunk_size
+
+    def route(self, pairs):
+        """Yield a RouteResult per (source, target) pair of node indices, in input order.
+
+        Pairs with a negative index (an unknown point) get an empty result.
+        """
+        pairs = [(int(s), int(t)) for s, t in pairs]
+        valid = [(s, t) if s >= 0 and t >= 0 else None for s, t in pairs]
+        positions = [i for i, pair in enumerate(valid) if pair is not None]
+        chunks = GroupByOrigin([valid[i] for i in positions], self.chunk_size)
+        pending, next_position = {}, 0
+        for answers in self._answers(chunks):
+            for position, result in answers:
+                pending[positions[position]] = result
+            while next_position < len(pairs) and (valid[next_position] is None or next_position in pending):
+                result = pending.pop(next_position, None)
+                yield result if result is not None else RouteResult([], float('inf'), 0)
+                next_position += 1
+        while next_position < len(pairs):  # Only unknown points are left
+            yield RouteResult([], float('inf'), 0)
+            next_position += 1
+
+    def _answers(self, chunks: list):
+        """Yield the answers of each chunk, in chunk order."""
+        return MapOnGraph(self.graph, RouteChunk, chunks, self.workers)
+
+def WorkerGraph() -> CSRGraph:
+    """The graph shared with this process by MapOnGraph."""
+    return _worker_graph
+
+def MapOnGraph(graph: CSRGraph, function, tasks: list, workers: int = None):
+    """Yield function(task) for every task, computed on a process pool sharing graph.
+
+    function must be a module-level function; it reaches the graph through
+    WorkerGraph(). With one worker or a single task everything runs in the
+    calling process.
+    """
+    workers = max(1, workers or os.cpu_count() or 1)
+    if workers == 1 or len(tasks) <= 1:
+        _SetWorkerGraph(graph)
+        for task in tasks:
+            yield function(task)
+        return
+    context = multiprocessing.get_context()
+    if context.get_start_method() == 'fork':
+        _SetWorkerGraph(graph)  # Inherited by the forked workers
+        with context.Pool(min(workers, len(tasks))) as pool:
+            yield from pool.imap(function, tasks)
+        return
+    blocks = []
+    try:
+        specs = _ShareGraph(graph, blocks)
+        with context.Pool(min(workers, len(tasks)), initializer=_AttachSharedGraph,
+                          initargs=(graph.num_nodes, specs)) as pool:
+            yield from pool.imap(function, tasks)
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+def _ShareGraph(graph: CSRGraph, blocks: list) -> dict:
+    """Copy the graph arrays into new shared memory blocks (appended to blocks)."""
+    from multiprocessing import shared_memory
+    arrays = dict(graph.arrays())
+    if graph.latitudes is not None:
+        arrays['latitudes'], arrays['longitudes'] = graph.latitudes, graph.longitudes
+    specs = {}
+    for name, array in arrays.items():
+        block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+        blocks.append(block)
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        specs[name] = (block.name, array.dtype.str, array.shape)
+    return specs
+
+def RouteBatch(airspace, pairs, workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Route (origin_number, destination_number) pairs of an AirSpace.
+
+    Args:
+        airspace (AirSpace): Loaded airspace
+        pairs: Iterable of navigation number pairs
+        workers (int): Worker processes, os.cpu_count() by default
+        chunk_size (int): Queries per task
+
+    Yields:
+        RouteResult: One per pair, in input order, over store row indices (use
+        result.numbers(store)); pairs with an unknown point are not found
+    """
+    store = airspace.get_store()
+    pairs = np.asarray(list(pairs), dtype=np.int64).reshape(-1, 2)
+    indices = np.stack([store.indices_of(pairs[:, 0]), store.indices_of(pairs[:, 1])], axis=1)
+    yield from BatchRouter(airspace.get_graph(), workers, chunk_size).route(indices.tolist())
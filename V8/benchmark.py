@@ -0,0 +1,790 @@
+"""Performance benchmarks for the airspace code.
+
+Run with:  python benchmark.py
+"""
+import os
+import random
+import tempfile
+import time
+from airSpace import AirSpace
+from navPoint import GetNavPointByNumber, LoadNavPoints
+from navSegment import GetSegmentsByOrigin, LoadNavSegments, NavSegment
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DATASET_FILES = {
+    "Catalunya": ("airspace_catalonia", "Cat_nav.txt", "Cat_seg.txt", "Cat_aer.txt"),
+    "Europe": ("ECAC airspace", "ECAC_nav.txt", "ECAC_seg.txt", "ECAC_aer.txt"),
+}
+
+def load_airspace(name: str) -> AirSpace:
+    """Load one of the bundled airspaces by its display name."""
+    directory, nav, seg, aer = DATASET_FILES[name]
+    base_dir = os.path.join(BASE_DIR, directory)
+    airspace = AirSpace(name=name)
+    airspace.load_data(os.path.join(base_dir, nav), os.path.join(base_dir, seg), os.path.join(base_dir, aer))
+    return airspace
+
+def timeit(function, repeat: int = 3) -> float:
+    """Return the best wall time in seconds of `repeat` calls to function."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def report(label: str, old: float, new: float):
+    """Print a before/after timing line."""
+    speedup = old / new if new > 0 else float('inf')
+    print(f"  {label:<40} linear {old * 1000:9.2f} ms   indexed {new * 1000:9.2f} ms   x{speedup:.1f}")
+
+# --- Lookup layer -------------------------------------------------------------
+
+def _visualization_pass(airspace: AirSpace, get_point):
+    """Mimics the per-segment lookups done by AirspaceApp.visualize_airspace and export_to_kml."""
+    coords = []
+    for segment in airspace.nav_segments:
+        origin = get_point(segment.origin_number)
+        dest = get_point(segment.destination_number)
+        if origin and dest:
+            coords.append((origin.longitude, origin.latitude, dest.longitude, dest.latitude))
+    return coords
+
+def _astar_pass(airspace: AirSpace, origin_number: int, dest_number: int, get_point, get_segments):
+    """The A* loop of AirspaceApp._find_path, parameterised by its lookup functions."""
+    destination = get_point(dest_number)
+    def heuristic(a, b):
+        return ((a.longitude - b.longitude) ** 2 + (a.latitude - b.latitude) ** 2) ** 0.5
+    def get_cost(a, b):
+        for seg in get_segments(a.number):
+            if seg.destination_number == b.number:
+                return seg.distance
+        return float('inf')
+    open_set = {origin_number}
+    closed_set = set()
+    g_score = {origin_number: 0}
+    f_score = {origin_number: heuristic(get_point(origin_number), destination)}
+    while open_set:
+        current_number = min(open_set, key=lambda x: f_score.get(x, float('inf')))
+        if current_number == dest_number:
+            return g_score[current_number]
+        open_set.remove(current_number)
+        closed_set.add(current_number)
+        current = get_point(current_number)
+        for seg in get_segments(current_number):
+            neighbor = get_point(seg.destination_number)
+            if neighbor.number in closed_set:
+                continue
+            tentative_g = g_score[current_number] + get_cost(current, neighbor)
+            if neighbor.number not in open_set:
+                open_set.add(neighbor.number)
+            elif tentative_g >= g_score.get(neighbor.number, float('inf')):
+                continue
+            g_score[neighbor.number] = tentative_g
+            f_score[neighbor.number] = tentative_g + heuristic(neighbor, destination)
+    return None
+
+def bench_lookup_layer():
+    """Compare the linear list scans with the AirSpace hash indexes."""
+    print("Lookup layer (AirSpace indexes)")
+    for name in DATASET_FILES:
+        airspace = load_airspace(name)
+        print(f" {name}: {len(airspace.nav_points)} points, {len(airspace.nav_segments)} segments")
+
+        linear_point = lambda number: GetNavPointByNumber(airspace.nav_points, number)
+        linear_segments = lambda number: GetSegmentsByOrigin(airspace.nav_segments, number)
+
+        old = timeit(lambda: _visualization_pass(airspace, linear_point))
+        new = timeit(lambda: _visualization_pass(airspace, airspace.get_nav_point))
+        report("visualization segment pass", old, new)
+
+        origin = airspace.nav_points[0].number
+        destination = airspace.nav_points[-1].number
+        old = timeit(lambda: _astar_pass(airspace, origin, destination, linear_point, linear_segments))
+        new = timeit(lambda: _astar_pass(airspace, origin, destination,
+                                         airspace.get_nav_point, airspace.get_segments_from))
+        report("A* path query", old, new)
+
+# --- Synthetic data -----------------------------------------------------------
+
+def write_synthetic_airspace(directory: str, num_points: int, num_segments: int, seed: int = 0):
+    """Write a random nav/seg/aer dataset in the bundled text format.
+
+    Points are scattered over Europe and each segment joins two random points,
+    so the files exercise the loaders at sizes well beyond ECAC.
+
+    Returns:
+        tuple: Paths of the nav, seg and aer files
+    """
+    rng = random.Random(seed)
+    nav_file = os.path.join(directory, "Syn_nav.txt")
+    seg_file = os.path.join(directory, "Syn_seg.txt")
+    aer_file = os.path.join(directory, "Syn_aer.txt")
+    coords = []
+    with open(nav_file, 'w') as f:
+        for number in range(1, num_points + 1):
+            lat, lon = rng.uniform(35.0, 60.0), rng.uniform(-10.0, 30.0)
+            coords.append((lat, lon))
+            f.write(f"{number} P{number} {lat:.10f} {lon:.10f}\n")
+    with open(seg_file, 'w') as f:
+        for _ in range(num_segments):
+            a, b = rng.randrange(num_points), rng.randrange(num_points)
+            f.write(f"{a + 1} {b + 1} {abs(coords[a][0] - coords[b][0]) * 111.0 + 1.0:.6f}\n")
+    with open(aer_file, 'w') as f:
+        f.write("SYNT\nP1.D\nP2.A\n")
+    return nav_file, seg_file, aer_file
+
+def write_synthetic_airways(directory: str, rows: int, cols: int, num_areas: int = 12, seed: int = 0):
+    """Write an airway-like dataset: a jittered grid with restricted areas cut out.
+
+    Each point is linked both ways to its grid neighbours, with the great-circle
+    distance as weight, except inside rectangular restricted areas that routes
+    must go around. The airports file only holds a placeholder airport.
+
+    Returns:
+        tuple: Paths of the nav, seg and aer files
+    """
+    from navPoint import NavPoint, Distance
+    rng = random.Random(seed)
+    nav_file = os.path.join(directory, "Air_nav.txt")
+    seg_file = os.path.join(directory, "Air_seg.txt")
+    aer_file = os.path.join(directory, "Air_aer.txt")
+    blocked = set()
+    for _ in range(num_areas):
+        r, c = rng.randrange(rows), rng.randrange(cols)
+        height, width = rng.randrange(rows // 8 + 1, rows // 3 + 2), rng.randrange(1, cols // 10 + 2)
+        blocked.update((i, j) for i in range(r, min(rows, r + height)) for j in range(c, min(cols, c + width)))
+    points = {}
+    with open(nav_file, 'w') as f:
+        for i in range(rows):
+            for j in range(cols):
+                if (i, j) in blocked:
+                    continue
+                number = i * cols + j + 1
+                lat = 35.0 + 25.0 * (i + rng.uniform(-0.3, 0.3)) / rows
+                lon = -10.0 + 40.0 * (j + rng.uniform(-0.3, 0.3)) / cols
+                points[i, j] = NavPoint(number, f"P{number}", lat, lon)
+                f.write(f"{number} P{number} {lat:.10f} {lon:.10f}\n")
+    with open(seg_file, 'w') as f:
+        for (i, j), a in points.items():
+            for neighbor in ((i + 1, j), (i, j + 1)):
+                b = points.get(neighbor)
+                if b is not None:
+                    distance = Distance(a, b)
+                    f.write(f"{a.number} {b.number} {distance:.6f}\n{b.number} {a.number} {distance:.6f}\n")
+    with open(aer_file, 'w') as f:
+        f.write("SYNT\n")
+    return nav_file, seg_file, aer_file
+
+def write_tiled_airspace(directory: str, airspace: AirSpace, rows: int, cols: int, links: int = 12):
+    """Write a merged multi-region dataset: copies of an airspace laid out on a grid.
+
+    Each copy is shifted by the extent of the original, and the `links`
+    easternmost (northernmost) points of a copy are linked both ways to the
+    closest westernmost (southernmost) points of the next one.
+
+    Returns:
+        tuple: Paths of the nav, seg and aer files
+    """
+    import numpy as np
+    store = airspace.get_store()
+    n = len(store)
+    latitudes, longitudes = store.latitudes, store.longitudes
+    lat_step, lon_step = np.ptp(latitudes) + 0.3, np.ptp(longitudes) + 0.3
+    nav_file = os.path.join(directory, "Tiles_nav.txt")
+    seg_file = os.path.join(directory, "Tiles_seg.txt")
+    aer_file = os.path.join(directory, "Tiles_aer.txt")
+    with open(nav_file, 'w') as f:
+        for tile in range(rows * cols):
+            lat_shift, lon_shift = (tile // cols) * lat_step, (tile % cols) * lon_step
+            for i in range(n):
+                f.write(f"{tile * n + i + 1} T{tile}_{store.names[i]} "
+                        f"{latitudes[i] + lat_shift:.10f} {longitudes[i] + lon_shift:.10f}\n")
+
+    def border(east_side, west_side, key):
+        # Closest point of the next tile's west side for each point of the east side
+        pairs = []
+        for i in east_side:
+            j = west_side[np.argmin(np.abs(key[west_side] - key[i]))]
+            pairs.append((int(i), int(j)))
+        return pairs
+
+    east_west = border(np.argsort(longitudes)[-links:], np.argsort(longitudes)[:links], latitudes)
+    north_south = border(np.argsort(latitudes)[-links:], np.argsort(latitudes)[:links], longitudes)
+    with open(seg_file, 'w') as f:
+        for tile in range(rows * cols):
+            base = tile * n + 1
+            for u, v, w in zip(store.seg_origins, store.seg_destinations, store.seg_distances):
+                f.write(f"{base + u} {base + v} {w:.6f}\n")
+            neighbors = []
+            if tile % cols + 1 < cols:
+                neighbors.append((tile + 1, east_west))
+            if tile // cols + 1 < rows:
+                neighbors.append((tile + cols, north_south))
+            for other, pairs in neighbors:
+                for i, j in pairs:
+                    distance = 60.0 * (abs(latitudes[j] + (other // cols) * lat_step -
+                                           latitudes[i] - (tile // cols) * lat_step) +
+                                       abs(longitudes[j] + (other % cols) * lon_step -
+                                           longitudes[i] - (tile % cols) * lon_step)) + 1.0
+                    f.write(f"{base + i} {other * n + j + 1} {distance:.6f}\n"
+                            f"{other * n + j + 1} {base + i} {distance:.6f}\n")
+    with open(aer_file, 'w') as f:
+        f.write("TILE\n")
+    return nav_file, seg_file, aer_file
+
+# --- Segment loading ----------------------------------------------------------
+
+def _load_segments_linear(filename: str, nav_points: list) -> list:
+    """The original LoadNavSegments linking, with one list scan per end point."""
+    segments = []
+    with open(filename) as f:
+        for line in f:
+            orig_num, dest_num, dist = line.split()
+            segment = NavSegment(int(orig_num), int(dest_num), float(dist))
+            segment.origin = GetNavPointByNumber(nav_points, segment.origin_number)
+            segment.destination = GetNavPointByNumber(nav_points, segment.destination_number)
+            if segment.origin and segment.destination:
+                segments.append(segment)
+    return segments
+
+def bench_segment_loading():
+    """Time LoadNavSegments against the old linear-scan linking and on a 1M segment file."""
+    print("Segment loading (LoadNavSegments)")
+    with tempfile.TemporaryDirectory() as directory:
+        nav_file, seg_file, _ = write_synthetic_airspace(directory, 5000, 20000)
+        points = LoadNavPoints(nav_file)
+        old = timeit(lambda: _load_segments_linear(seg_file, points), repeat=1)
+        points = LoadNavPoints(nav_file)
+        new = timeit(lambda: LoadNavSegments(seg_file, points), repeat=1)
+        report("5k points / 20k segments", old, new)
+
+        nav_file, seg_file, _ = write_synthetic_airspace(directory, 100000, 1000000, seed=1)
+        points = LoadNavPoints(nav_file)
+        start = time.perf_counter()
+        segments = LoadNavSegments(seg_file, points)
+        elapsed = time.perf_counter() - start
+        print(f"  100k points / 1M segments: {len(segments)} segments linked in {elapsed:.2f} s")
+
+# --- Columnar store -----------------------------------------------------------
+
+def _object_bytes(airspace: AirSpace) -> int:
+    """Rough memory footprint of the NavPoint/NavSegment objects and their attributes."""
+    import sys
+    total = 0
+    for point in airspace.nav_points:
+        total += sys.getsizeof(point) + sys.getsizeof(point.__dict__) + sys.getsizeof(point.neighbors)
+        total += sys.getsizeof(point.name) + 2 * sys.getsizeof(point.latitude)
+    for segment in airspace.nav_segments:
+        total += sys.getsizeof(segment) + sys.getsizeof(segment.__dict__) + sys.getsizeof(segment.distance)
+    return total
+
+def bench_store():
+    """Compare memory use and plotting time of the objects and the columnar store."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    print("Columnar store (NavStore)")
+    for name in DATASET_FILES:
+        airspace = load_airspace(name)
+        store = airspace.get_store()
+        objects = _object_bytes(airspace)
+        print(f"  {name:<10} objects ~{objects / len(store):6.0f} B/point   "
+              f"store {store.nbytes / len(store):6.0f} B/point")
+        elapsed = timeit(lambda: plt.close(airspace.plot()), repeat=1)
+        print(f"  {name:<10} AirSpace.plot {elapsed * 1000:.0f} ms")
+
+# --- Routing ------------------------------------------------------------------
+
+def _random_pairs(airspace: AirSpace, count: int, seed: int = 0) -> list:
+    """Random (origin, destination) navigation number pairs."""
+    rng = random.Random(seed)
+    numbers = [p.number for p in airspace.nav_points]
+    return [(rng.choice(numbers), rng.choice(numbers)) for _ in range(count)]
+
+def bench_routing():
+    """Average query latency of the heap-based A* and Dijkstra against the old A* loop."""
+    from routing import FindRoute
+    print("Routing (routing.FindRoute)")
+    for name in DATASET_FILES:
+        airspace = load_airspace(name)
+        airspace.get_graph()  # Compile once, as the UI does on first query
+        pairs = _random_pairs(airspace, 50)
+        old = timeit(lambda: [_astar_pass(airspace, o, d, airspace.get_nav_point, airspace.get_segments_from)
+                              for o, d in pairs], repeat=1) / len(pairs)
+        for method in ('astar', 'dijkstra'):
+            settled = []
+            new = timeit(lambda: settled.extend(FindRoute(airspace, o, d, method).settled for o, d in pairs),
+                         repeat=1) / len(pairs)
+            print(f"  {name:<10} {method:<9} {new * 1000:7.3f} ms/query  "
+                  f"(old A* loop {old * 1000:7.3f} ms)  settled {sum(settled) / len(settled):7.1f}")
+
+def bench_batch_routing(num_pairs: int = 5000, num_origins: int = 100):
+    """Batch OD routing: one A* per pair against origin grouping and a process pool."""
+    import os
+    from batchRouting import BatchRouter
+    from routing import AStar
+    print(f"Batch routing (batchRouting.BatchRouter, {os.cpu_count()} CPUs)")
+    airspace = load_airspace("Europe")
+    graph = airspace.get_graph()
+    rng = random.Random(0)
+    origins = [rng.randrange(graph.num_nodes) for _ in range(num_origins)]
+    pairs = [(rng.choice(origins), rng.randrange(graph.num_nodes)) for _ in range(num_pairs)]
+    old = timeit(lambda: [AStar(graph, s, t) for s, t in pairs], repeat=1)
+    grouped = timeit(lambda: list(BatchRouter(graph, workers=1).route(pairs)), repeat=1)
+    report(f"{num_pairs} pairs, {num_origins} origins, grouped", old, grouped)
+    for workers in sorted({2, os.cpu_count() or 1} - {1}):
+        pooled = timeit(lambda: list(BatchRouter(graph, workers=workers).route(pairs)), repeat=1)
+        report(f"{num_pairs} pairs, {num_origins} origins, {workers} workers", old, pooled)
+
+def bench_distance_matrix():
+    """Airport distance matrix: one tree per airport pair set vs one A* per pair, and the cache."""
+    import os
+    from routing import AStar
+    from distanceMatrix import AirportEndpoints
+    print("Distance matrix (AirSpace.get_distance_matrix)")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for name in DATASET_FILES:
+            airspace = load_airspace(name)
+            graph = airspace.get_graph()
+            _, departures, arrivals = AirportEndpoints(airspace)
+            old = timeit(lambda: [AStar(graph, s, t) for sids in departures for stars in arrivals
+                                  for s in sids for t in stars], repeat=1)
+            new = timeit(lambda: airspace.get_distance_matrix(workers=1, use_cache=False), repeat=1)
+            report(f"{name}: {len(departures)} airports, 1 worker", old, new)
+            if (os.cpu_count() or 1) > 1:
+                pooled = timeit(lambda: airspace.get_distance_matrix(use_cache=False), repeat=1)
+                report(f"{name}: {os.cpu_count()} workers", old, pooled)
+            airspace.get_distance_matrix(workers=1, cache_dir=cache_dir)
+            cached = timeit(lambda: load_airspace(name).get_distance_matrix(cache_dir=cache_dir))
+            loaded = timeit(lambda: load_airspace(name).get_graph())
+            report(f"{name}: from the cache file", new, cached - loaded)
+
+def _long_crossings(graph, count: int, seed: int = 0) -> list:
+    """Node pairs farthest apart on the map out of a random sample."""
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    sources = np.flatnonzero(graph.out_degree() > 0)
+    s, t = rng.choice(sources, 20 * count), rng.integers(0, graph.num_nodes, 20 * count)
+    spread = np.hypot(graph.latitudes[s] - graph.latitudes[t], graph.longitudes[s] - graph.longitudes[t])
+    longest = np.argsort(spread)[-count:]
+    return list(zip(s[longest].tolist(), t[longest].tolist()))
+
+def bench_alt(num_queries: int = 100):
+    """ALT landmarks against plain A*: settled nodes and latency of long crossings."""
+    from routing import AStar, HaversineHeuristic
+    print("ALT routing (AirSpace.get_landmarks)")
+    with tempfile.TemporaryDirectory() as directory:
+        synthetic = AirSpace(name="Airways")
+        synthetic.load_data(*write_synthetic_airways(directory, 200, 300), use_snapshot=False)
+        for airspace in (load_airspace("Europe"), synthetic):
+            graph = airspace.get_graph()
+            start = time.perf_counter()
+            table = airspace.get_landmarks(use_cache=False)
+            build = time.perf_counter() - start
+            pairs = _long_crossings(graph, num_queries)
+            for label, search in (("A*", lambda s, t: AStar(graph, s, t)),
+                                  ("ALT", lambda s, t: AStar(graph, s, t, table.heuristic(t, s))),
+                                  ("ALT+haversine", lambda s, t: AStar(graph, s, t, table.heuristic(
+                                      t, s, base=HaversineHeuristic(graph, t))))):
+                settled = []
+                latency = timeit(lambda: settled.extend(search(s, t).settled for s, t in pairs), repeat=1) / len(pairs)
+                print(f"  {airspace.name:<10} {label:<13} {latency * 1000:8.3f} ms/query  "
+                      f"settled {sum(settled) / len(settled):9.1f} of {graph.num_nodes}")
+            print(f"  {airspace.name:<10} {len(table)} landmarks built in {build:.2f} s "
+                  f"({table.nbytes / 1e6:.1f} MB)")
+
+def bench_contraction(rows: int = 12, cols: int = 10, num_queries: int = 100):
+    """Contraction hierarchy on a merged multi-region network against A* and Dijkstra."""
+    from routing import AStar, Dijkstra
+    print("Contraction hierarchy (AirSpace.build_contraction_hierarchy)")
+    with tempfile.TemporaryDirectory() as directory:
+        airspace = AirSpace(name="Tiles")
+        airspace.load_data(*write_tiled_airspace(directory, load_airspace("Europe"), rows, cols),
+                           use_snapshot=False)
+        graph = airspace.get_graph()
+        start = time.perf_counter()
+        hierarchy = airspace.build_contraction_hierarchy(cache_dir=directory)
+        build = time.perf_counter() - start
+        print(f"  {rows}x{cols} ECAC tiles: {graph.num_nodes} points, {graph.num_edges} segments; built in "
+              f"{build:.1f} s with {hierarchy.num_shortcuts} shortcuts, core of {hierarchy.core_size}")
+        airspace._hierarchy = None
+        loaded = timeit(lambda: airspace.build_contraction_hierarchy(cache_dir=directory), repeat=1)
+        print(f"  loaded from the routing cache in {loaded * 1000:.1f} ms")
+
+        rng = random.Random(0)
+        pairs = [(rng.randrange(graph.num_nodes), rng.randrange(graph.num_nodes)) for _ in range(num_queries)]
+        for label, search in (("Dijkstra", lambda s, t: Dijkstra(graph, s, t)),
+                              ("A*", lambda s, t: AStar(graph, s, t)),
+                              ("CH", hierarchy.query)):
+            settled = []
+            latency = timeit(lambda: settled.extend(search(s, t).settled for s, t in pairs), repeat=1) / len(pairs)
+            print(f"  {label:<9} {latency * 1000:8.3f} ms/query  settled {sum(settled) / len(settled):9.1f}")
+
+def bench_bidirectional(num_queries: int = 100):
+    """Bidirectional Dijkstra and A* against the unidirectional searches."""
+    from routing import AStar, BidirectionalAStar, BidirectionalDijkstra, Dijkstra
+    print("Bidirectional routing (routing.BidirectionalSearch)")
+    with tempfile.TemporaryDirectory() as directory:
+        synthetic = AirSpace(name="Airways")
+        synthetic.load_data(*write_synthetic_airways(directory, 200, 300), use_snapshot=False)
+        for airspace in (load_airspace("Europe"), synthetic):
+            graph = airspace.get_graph()
+            rng = random.Random(0)
+            for kind, pairs in (("random", [(rng.randrange(graph.num_nodes), rng.randrange(graph.num_nodes))
+                                            for _ in range(num_queries)]),
+                                ("long", _long_crossings(graph, num_queries))):
+                for label, search in (("Dijkstra", Dijkstra), ("bi-Dijkstra", BidirectionalDijkstra),
+                                      ("A*", AStar), ("bi-A*", BidirectionalAStar)):
+                    settled = []
+                    latency = timeit(lambda: settled.extend(search(graph, s, t).settled for s, t in pairs),
+                                     repeat=1) / len(pairs)
+                    print(f"  {airspace.name:<10} {kind:<6} {label:<11} {latency * 1000:8.3f} ms/query  "
+                          f"settled {sum(settled) / len(settled):9.1f}")
+
+def bench_alternatives(k: int = 10, num_queries: int = 50):
+    """Yen's k shortest routes on ECAC, with and without a dissimilarity threshold."""
+    from alternatives import KShortestRoutes
+    from routing import AStar
+    print(f"K shortest routes (alternatives.KShortestRoutes, k={k})")
+    airspace = load_airspace("Europe")
+    graph = airspace.get_graph()
+    rng = random.Random(0)
+    pairs = [(rng.randrange(graph.num_nodes), rng.randrange(graph.num_nodes)) for _ in range(num_queries)]
+    pairs = [(s, t) for s, t in pairs if AStar(graph, s, t).found]
+    for threshold in (0.0, 0.3, 0.5):
+        found = []
+        latency = timeit(lambda: found.extend(len(KShortestRoutes(graph, s, t, k, threshold)) for s, t in pairs),
+                         repeat=1) / len(pairs)
+        print(f"  min dissimilarity {threshold:.1f}: {latency * 1000:8.3f} ms/query, "
+              f"{sum(found) / len(found):.1f} routes")
+
+def bench_pareto(num_queries: int = 50):
+    """Pareto routing on ECAC long crossings: exact fronts against bounded labels."""
+    import numpy as np
+    from paretoRouting import ParetoRoutes, SegmentCosts
+    print("Pareto routing (paretoRouting.ParetoRoutes)")
+    airspace = load_airspace("Europe")
+    graph = airspace.get_graph()
+    pairs = _long_crossings(graph, num_queries)
+    rng = np.random.default_rng(0)
+    # Winds and congestion: per-segment ground speeds and fuel flows
+    speeds, fuel_flows = rng.uniform(600, 900, graph.num_edges), rng.uniform(1800, 2400, graph.num_edges)
+    for label, costs in (("distance/time/fuel", SegmentCosts(airspace, speeds=speeds, fuel_flows=fuel_flows)),
+                         ("distance/segments", SegmentCosts(airspace, ('distance', 'segments')))):
+        for max_labels in (None, 8, 2):
+            fronts, labels = [], []
+            def run():
+                for s, t in pairs:
+                    routes = ParetoRoutes(graph, s, t, costs, max_labels)
+                    fronts.append(len(routes))
+                    labels.append(routes[0].settled if routes else 0)
+            latency = timeit(run, repeat=1) / len(pairs)
+            print(f"  {label:<19} max labels {str(max_labels):<4} {latency * 1000:8.3f} ms/query  "
+                  f"front {sum(fronts) / len(fronts):5.1f} (max {max(fronts)})  "
+                  f"labels {sum(labels) / len(labels):8.1f}")
+
+# --- Reachability -------------------------------------------------------------
+
+def _reachability_list_queue(airspace: AirSpace, start_number: int, get_segments) -> set:
+    """The old _show_reachability loop: list queue with pop(0)."""
+    queue = [start_number]
+    visited = {start_number}
+    while queue:
+        current = queue.pop(0)
+        for segment in get_segments(current):
+            if segment.destination_number not in visited:
+                visited.add(segment.destination_number)
+                queue.append(segment.destination_number)
+    return visited
+
+def bench_reachability():
+    """Compare the old reachability loop with the vectorized engine."""
+    print("Reachability (AirSpace.get_reachable)")
+    for name in DATASET_FILES:
+        airspace = load_airspace(name)
+        start = airspace.nav_points[0].number
+        linear_segments = lambda number: GetSegmentsByOrigin(airspace.nav_segments, number)
+        old = timeit(lambda: _reachability_list_queue(airspace, start, linear_segments))
+        airspace.get_graph()
+        new = timeit(lambda: airspace.get_reachable(start))
+        report(f"{name} full reachability", old, new)
+    with tempfile.TemporaryDirectory() as directory:
+        nav_file, seg_file, aer_file = write_synthetic_airspace(directory, 100000, 1000000, seed=2)
+        airspace = AirSpace("Synthetic")
+        airspace.load_data(nav_file, seg_file, aer_file)
+    airspace.get_graph()
+    elapsed = timeit(lambda: airspace.get_reachable(1))
+    print(f"  Synthetic 100k points / 1M segments: {elapsed * 1000:.1f} ms")
+
+# --- Simple graphs --------------------------------------------------------------
+
+def synthetic_graph_columns(num_nodes: int, degree: int = 3, seed: int = 0) -> tuple:
+    """Columns of a simple graph for BuildGraph (node names, xs, ys, segment names, origins, destinations).
+
+    Nodes lie on a jittered square grid and each one links to `degree` of its
+    grid neighbours, so shortest paths stay long enough to be interesting.
+    """
+    rng = random.Random(seed)
+    side = int(num_nodes ** 0.5) + 1
+    names = [f"N{i}" for i in range(num_nodes)]
+    xs = [(i % side) * 10 + rng.randint(0, 4) for i in range(num_nodes)]
+    ys = [(i // side) * 10 + rng.randint(0, 4) for i in range(num_nodes)]
+    segment_names, origins, destinations = [], [], []
+    steps = (1, -1, side, -side)
+    for i in range(num_nodes):
+        for step in rng.sample(steps, degree):
+            j = i + step
+            if 0 <= j < num_nodes:
+                segment_names.append(f"S{i}_{j}")
+                origins.append(names[i])
+                destinations.append(names[j])
+    return names, xs, ys, segment_names, origins, destinations
+
+def bench_simple_graph(num_nodes: int = 100000):
+    """Build a synthetic simple graph and time FindShortestPath on it."""
+    from graph import FindShortestPath, BuildGraph
+    print(f"Simple graph ({num_nodes} nodes)")
+    columns = synthetic_graph_columns(num_nodes)
+    graphs = []
+    elapsed = timeit(lambda: graphs.append(BuildGraph(*columns)), repeat=1)
+    G = graphs[0]
+    print(f"  BuildGraph: {len(G.list_of_nodes)} nodes, {len(G.list_of_segments)} segments in {elapsed:.2f} s")
+    rng = random.Random(0)
+    queries = [(rng.choice(G.list_of_nodes), rng.choice(G.list_of_nodes)) for _ in range(10)]
+    found = []
+    elapsed = timeit(lambda: found.extend(FindShortestPath(G, o, d) is not None for o, d in queries), repeat=1)
+    print(f"  FindShortestPath: {elapsed / len(queries) * 1000:.1f} ms/query ({sum(found)} of {len(queries)} found)")
+
+# --- Spatial index ------------------------------------------------------------
+
+def _closest_linear(latitudes: list, longitudes: list, latitude: float, longitude: float) -> int:
+    """Pure-Python scan, the way GetClosest used to look for the closest point."""
+    from navPoint import Distance, NavPoint
+    target = NavPoint(0, "", latitude, longitude)
+    distances = [Distance(NavPoint(0, "", lat, lon), target) for lat, lon in zip(latitudes, longitudes)]
+    return distances.index(min(distances))
+
+def _closest_numpy(latitudes, longitudes, latitude: float, longitude: float) -> int:
+    """Vectorized brute force over all points."""
+    import numpy as np
+    from spatialIndex import UnitVectors
+    chords = ((UnitVectors(latitudes, longitudes) - UnitVectors([latitude], [longitude])[0]) ** 2).sum(axis=1)
+    return int(np.argmin(chords))
+
+def bench_spatial_index(num_points: int = 1000000):
+    """Nearest, radius and box queries on ECAC and on a synthetic point cloud."""
+    import numpy as np
+    from spatialIndex import GeoIndex
+    airspace = load_airspace("Europe")
+    store = airspace.get_store()
+    rng = np.random.default_rng(0)
+
+    def queries(count, lat_range, lon_range):
+        return list(zip(rng.uniform(*lat_range, count), rng.uniform(*lon_range, count)))
+
+    print(f"Spatial index ({len(store)} ECAC points)")
+    index = GeoIndex(store.latitudes, store.longitudes)
+    lat_range = (store.latitudes.min(), store.latitudes.max())
+    lon_range = (store.longitudes.min(), store.longitudes.max())
+    points = queries(200, lat_range, lon_range)
+    lats, lons = store.latitudes.tolist(), store.longitudes.tolist()
+    old = timeit(lambda: [_closest_linear(lats, lons, a, b) for a, b in points], repeat=1) / len(points)
+    new = timeit(lambda: [index.nearest(a, b) for a, b in points]) / len(points)
+    report("closest point (per query)", old, new)
+    assert all(_closest_linear(lats, lons, a, b) == index.nearest(a, b)[0][0] for a, b in points[:20])
+
+    print(f"Spatial index ({num_points} synthetic points)")
+    latitudes, longitudes = rng.uniform(35, 70, num_points), rng.uniform(-15, 35, num_points)
+    elapsed = timeit(lambda: GeoIndex(latitudes, longitudes), repeat=1)
+    print(f"  build: {elapsed:.2f} s")
+    index = GeoIndex(latitudes, longitudes)
+    points = queries(50, (35, 70), (-15, 35))
+    old = timeit(lambda: [_closest_numpy(latitudes, longitudes, a, b) for a, b in points], repeat=1) / len(points)
+    new = timeit(lambda: [index.nearest(a, b) for a, b in points]) / len(points)
+    report("closest point, NumPy brute force", old, new)
+    assert all(_closest_numpy(latitudes, longitudes, a, b) == index.nearest(a, b)[0][0] for a, b in points[:10])
+    new = timeit(lambda: [index.nearest(a, b, 10) for a, b in points]) / len(points)
+    print(f"  10 nearest: {new * 1000:.3f} ms/query")
+    new = timeit(lambda: [index.within_radius(a, b, 25.0) for a, b in points]) / len(points)
+    print(f"  within 25 km: {new * 1000:.3f} ms/query")
+    new = timeit(lambda: [index.in_box(a, a + 0.5, b, b + 0.5) for a, b in points]) / len(points)
+    print(f"  0.5 x 0.5 degree box: {new * 1000:.3f} ms/query")
+
+    # Clustered points leave most grid cells empty; queries far from them used to list every cell
+    centers = queries(20, (35, 70), (-15, 35))
+    which = rng.integers(0, len(centers), num_points)
+    latitudes = np.array([c[0] for c in centers])[which] + rng.normal(0, 0.3, num_points)
+    longitudes = np.array([c[1] for c in centers])[which] + rng.normal(0, 0.3, num_points)
+    index = GeoIndex(latitudes, longitudes)
+    print(f"Spatial index ({num_points} points in {len(centers)} clusters)")
+    for label, points in (("inside clusters", centers), ("far from the data", queries(20, (-60, 0), (-120, -30)))):
+        old = timeit(lambda: [_closest_numpy(latitudes, longitudes, a, b) for a, b in points], repeat=1) / len(points)
+        new = timeit(lambda: [index.nearest(a, b, 10) for a, b in points]) / len(points)
+        report(f"10 nearest, {label}, NumPy brute force", old, new)
+
+# --- Snapshots ----------------------------------------------------------------
+
+def _copy_dataset(name: str, directory: str) -> tuple:
+    """Copy (or, for Spain, extract) a bundled dataset into directory and return its file paths."""
+    import shutil
+    import zipfile
+    if name == "España":
+        with zipfile.ZipFile(os.path.join(BASE_DIR, "Airspace Spain", "Spain_graph.zip")) as archive:
+            archive.extractall(directory)
+        files = ("Spain_nav.txt", "Spain_seg.txt", "Spain_aer.txt")
+    else:
+        source_dir, *files = DATASET_FILES[name]
+        for file in files:
+            shutil.copy(os.path.join(BASE_DIR, source_dir, file), directory)
+    return tuple(os.path.join(directory, file) for file in files)
+
+def bench_snapshot():
+    """Cold (text parse) versus warm (memory-mapped snapshot) AirSpace.load_data."""
+    print("Snapshot loading (cold parse vs warm snapshot)")
+    with tempfile.TemporaryDirectory() as directory:
+        datasets = []
+        for name in ("Catalunya", "España", "Europe"):
+            os.makedirs(os.path.join(directory, name))
+            datasets.append((name, _copy_dataset(name, os.path.join(directory, name))))
+        os.makedirs(os.path.join(directory, "synthetic"))
+        datasets.append(("Synthetic 200k/1M",
+                         write_synthetic_airspace(os.path.join(directory, "synthetic"), 200000, 1000000)))
+        for name, files in datasets:
+            cold = timeit(lambda: AirSpace(name).load_data(*files, use_snapshot=False), repeat=1)
+            AirSpace(name).load_data(*files)  # Writes the snapshot
+            warm = timeit(lambda: AirSpace(name).load_data(*files))
+            print(f"  {name:<20} cold {cold * 1000:9.2f} ms   warm {warm * 1000:9.2f} ms   x{cold / warm:.1f}")
+
+def bench_mapped_open():
+    """Time AirSpace.open on airspace files of growing size."""
+    from routing import FindRoute
+    print("Mapped airspace files (AirSpace.open)")
+    with tempfile.TemporaryDirectory() as directory:
+        datasets = [("Europe", load_airspace("Europe"))]
+        for num_points, num_segments in ((20000, 100000), (200000, 1000000)):
+            subdir = os.path.join(directory, str(num_points))
+            os.makedirs(subdir)
+            airspace = AirSpace(f"Synthetic {num_points // 1000}k")
+            airspace.load_data(*write_synthetic_airspace(subdir, num_points, num_segments), use_snapshot=False)
+            datasets.append((airspace.name, airspace))
+        for name, airspace in datasets:
+            path = os.path.join(directory, f"{name}.airspace")
+            airspace.save(path)
+            size = os.path.getsize(path)
+            opened = timeit(lambda: AirSpace.open(path))
+            mapped = AirSpace.open(path)
+            numbers = mapped.get_store().numbers
+            route = timeit(lambda: FindRoute(mapped, int(numbers[0]), int(numbers[-1])), repeat=1)
+            print(f"  {name:<16} {size / 1e6:8.2f} MB   open {opened * 1000:7.2f} ms   "
+                  f"first route {route * 1000:9.2f} ms")
+
+# --- Bulk parser --------------------------------------------------------------
+
+def _load_nav_points_by_line(filename: str) -> list:
+    """The line-by-line LoadNavPoints, from before it used the bulk parser."""
+    from navPoint import NavPoint
+    points = []
+    with open(filename) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            number, name, lat, lon = line.split()
+            points.append(NavPoint(int(number), name, float(lat), float(lon)))
+    return points
+
+def _load_segments_by_line(filename: str, nav_points: list) -> list:
+    """The line-by-line LoadNavSegments (with a number index), from before it used the bulk parser."""
+    points_by_number = {}
+    for point in nav_points:
+        points_by_number.setdefault(point.number, point)
+    segments = []
+    with open(filename) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            orig_num, dest_num, dist = line.split()
+            segment = NavSegment(int(orig_num), int(dest_num), float(dist))
+            segment.origin = points_by_number.get(segment.origin_number)
+            segment.destination = points_by_number.get(segment.destination_number)
+            if segment.origin and segment.destination:
+                segment.origin.neighbors.append(segment.destination)
+                segments.append(segment)
+    return segments
+
+def bench_bulk_parser(num_lines: int = 1000000):
+    """Time the NumPy bulk parser and the loaders built on it against line-by-line parsing."""
+    from bulkParser import ParseNavPoints, ParseNavSegments
+    print(f"Bulk parsing ({num_lines // 1000}k-line nav and seg files)")
+    with tempfile.TemporaryDirectory() as directory:
+        nav_file, seg_file, aer_file = write_synthetic_airspace(directory, num_lines, num_lines)
+        old = timeit(lambda: _load_nav_points_by_line(nav_file), repeat=1)
+        report("nav file (ParseNavPoints)", old, timeit(lambda: ParseNavPoints(nav_file)))
+        report("nav file (LoadNavPoints, objects)", old, timeit(lambda: LoadNavPoints(nav_file), repeat=1))
+        points = LoadNavPoints(nav_file)
+        old = timeit(lambda: _load_segments_by_line(seg_file, points), repeat=1)
+        report("seg file (ParseNavSegments)", old, timeit(lambda: ParseNavSegments(seg_file)))
+        points = LoadNavPoints(nav_file)
+        report("seg file (LoadNavSegments, objects)", old,
+               timeit(lambda: LoadNavSegments(seg_file, points), repeat=1))
+        elapsed = timeit(lambda: AirSpace().load_data(nav_file, seg_file, aer_file, use_snapshot=False), repeat=1)
+        print(f"  load_data without snapshot: {elapsed:.2f} s")
+
+# --- Import time --------------------------------------------------------------
+
+IMPORT_MODULES = ("graph", "path", "navPoint", "navSegment", "navAirport", "airSpace", "routing",
+                  "airspaceCache", "interface")
+
+def _import_time(module: str) -> tuple:
+    """Cold-import a module in a fresh interpreter with -X importtime.
+
+    Returns:
+        tuple: (total microseconds, set of top-level packages imported)
+    """
+    import subprocess
+    import sys
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, cwd=BASE_DIR)
+    total, packages = 0, set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.strip() == module:
+            total = int(cumulative)
+        packages.add(name.strip().split(".")[0])
+    return total, packages
+
+def bench_import_time(repeat: int = 3):
+    """Report the cold import time of the core modules and the app, and whether they pull in plotting."""
+    print("Import time (python -X importtime, best of 3)")
+    for module in IMPORT_MODULES:
+        times = []
+        for _ in range(repeat):
+            total, packages = _import_time(module)
+            times.append(total)
+        heavy = sorted(packages & {"matplotlib", "PIL", "numpy", "tkinter"})
+        print(f"  {module:<14} {min(times) / 1000:8.1f} ms   {', '.join(heavy) or '-'}")
+
+if __name__ == "__main__":
+    bench_lookup_layer()
+    bench_segment_loading()
+    bench_store()
+    bench_routing()
+    bench_batch_routing()
+    bench_distance_matrix()
+    bench_alt()
+    bench_contraction()
+    bench_bidirectional()
+    bench_alternatives()
+    bench_pareto()
+    bench_reachability()
+    bench_simple_graph()
+    bench_spatial_index()
+    bench_snapshot()
+    bench_mapped_open()
+    bench_bulk_parser()
+    bench_import_time()
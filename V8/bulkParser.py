@@ -0,0 +1,267 @@
+"""Vectorized parsing of whitespace-separated text files into columnar arrays.
+
+The whole file is read as bytes and tokenized with NumPy: token and line
+boundaries come from one pass over the byte array, and decimal numbers are
+converted by digit arithmetic over all tokens of a column at once. Only
+tokens outside the fast path (exponents, very long numbers) go through
+Python's int()/float(). Malformed lines are collected in a ParseReport
+instead of being printed one by one.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from navStore import StringTable
+from dataSource import OpenBinary, SourceName
+
+_MAX_FAST_DIGITS = 15  # Below 2**53, so digits @ powers of ten and the final division are exact
+_MAX_FAST_LENGTH = 24
+
+class ParseReport:
+    def __init__(self, filename: str = None):
+        """Summary of a bulk parse.
+
+        Args:
+            filename (str): Name of the parsed file, for messages
+        """
+        self.filename = filename
+        self.lines = 0  # Data lines successfully parsed
+        self.errors = []  # (line number, line text, reason) of each malformed line
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def add_error(self, line_number: int, line: str, reason: str):
+        self.errors.append((line_number, line, reason))
+
+    def __str__(self):
+        name = f"'{self.filename}'" if self.filename else "input"
+        summary = f"Parsed {self.lines} lines of {name}"
+        if not self.errors:
+            return summary
+        details = "\n".join(f"  line {number}: '{line}': {reason}" for number, line, reason in self.errors[:10])
+        more = f"\n  ... and {len(self.errors) - 10} more" if len(self.errors) > 10 else ""
+        return f"{summary}, skipped {len(self.errors)} malformed lines:\n{details}{more}"
+
+def _gather(buffer: np.ndarray, starts: np.ndarray, ends: np.ndarray):
+    """Concatenate the byte ranges [starts[i], ends[i]) of a buffer."""
+    lengths = ends - starts
+    first = np.cumsum(lengths) - lengths
+    return buffer[np.repeat(starts - first, lengths) + np.arange(int(lengths.sum()))]
+
+def _parse_decimal(buffer: np.ndarray, starts: np.ndarray, ends: np.ndarray, dot_offsets: np.ndarray = None):
+    """Convert the tokens buffer[starts[i]:ends[i]] to float64.
+
+    Tokens are grouped by layout (length, position of the decimal point,
+    sign). All tokens of a group have their digits in the same columns, so
+    the group is converted with one gather and one matrix product.
+
+    Args:
+        buffer (np.ndarray): uint8 file contents
+        starts (np.ndarray): First byte of each token
+        ends (np.ndarray): One past the last byte of each token
+        dot_offsets (np.ndarray): Offset of the decimal point in each token, -1
+            if none; None for integer columns
+
+    Returns:
+        tuple: (values, fast) where fast[i] is False for tokens the caller
+        must convert another way; their values are undefined
+    """
+    count = len(starts)
+    values = np.zeros(count, dtype=np.float64)
+    fast = np.zeros(count, dtype=bool)
+    if count == 0:
+        return values, fast
+    lengths = ends - starts
+    first_chars = buffer[starts]
+    signed = (first_chars == 45) | (first_chars == 43)
+    if dot_offsets is None:
+        dot_offsets = np.full(count, -1, dtype=np.int64)
+    keys = (np.minimum(lengths, _MAX_FAST_LENGTH + 1) * (_MAX_FAST_LENGTH + 2) + dot_offsets + 1) * 2 + signed
+
+    present = np.flatnonzero(np.bincount(keys))
+    if len(present) == 1:
+        groups = [(present[0], np.arange(count))]
+    else:
+        order = np.argsort(keys, kind='stable')
+        bounds = np.append(np.searchsorted(keys[order], present), count)
+        groups = [(key, order[bounds[i]:bounds[i + 1]]) for i, key in enumerate(present)]
+
+    for key, rows in groups:
+        sign, layout = key % 2, key // 2
+        length, dot = layout // (_MAX_FAST_LENGTH + 2), layout % (_MAX_FAST_LENGTH + 2) - 1
+        digit_columns = [j for j in range(length) if j != dot and not (sign and j == 0)]
+        if length > _MAX_FAST_LENGTH or not digit_columns or len(digit_columns) > _MAX_FAST_DIGITS:
+            continue
+        chars = sliding_window_view(buffer, length)[starts[rows]]
+        digits = chars[:, digit_columns] - np.uint8(48)
+        powers = 10.0 ** np.arange(len(digit_columns) - 1, -1, -1)
+        group_values = digits.astype(np.float64) @ powers
+        if dot >= 0:
+            group_values /= 10.0 ** (length - 1 - dot)
+        if sign:
+            group_values = np.where(chars[:, 0] == 45, -group_values, group_values)
+        values[rows] = group_values
+        fast[rows] = (digits < 10).all(axis=1)
+    return values, fast
+
+def ReadBytes(source) -> bytes:
+    """Read a whole source (path, compressed file or file object, see dataSource) as bytes."""
+    with OpenBinary(source) as f:
+        data = f.read()
+    return data.encode('utf-8') if isinstance(data, str) else data
+
+def ParseColumns(data: bytes, kinds: str, report: ParseReport = None):
+    """Parse lines of whitespace-separated fields into one array per column.
+
+    Empty lines and lines starting with '#' are skipped. Lines with the wrong
+    number of fields or a field that does not convert are reported and skipped.
+
+    Args:
+        data (bytes): File contents
+        kinds (str): One character per field: 'i' integer, 'f' float, 's' string
+        report (ParseReport): Report to fill, a new one by default
+
+    Returns:
+        tuple: (columns, report) where columns is a list with an int64 array,
+        a float64 array or a StringTable per field
+    """
+    report = report if report is not None else ParseReport()
+    num_fields = len(kinds)
+    buffer = np.frombuffer(data + b'\n', dtype=np.uint8)  # Every token ends before a blank
+
+    # Token boundaries alternate: start, end, start, end, ...
+    blank = buffer <= 32
+    transitions = np.flatnonzero(blank[1:] != blank[:-1]) + 1
+    if len(buffer) and not blank[0]:
+        transitions = np.concatenate(([0], transitions))
+    starts, ends = transitions[0::2], transitions[1::2]
+
+    # Fields per line, and comment lines starting with '#' after leading whitespace
+    newlines = np.flatnonzero(buffer[:-1] == 10)
+    line_bounds = np.concatenate(([0], np.searchsorted(starts, newlines), [len(starts)]))
+    fields = np.diff(line_bounds)
+    comment = np.zeros(len(fields), dtype=bool)
+    non_empty = fields > 0
+    comment[non_empty] = buffer[starts[line_bounds[:-1][non_empty]]] == 35
+    wrong_count = non_empty & ~comment & (fields != num_fields)
+    good = non_empty & ~comment & ~wrong_count
+
+    if not good[non_empty].all():
+        selected = np.repeat(good, fields)
+        starts, ends = starts[selected], ends[selected]
+    starts = starts.reshape(-1, num_fields)
+    ends = ends.reshape(-1, num_fields)
+    rows_valid = np.ones(len(starts), dtype=bool)
+    row_errors = {}
+
+    dot_offsets = np.full(starts.shape, -1, dtype=np.int64)
+    if 'f' in kinds and starts.size:
+        # Offset of the (last) decimal point in each token, -1 if none
+        dots = np.flatnonzero(buffer == 46)
+        flat_starts = starts.ravel()
+        dot_tokens = np.searchsorted(flat_starts, dots, side='right') - 1
+        inside = (dot_tokens >= 0) & (dots < ends.ravel()[np.maximum(dot_tokens, 0)])
+        dot_offsets.ravel()[dot_tokens[inside]] = dots[inside] - flat_starts[dot_tokens[inside]]
+
+    columns = []
+    for k, kind in enumerate(kinds):
+        if kind == 's':
+            columns.append(None)
+            continue
+        if kind == 'i':
+            values, fast = _parse_decimal(buffer, starts[:, k], ends[:, k])
+            values, convert = values.astype(np.int64), int
+        else:
+            values, fast = _parse_decimal(buffer, starts[:, k], ends[:, k], dot_offsets[:, k])
+            convert = float
+        for row in np.flatnonzero(~fast).tolist():
+            token = data[starts[row, k]:ends[row, k]]
+            try:
+                values[row] = convert(token)
+            except (ValueError, OverflowError):
+                rows_valid[row] = False
+                row_errors.setdefault(row, f"invalid {'integer' if kind == 'i' else 'number'} "
+                                           f"'{token.decode('utf-8', 'replace')}'")
+        columns.append(values)
+
+    # Report malformed lines in file order
+    line_numbers = np.flatnonzero(good)
+    errors = [(int(line), f"expected {num_fields} fields, got {int(fields[line])}")
+              for line in np.flatnonzero(wrong_count)]
+    errors += [(int(line_numbers[row]), reason) for row, reason in row_errors.items()]
+    if errors:
+        line_starts = np.concatenate(([0], newlines + 1))
+        line_ends = np.append(newlines, len(data))
+        for line, reason in sorted(errors):
+            text = data[line_starts[line]:line_ends[line]].decode('utf-8', 'replace').strip()
+            report.add_error(line + 1, text, reason)
+
+    if not rows_valid.all():
+        starts, ends = starts[rows_valid], ends[rows_valid]
+    result = []
+    for k, (kind, column) in enumerate(zip(kinds, columns)):
+        if kind == 's':
+            offsets = np.zeros(len(starts) + 1, dtype=np.int64)
+            np.cumsum(ends[:, k] - starts[:, k], out=offsets[1:])
+            result.append(StringTable(offsets, _gather(buffer, starts[:, k], ends[:, k])))
+        else:
+            result.append(column if rows_valid.all() else column[rows_valid])
+    report.lines += len(starts)
+    return result, report
+
+def _ParseFile(filename, kinds: str, progress=None):
+    """ParseColumns on a whole source; a missing or unreadable file parses as empty.
+
+    progress (LoadProgress) is advanced by the number of lines of the source
+    once it is parsed, and raises LoadCancelled if it was cancelled.
+    """
+    report = ParseReport(SourceName(filename))
+    try:
+        data = ReadBytes(filename)
+    except FileNotFoundError:
+        print(f"Error: File '{SourceName(filename)}' not found")
+        data = b''
+    except (OSError, EOFError) as e:
+        print(f"Error reading file '{SourceName(filename)}': {e}")
+        data = b''
+    result = ParseColumns(data, kinds, report)
+    if progress is not None:
+        progress.advance(data.count(b'\n') + (not data.endswith(b'\n') if data else 0))
+    return result
+
+def ParseNavPoints(filename, progress=None):
+    """Bulk-parse a navigation points file (number name latitude longitude).
+
+    On a 1M-line file this is about 4-5x faster than the old line-by-line
+    loader, against about 10x for segment files. Nav lines carry two 12-13
+    digit coordinates and a name, so the dozen NumPy passes over every byte
+    (tokenizing, grouping by layout, gathering digits) cost about as much as
+    the per-line work they replace. Splitting with bytes.split() and
+    converting each column with np.array(tokens, dtype=float) measured no
+    faster (0.26 s to split plus 0.14 s per float column).
+
+    Args:
+        filename: Path to the navigation points file, or any source dataSource.OpenBinary accepts
+        progress (LoadProgress): Advanced by the lines read once the file is parsed
+
+    Returns:
+        tuple: ({'numbers', 'names', 'latitudes', 'longitudes'}, ParseReport),
+        names being a StringTable
+    """
+    (numbers, names, latitudes, longitudes), report = _ParseFile(filename, 'isff', progress)
+    return {'numbers': numbers, 'names': names, 'latitudes': latitudes, 'longitudes': longitudes}, report
+
+def ParseNavSegments(filename, progress=None):
+    """Bulk-parse a segments file (origin_number destination_number distance).
+
+    Segments are not linked to points; map the numbers with NavStore.indices_of.
+
+    Args:
+        filename: Path to the segments file, or any source dataSource.OpenBinary accepts
+        progress (LoadProgress): Advanced by the lines read once the file is parsed
+
+    Returns:
+        tuple: ({'origins', 'destinations', 'distances'}, ParseReport)
+    """
+    (origins, destinations, distances), report = _ParseFile(filename, 'iif', progress)
+    return {'origins': origins, 'destinations': destinations, 'distances': distances}, report
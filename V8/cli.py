@@ -0,0 +1,336 @@
+"""Headless command-line access to routing, reachability and statistics.
+
+Usage:
+    python cli.py AIRSPACE stats
+    python cli.py AIRSPACE shortest-path ORIGIN DESTINATION [--method METHOD] [--workers N]
+    python cli.py AIRSPACE reachability POINT... [--max-hops N | --max-distance KM]
+    python cli.py AIRSPACE neighbors POINT...
+
+AIRSPACE is a bundled dataset name (Catalunya, España, Europe), a directory
+holding *_nav.txt, *_seg.txt and *_aer.txt files, a nav file (the seg and aer
+files are found by name), a zip/tar archive or a file written by AirSpace.save.
+Text datasets are cached in a snapshot next to their files unless
+--no-snapshot is given, and the routing tables of --method alt and ch are
+cached in --cache-dir (routeCache.CACHE_DIR by default); both go before AIRSPACE.
+Points are navigation numbers or names.
+
+Without point arguments the queries are read from --input or stdin, one per
+line ("ORIGIN DESTINATION" for shortest-path, "POINT" otherwise). Every query
+produces one JSON object per output line, written as soon as it is answered;
+failed queries get an "error" field instead of aborting the batch. METHOD is
+astar (default), alt, ch, dijkstra, biastar or bidijkstra (see
+routing.FindRoute). With --workers, shortest-path queries are routed in
+windows on a process pool (batchRouting), still answered in input order; a
+window is routed as soon as no further query is ready, so queries piped in
+one at a time are answered one at a time. The pool routes exact shortest
+paths, so --workers only goes with the astar and dijkstra methods. Loader
+messages go to stderr so stdout stays valid JSON lines. Nothing here imports
+tkinter or matplotlib.
+"""
+import argparse
+import contextlib
+import glob
+import json
+import os
+import queue
+import sys
+import threading
+import numpy as np
+from airSpace import AirSpace
+from airspaceCache import DATASETS
+from batchRouting import BatchRouter
+from routing import FindRoute
+from reachability import ReachableMask
+from snapshot import SNAPSHOT_MAGIC
+
+def LoadAirspace(spec: str, use_snapshot: bool = True) -> AirSpace:
+    """Load an airspace from a dataset name or a path (see the module docstring).
+
+    Loader messages are written to stderr. use_snapshot reads and writes the
+    binary snapshot of text datasets (see AirSpace.load_data).
+
+    Raises:
+        ValueError: If the airspace cannot be found or loaded
+    """
+    with contextlib.redirect_stdout(sys.stderr):
+        if spec in DATASETS:
+            airspace = DATASETS[spec].load(use_snapshot=use_snapshot)
+            if airspace is None:
+                raise ValueError(f"Failed to load {spec} airspace data")
+            return airspace
+        if not os.path.exists(spec):
+            raise ValueError(f"'{spec}' is neither a dataset ({', '.join(DATASETS)}) nor a file")
+
+        if os.path.isdir(spec):
+            files = [sorted(glob.glob(os.path.join(spec, f"*_{kind}.txt"))) for kind in ("nav", "seg", "aer")]
+            if not all(files):
+                raise ValueError(f"'{spec}' does not hold *_nav.txt, *_seg.txt and *_aer.txt files")
+            return _LoadFiles(os.path.basename(os.path.normpath(spec)), [names[0] for names in files],
+                              use_snapshot)
+        with open(spec, 'rb') as f:
+            magic = f.read(len(SNAPSHOT_MAGIC))
+        if magic == SNAPSHOT_MAGIC:
+            return AirSpace.open(spec)
+        name = os.path.basename(spec).split('.')[0]
+        if not spec.endswith('_nav.txt'):
+            airspace = AirSpace(name=name)
+            if not airspace.load_archive(spec, use_snapshot=use_snapshot):
+                raise ValueError(f"Failed to load '{spec}'")
+            return airspace
+        prefix = spec[:-len('nav.txt')]
+        return _LoadFiles(name[:-len('_nav')], [spec, prefix + 'seg.txt', prefix + 'aer.txt'], use_snapshot)
+
+def _LoadFiles(name: str, files: list, use_snapshot: bool) -> AirSpace:
+    airspace = AirSpace(name=name)
+    if not airspace.load_data(*files, use_snapshot=use_snapshot):
+        raise ValueError(f"Failed to load '{files[0]}'")
+    return airspace
+
+class QueryRunner:
+    def __init__(self, airspace: AirSpace, cache_dir: str = None):
+        """Answer queries over the compiled store and graph of an airspace.
+
+        Works on the row indices of airspace.get_store(), so airspaces opened
+        from a snapshot are queried without building their objects.
+
+        Args:
+            airspace (AirSpace): Loaded airspace
+            cache_dir (str): Routing cache directory for precomputed tables
+        """
+        self.airspace = airspace
+        self.cache_dir = cache_dir
+        self.store = airspace.get_store()
+        self.graph = airspace.get_graph()
+
+    def resolve(self, token: str) -> int:
+        """Return the store row of a navigation number or name.
+
+        Raises:
+            ValueError: If no point has that number or name
+        """
+        index = self.store.index_of(int(token)) if token.lstrip('-').isdigit() else -1
+        if index < 0:
+            index = self.store.names.find(token)
+        if index < 0:
+            raise ValueError(f"Point {token} not found")
+        return index
+
+    def point(self, index: int) -> dict:
+        return {'number': int(self.store.numbers[index]), 'name': self.store.names[index]}
+
+    def stats(self) -> dict:
+        stats = self.airspace.get_statistics()
+        stats['num_edges'] = self.graph.num_edges
+        return stats
+
+    def shortest_path(self, origin: str, destination: str, method: str = 'astar') -> dict:
+        source, target = self.resolve(origin), self.resolve(destination)
+        if method == 'ch':
+            # FindRoute uses the attached hierarchy; build or load it from the cache first
+            self.airspace.build_contraction_hierarchy(cache_dir=self.cache_dir)
+        result = FindRoute(self.airspace, int(self.store.numbers[source]), int(self.store.numbers[target]),
+                           method, cache_dir=self.cache_dir)
+        return self._route_record(origin, destination, result)
+
+    def shortest_paths(self, queries: list, workers: int = None) -> list:
+        """Answer a window of [origin, destination] queries on a BatchRouter.
+
+        Returns:
+            list: A record per query, in order; unresolved points give an error record
+        """
+        pairs, records = [], []
+        for origin, destination in queries:
+            try:
+                pairs.append((self.resolve(origin), self.resolve(destination)))
+                records.append(None)
+            except ValueError as e:
+                records.append({'query': f"{origin} {destination}", 'error': str(e)})
+        results = iter(BatchRouter(self.graph, workers).route(pairs))
+        return [record if record is not None else self._route_record(origin, destination, next(results))
+                for (origin, destination), record in zip(queries, records)]
+
+    def _route_record(self, origin: str, destination: str, result) -> dict:
+        return {'origin': origin, 'destination': destination, 'found': result.found,
+                'distance': result.distance if result.found else None,
+                'route': [self.point(i) for i in result.nodes], 'settled': result.settled}
+
+    def reachability(self, origin: str, max_hops: int = None, max_distance: float = None) -> dict:
+        mask = ReachableMask(self.graph, [self.resolve(origin)], max_hops=max_hops, max_distance=max_distance)
+        reachable = np.flatnonzero(mask)
+        return {'origin': origin, 'count': int(len(reachable)),
+                'reachable': self.store.numbers[reachable].tolist()}
+
+    def neighbors(self, point: str) -> dict:
+        targets, weights = self.graph.neighbors(self.resolve(point))
+        return {'point': point, 'neighbors': [dict(self.point(int(j)), distance=float(w))
+                                              for j, w in zip(targets, weights)]}
+
+def _ReadQueries(source, fields: int):
+    """Yield the token lists of the non-empty, non-comment lines of a query file."""
+    for line in source:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            tokens = line.split()
+            yield tokens if len(tokens) == fields else (line, f"expected {fields} fields, got {len(tokens)}")
+
+BATCH_WINDOW = 10000  # Queries routed together by --workers, at most
+POOL_METHODS = ("astar", "dijkstra")  # Methods whose answers the pool reproduces
+
+def _ReadAhead(queries, size: int):
+    """Iterate queries on a background thread.
+
+    Yields each query as soon as it is read; when the next one is not ready
+    yet, yields None first (once) so the caller can act on what it has.
+    """
+    ready = queue.Queue(maxsize=size)
+    end = object()
+    failure = []
+
+    def read():
+        try:
+            for tokens in queries:
+                ready.put(tokens)
+        except BaseException as e:  # Re-raised in the consuming thread
+            failure.append(e)
+        finally:
+            ready.put(end)
+
+    threading.Thread(target=read, daemon=True).start()
+    while True:
+        try:
+            tokens = ready.get_nowait()
+        except queue.Empty:
+            yield None
+            tokens = ready.get()
+        if tokens is end:
+            break
+        yield tokens
+    if failure:
+        raise failure[0]
+
+def _BatchShortestPaths(runner: QueryRunner, queries, workers: int):
+    """Route shortest-path queries in windows, yielding records (and malformed-line tuples) in order.
+
+    A window is routed when it is full or when the next query is not ready yet.
+    """
+    window = []
+    for tokens in _ReadAhead(queries, BATCH_WINDOW):
+        if tokens is None:
+            if window:
+                yield from runner.shortest_paths(window, workers or None)
+                window = []
+            continue
+        if isinstance(tokens, tuple):
+            yield from runner.shortest_paths(window, workers or None)
+            window = []
+            yield tokens
+            continue
+        window.append(tokens)
+        if len(window) >= BATCH_WINDOW:
+            yield from runner.shortest_paths(window, workers or None)
+            window = []
+    if window:
+        yield from runner.shortest_paths(window, workers or None)
+
+def _BuildParser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli.py", description="Headless airspace routing and analytics.")
+    parser.add_argument("airspace", help="Dataset name, directory, nav file, archive or airspace file")
+    parser.add_argument("--no-snapshot", action="store_true", help="Neither read nor write airspace snapshots")
+    parser.add_argument("--cache-dir", help="Routing cache directory for precomputed tables")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="Airspace statistics")
+    for name, help_text in (("shortest-path", "Shortest route between two points"),
+                            ("reachability", "Points reachable from a point"),
+                            ("neighbors", "Outgoing segments of a point")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("points", nargs="*", help="Query points (read from --input/stdin if omitted)")
+        command.add_argument("--input", "-i", help="File with one query per line ('-' for stdin)")
+        if name == "shortest-path":
+            command.add_argument("--method", choices=("astar", "alt", "ch", "dijkstra", "biastar", "bidijkstra"),
+                                 default="astar")
+            command.add_argument("--workers", type=int,
+                                 help="Route on a pool of N processes (0: one per CPU); astar and dijkstra only")
+        if name == "reachability":
+            command.add_argument("--max-hops", type=int)
+            command.add_argument("--max-distance", type=float)
+    return parser
+
+def main(argv: list = None, stdin=None, stdout=None) -> int:
+    """Run the command line tool.
+
+    Args:
+        argv (list): Arguments, sys.argv[1:] by default
+        stdin: Query source when neither points nor --input are given
+        stdout: Where the JSON lines go
+
+    Returns:
+        int: Process exit status (1 if the airspace could not be loaded, 2 for bad arguments
+                or an unreadable --input file)
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    args = _BuildParser().parse_args(argv)
+    if getattr(args, 'workers', None) is not None and args.method not in POOL_METHODS:
+        print(f"Error: --workers routes exact shortest paths, use it with --method "
+              f"{' or '.join(POOL_METHODS)}", file=sys.stderr)
+        return 2
+    try:
+        runner = QueryRunner(LoadAirspace(args.airspace, use_snapshot=not args.no_snapshot), args.cache_dir)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    streaming = args.command != "stats" and not args.points and args.input in (None, '-')
+
+    def emit(record: dict):
+        stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+        if streaming:
+            stdout.flush()  # Answer piped queries as they come
+
+    if args.command == "stats":
+        emit(runner.stats())
+        return 0
+
+    if args.command == "shortest-path":
+        fields = 2
+        answer = lambda tokens: runner.shortest_path(tokens[0], tokens[1], args.method)
+    elif args.command == "reachability":
+        fields = 1
+        answer = lambda tokens: runner.reachability(tokens[0], args.max_hops, args.max_distance)
+    else:
+        fields = 1
+        answer = lambda tokens: runner.neighbors(tokens[0])
+
+    with contextlib.ExitStack() as stack:
+        if args.points:
+            if len(args.points) % fields:
+                print(f"Error: {args.command} takes points in groups of {fields}", file=sys.stderr)
+                return 2
+            queries = [args.points[i:i + fields] for i in range(0, len(args.points), fields)]
+        elif args.input and args.input != '-':
+            try:
+                source = stack.enter_context(open(args.input))
+            except OSError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                return 2
+            queries = _ReadQueries(source, fields)
+        else:
+            queries = _ReadQueries(stdin, fields)
+        if args.command == "shortest-path" and args.workers is not None:
+            queries = _BatchShortestPaths(runner, queries, args.workers)
+        for tokens in queries:
+            if isinstance(tokens, dict):
+                emit(tokens)
+                continue
+            if isinstance(tokens, tuple):
+                emit({'query': tokens[0], 'error': tokens[1]})
+                continue
+            try:
+                emit(answer(tokens))
+            except ValueError as e:
+                emit({'query': " ".join(tokens), 'error': str(e)})
+    stdout.flush()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
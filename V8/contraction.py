@@ -0,0 +1,349 @@
+"""Contraction hierarchies over a compiled CSRGraph.
+
+Nodes are contracted one by one in order of importance (edge difference plus
+the number of already contracted neighbours, re-evaluated lazily). Removing a
+node v adds a shortcut u -> x for every pair of neighbours whose shortest
+route went through v, unless a bounded witness search finds another route that
+is at least as short. A query then runs two small Dijkstra searches that only
+climb to more important nodes: forward from the origin and backward from the
+destination. They meet at the most important node of the shortest route.
+
+A hierarchy records the routeCache.DatasetVersion of the graph it was built
+from. HierarchyRoute falls back to plain Dijkstra when the hierarchy is stale.
+"""
+from heapq import heappush, heappop
+import numpy as np
+from routeCache import DatasetVersion, SaveArrays, LoadArrays
+from routing import RouteResult, Dijkstra
+
+WITNESS_SETTLE_LIMIT = 500  # Nodes a witness search may settle before giving up (adds a shortcut)
+CORE_DEGREE = 64  # Stop contracting when the next node has more edges than this
+
+def _WitnessSearch(out_edges: list, source: int, skip: int, targets: set, max_distance: float) -> dict:
+    """Bounded Dijkstra from source over the uncontracted nodes, avoiding skip.
+
+    Stops once every target is settled, the next node is farther than
+    max_distance, or WITNESS_SETTLE_LIMIT nodes were settled.
+    """
+    dist = {source: 0.0}
+    heap = [(0.0, source)]
+    remaining = len(targets)
+    settled = 0
+    while heap and settled < WITNESS_SETTLE_LIMIT and remaining:
+        d_u, u = heappop(heap)
+        if d_u > dist[u]:
+            continue
+        if d_u > max_distance:
+            break
+        settled += 1
+        if u in targets:
+            remaining -= 1
+        for v, w in out_edges[u].items():
+            if v == skip:
+                continue
+            d_v = d_u + w
+            if d_v < dist.get(v, float('inf')):
+                dist[v] = d_v
+                heappush(heap, (d_v, v))
+    return dist
+
+def _Shortcuts(out_edges: list, in_edges: list, v: int) -> tuple:
+    """Shortcuts (u, x, weight) needed to contract v, and the number of remaining edges of v.
+
+    out_edges and in_edges only hold the edges between uncontracted nodes.
+    """
+    sources = list(in_edges[v].items())
+    targets = list(out_edges[v].items())
+    if not sources or not targets:
+        return [], len(sources) + len(targets)
+    max_out = max(w for _, w in targets)
+    target_set = {x for x, _ in targets}
+    shortcuts = []
+    for u, w_uv in sources:
+        witness = _WitnessSearch(out_edges, u, v, target_set - {u}, w_uv + max_out)
+        for x, w_vx in targets:
+            if x != u and w_uv + w_vx < witness.get(x, float('inf')):
+                shortcuts.append((u, x, w_uv + w_vx))
+    return shortcuts, len(sources) + len(targets)
+
+def _Priority(shortcuts: list, degree: int, deleted: int) -> int:
+    """Edge difference of contracting a node plus its contracted neighbours."""
+    return len(shortcuts) - degree + deleted
+
+class ContractionHierarchy:
+    def __init__(self, rank: np.ndarray, up: tuple, down: tuple, core_rank: int = None, version: str = None):
+        """Contracted graph, split into the edges each query direction may use.
+
+        Args:
+            rank (np.ndarray): int32 contraction order of every node
+            up (tuple): (offsets, targets, weights, mids) of the edges u -> x with
+                rank[x] > rank[u], grouped by u
+            down (tuple): (offsets, sources, weights, mids) of the edges u -> x with
+                rank[u] > rank[x], grouped by x
+            core_rank (int): Rank of the first uncontracted (core) node, whose
+                edges to other core nodes are in both up and down; None if
+                every node was contracted
+            version (str): routeCache.DatasetVersion of the graph
+        mids holds the node a shortcut bypasses, -1 for original segments.
+        """
+        self.rank = rank
+        self.up = up
+        self.down = down
+        self.core_rank = len(rank) if core_rank is None else int(core_rank)
+        self.version = version
+        self._lists = None
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.rank)
+
+    @property
+    def core_size(self) -> int:
+        return len(self.rank) - self.core_rank
+
+    @property
+    def num_shortcuts(self) -> int:
+        """Shortcuts added, counting those between core nodes once."""
+        in_core = self.rank[self.down[1]] >= self.core_rank
+        down_core = np.repeat(np.arange(self.num_nodes), np.diff(self.down[0]))
+        in_core &= self.rank[down_core] >= self.core_rank
+        return int((self.up[3] >= 0).sum() + ((self.down[3] >= 0) & ~in_core).sum())
+
+    def _as_lists(self):
+        """Cached Python lists of the up and down arrays, for the query loop."""
+        if self._lists is None:
+            self._lists = (tuple(a.tolist() for a in self.up), tuple(a.tolist() for a in self.down))
+        return self._lists
+
+    def query(self, source: int, target: int) -> RouteResult:
+        """Shortest route by a bidirectional search over the upward edges.
+
+        The search stops once both sides' smallest tentative distances reach
+        the best route found so far, so inside the core, where both sides
+        follow every edge, it settles every node closer than the route.
+        Nodes reached suboptimally from below are stalled (stall-on-demand):
+        if a more important neighbour already offers a shorter distance, their
+        edges are not relaxed.
+
+        Returns:
+            RouteResult: Route over node indices with shortcuts unpacked;
+            settled counts the nodes settled by both sides
+        """
+        up, down = self._as_lists()
+        inf = float('inf')
+        dist = ({source: 0.0}, {target: 0.0})
+        parent = ({}, {})
+        heaps = ([(0.0, source)], [(0.0, target)])
+        done = (set(), set())
+        # Edges each side relaxes, and the edges into a node from above it in that direction
+        relax = (up[:3], down[:3])
+        stall = (down[:3], up[:3])
+        best, meet = (0.0, source) if source == target else (inf, -1)
+        while True:
+            top_forward = heaps[0][0][0] if heaps[0] else inf
+            top_backward = heaps[1][0][0] if heaps[1] else inf
+            if top_forward >= best and top_backward >= best:
+                break
+            side = 0 if top_forward <= top_backward else 1
+            d_u, u = heappop(heaps[side])
+            if u in done[side]:
+                continue
+            done[side].add(u)
+            other = dist[1 - side].get(u)
+            if other is not None and d_u + other < best:
+                best, meet = d_u + other, u
+            own_dist = dist[side]
+            offsets, heads, weights = stall[side]
+            stalled = False
+            for k in range(offsets[u], offsets[u + 1]):
+                if own_dist.get(heads[k], inf) + weights[k] < d_u:
+                    stalled = True
+                    break
+            if stalled:
+                continue
+            offsets, heads, weights = relax[side]
+            own_parent = parent[side]
+            for k in range(offsets[u], offsets[u + 1]):
+                v = heads[k]
+                d_v = d_u + weights[k]
+                if d_v < own_dist.get(v, inf):
+                    own_dist[v] = d_v
+                    own_parent[v] = u
+                    heappush(heaps[side], (d_v, v))
+        settled = len(done[0]) + len(done[1])
+        if meet < 0:
+            return RouteResult([], inf, settled)
+        forward = [meet]
+        while forward[-1] != source:
+            forward.append(parent[0][forward[-1]])
+        forward.reverse()
+        backward = [meet]
+        while backward[-1] != target:
+            backward.append(parent[1][backward[-1]])
+        hops = forward + backward[1:]
+        nodes = [source]
+        for u, x in zip(hops, hops[1:]):
+            self._unpack(u, x, nodes)
+        return RouteResult(nodes, best, settled)
+
+    def _edge(self, u: int, x: int) -> tuple:
+        """(weight, mid) of the stored edge u -> x."""
+        (up_offsets, up_targets, up_weights, up_mids), (down_offsets, down_sources, down_weights, down_mids) = \
+            self._as_lists()
+        best = (float('inf'), -1)
+        if self.rank[x] > self.rank[u]:
+            for k in range(up_offsets[u], up_offsets[u + 1]):
+                if up_targets[k] == x and up_weights[k] < best[0]:
+                    best = (up_weights[k], up_mids[k])
+        else:
+            for k in range(down_offsets[x], down_offsets[x + 1]):
+                if down_sources[k] == u and down_weights[k] < best[0]:
+                    best = (down_weights[k], down_mids[k])
+        return best
+
+    def _unpack(self, u: int, x: int, nodes: list):
+        """Append the original route of edge u -> x (without u) to nodes."""
+        stack = [(u, x)]
+        while stack:
+            a, b = stack.pop()
+            mid = self._edge(a, b)[1]
+            if mid < 0:
+                nodes.append(b)
+            else:
+                stack.append((mid, b))
+                stack.append((a, mid))
+
+    def arrays(self) -> dict:
+        names = ('offsets', 'heads', 'weights', 'mids')
+        arrays = {'rank': self.rank, 'core_rank': np.array([self.core_rank])}
+        arrays.update({f"up_{name}": a for name, a in zip(names, self.up)})
+        arrays.update({f"down_{name}": a for name, a in zip(names, self.down)})
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: dict, version: str = None) -> 'ContractionHierarchy':
+        names = ('offsets', 'heads', 'weights', 'mids')
+        return cls(arrays['rank'], tuple(arrays[f"up_{name}"] for name in names),
+                   tuple(arrays[f"down_{name}"] for name in names), int(arrays['core_rank'][0]), version)
+
+    def save(self, path: str) -> bool:
+        """Write the hierarchy to a compressed .npz file."""
+        return SaveArrays(path, self.arrays(), self.version or "", meta={'version': self.version})
+
+    @classmethod
+    def load(cls, path: str) -> 'ContractionHierarchy':
+        """Read a hierarchy written by save(), or return None if the file is missing or invalid.
+
+        Whether it still matches the graph is checked by HierarchyRoute,
+        against the version stored in the file.
+        """
+        cached = LoadArrays(path)
+        if cached is None:
+            return None
+        arrays, meta = cached
+        try:
+            return cls.from_arrays(arrays, meta.get('version'))
+        except KeyError as e:
+            print(f"Warning: ignoring contraction hierarchy '{path}': missing the {e} array")
+            return None
+
+def _Compile(num_nodes: int, edges: dict, rank: np.ndarray, core_rank: int, upward: bool) -> tuple:
+    """Group the edges going up (or coming down) in rank by their lower node.
+
+    Edges between two core nodes go both ways.
+    """
+    selected = [(u, x, w, mid) for (u, x), (w, mid) in edges.items()
+                if (rank[x] > rank[u]) == upward or min(rank[u], rank[x]) >= core_rank]
+    if not selected:
+        return (np.zeros(num_nodes + 1, dtype=np.int64), np.zeros(0, dtype=np.int32),
+                np.zeros(0, dtype=np.float64), np.zeros(0, dtype=np.int32))
+    u, x, w, mid = (np.array(column) for column in zip(*selected))
+    key = u if upward else x  # Node whose search follows the edge
+    head = x if upward else u
+    order = np.argsort(key, kind='stable')
+    offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(key, minlength=num_nodes), out=offsets[1:])
+    return (offsets, head[order].astype(np.int32), w[order].astype(np.float64), mid[order].astype(np.int32))
+
+def BuildContractionHierarchy(graph, version: str = None, core_degree: int = CORE_DEGREE,
+                              progress=None) -> ContractionHierarchy:
+    """Contract the nodes of a graph.
+
+    Contraction stops early when the least important remaining node has more
+    than core_degree edges: past that point every contraction adds many
+    shortcuts and costs many witness searches. The remaining nodes form the
+    core, ranked above all others, whose edges queries follow in full.
+
+    Args:
+        graph (CSRGraph): Graph to contract
+        version (str): Dataset version recorded in the hierarchy
+        core_degree (int): Degree at which contraction stops, None to contract every node
+        progress: Optional callable(contracted, total) called every 1000 nodes
+
+    Returns:
+        ContractionHierarchy: The hierarchy
+    """
+    n = graph.num_nodes
+    offsets, targets, weights = graph.as_lists()
+    out_edges = [{} for _ in range(n)]  # Edges between uncontracted nodes
+    in_edges = [{} for _ in range(n)]
+    edges = {}  # (u, x) -> (weight, mid) of every original edge and shortcut
+    for u in range(n):
+        for k in range(offsets[u], offsets[u + 1]):
+            x, w = targets[k], weights[k]
+            if x != u and w < out_edges[u].get(x, float('inf')):
+                out_edges[u][x] = w
+                in_edges[x][u] = w
+                edges[u, x] = (w, -1)
+
+    contracted = [False] * n
+    deleted = [0] * n
+    heap = [(_Priority(*_Shortcuts(out_edges, in_edges, v), 0), v) for v in range(n)]
+    heap.sort()
+    rank = np.zeros(n, dtype=np.int32)
+    level = 0
+    while heap:
+        _, v = heappop(heap)
+        if contracted[v]:
+            continue
+        if core_degree is not None and len(out_edges[v]) + len(in_edges[v]) > core_degree:
+            heappush(heap, (0, v))
+            break
+        # Lazy update: contract v only if it is still the least important node
+        shortcuts, degree = _Shortcuts(out_edges, in_edges, v)
+        priority = _Priority(shortcuts, degree, deleted[v])
+        if heap and priority > heap[0][0]:
+            heappush(heap, (priority, v))
+            continue
+        for u, x, w in shortcuts:
+            if w < out_edges[u].get(x, float('inf')):
+                out_edges[u][x] = w
+                in_edges[x][u] = w
+                edges[u, x] = (w, v)
+        contracted[v] = True
+        rank[v] = level
+        level += 1
+        for x in out_edges[v]:
+            del in_edges[x][v]
+        for u in in_edges[v]:
+            del out_edges[u][v]
+        for neighbor in set(out_edges[v]) | set(in_edges[v]):
+            deleted[neighbor] += 1
+        out_edges[v], in_edges[v] = {}, {}
+        if progress is not None and level % 1000 == 0:
+            progress(level, n)
+    core_rank = level
+    for v in range(n):
+        if not contracted[v]:
+            rank[v] = level
+            level += 1
+    return ContractionHierarchy(rank, _Compile(n, edges, rank, core_rank, True),
+                                _Compile(n, edges, rank, core_rank, False), core_rank, version)
+
+def HierarchyRoute(airspace, hierarchy: ContractionHierarchy, source: int, target: int) -> RouteResult:
+    """Route with a hierarchy, or with Dijkstra if it was built for other data."""
+    graph = airspace.get_graph()
+    if hierarchy is None or hierarchy.num_nodes != graph.num_nodes or \
+            hierarchy.version != DatasetVersion(airspace):
+        return Dijkstra(graph, source, target)
+    return hierarchy.query(source, target)
@@ -0,0 +1,119 @@
+import numpy as np
+
+class CSRGraph:
+    def __init__(self, num_nodes: int, origins: np.ndarray, destinations: np.ndarray, weights: np.ndarray,
+                 latitudes: np.ndarray = None, longitudes: np.ndarray = None):
+        """Compile a directed edge list into forward and reverse compressed sparse rows.
+
+        The edges leaving node u are targets[offsets[u]:offsets[u + 1]] with the
+        matching weights, and the edges entering node v are
+        rev_sources[rev_offsets[v]:rev_offsets[v + 1]]. Nodes are row indices
+        of the NavStore the graph was built from.
+
+        Args:
+            num_nodes (int): Number of nodes
+            origins (np.ndarray): Origin node of each edge
+            destinations (np.ndarray): Destination node of each edge
+            weights (np.ndarray): Weight of each edge (kilometers for airspaces)
+            latitudes (np.ndarray): Optional node latitudes, used by geographic heuristics
+            longitudes (np.ndarray): Optional node longitudes, used by geographic heuristics
+        """
+        origins = np.asarray(origins, dtype=np.int64)
+        destinations = np.asarray(destinations, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float64)
+        self.num_nodes = num_nodes
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+
+        # Forward rows, edges keep their file order within each origin
+        order = np.argsort(origins, kind='stable')
+        self.offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(origins, minlength=num_nodes), out=self.offsets[1:])
+        self.targets = destinations[order].astype(np.int32)
+        self.weights = weights[order]
+        self.edge_ids = order.astype(np.int32)  # Position of each CSR edge in the input edge list
+
+        # Reverse rows
+        order = np.argsort(destinations, kind='stable')
+        self.rev_offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(destinations, minlength=num_nodes), out=self.rev_offsets[1:])
+        self.rev_sources = origins[order].astype(np.int32)
+        self.rev_weights = weights[order]
+        self.rev_edge_ids = order.astype(np.int32)
+
+        self._lists = None
+        self._rev_lists = None
+        self.cache = {}  # Derived per-graph data (heuristic tables, ...), dropped with the graph
+
+    @classmethod
+    def from_store(cls, store) -> 'CSRGraph':
+        """Compile the segments of a NavStore into a CSRGraph."""
+        return cls(len(store), store.seg_origins, store.seg_destinations, store.seg_distances,
+                   store.latitudes, store.longitudes)
+
+    @classmethod
+    def from_arrays(cls, num_nodes: int, arrays: dict, latitudes: np.ndarray = None,
+                    longitudes: np.ndarray = None) -> 'CSRGraph':
+        """Wrap already compiled rows (as returned by arrays()) without copying them."""
+        graph = cls.__new__(cls)
+        graph.num_nodes = num_nodes
+        graph.latitudes = latitudes
+        graph.longitudes = longitudes
+        for name in ('offsets', 'targets', 'weights', 'edge_ids',
+                     'rev_offsets', 'rev_sources', 'rev_weights', 'rev_edge_ids'):
+            setattr(graph, name, arrays[name])
+        graph._lists = None
+        graph._rev_lists = None
+        graph.cache = {}
+        return graph
+
+    def arrays(self) -> dict:
+        """Return the forward and reverse rows by name, for serialization."""
+        return {'offsets': self.offsets, 'targets': self.targets, 'weights': self.weights,
+                'edge_ids': self.edge_ids, 'rev_offsets': self.rev_offsets, 'rev_sources': self.rev_sources,
+                'rev_weights': self.rev_weights, 'rev_edge_ids': self.rev_edge_ids}
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    def neighbors(self, u: int):
+        """Return the (targets, weights) arrays of the edges leaving node u."""
+        start, end = self.offsets[u], self.offsets[u + 1]
+        return self.targets[start:end], self.weights[start:end]
+
+    def predecessors(self, v: int):
+        """Return the (sources, weights) arrays of the edges entering node v."""
+        start, end = self.rev_offsets[v], self.rev_offsets[v + 1]
+        return self.rev_sources[start:end], self.rev_weights[start:end]
+
+    def out_degree(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def in_degree(self) -> np.ndarray:
+        return np.diff(self.rev_offsets)
+
+    def edge_weight(self, u: int, v: int) -> float:
+        """Return the lightest weight of an edge u -> v, or inf if there is none."""
+        targets, weights = self.neighbors(u)
+        matches = weights[targets == v]
+        return float(matches.min()) if len(matches) else float('inf')
+
+    def as_lists(self):
+        """Return (offsets, targets, weights) as cached Python lists.
+
+        Pure-Python search loops index lists much faster than NumPy arrays.
+        """
+        if self._lists is None:
+            self._lists = (self.offsets.tolist(), self.targets.tolist(), self.weights.tolist())
+        return self._lists
+
+    def reverse_as_lists(self):
+        """Return (rev_offsets, rev_sources, rev_weights) as cached Python lists."""
+        if self._rev_lists is None:
+            self._rev_lists = (self.rev_offsets.tolist(), self.rev_sources.tolist(), self.rev_weights.tolist())
+        return self._rev_lists
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in self.arrays().values())
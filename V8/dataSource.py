@@ -0,0 +1,109 @@
+"""Opening airspace data from paths, compressed files, archives and file objects.
+
+The loaders accept any of:
+- a path to a text file, decompressed on the fly when it ends in .gz, .xz or .bz2
+- a file object (text or binary, e.g. a member opened from a zip or tar archive)
+- an object with an open() method such as zipfile.Path
+
+Archives holding a whole dataset (*_nav.txt, *_seg.txt and *_aer.txt members)
+are read with OpenArchive, which streams the members without extracting them.
+"""
+import importlib
+import io
+import os
+from contextlib import contextmanager
+
+# Suffix -> module providing open(); imported on first use to keep startup fast
+COMPRESSED_SUFFIXES = {'.gz': 'gzip', '.xz': 'lzma', '.bz2': 'bz2'}
+DATASET_MEMBERS = {'nav': "_nav.txt", 'seg': "_seg.txt", 'aer': "_aer.txt"}
+
+def IsPath(source) -> bool:
+    """True if source names a file on disk rather than being an open object."""
+    return isinstance(source, (str, os.PathLike))
+
+def SourceName(source) -> str:
+    """Name of a source for messages."""
+    if IsPath(source):
+        return os.fspath(source)
+    return str(getattr(source, 'name', source))
+
+def StripCompression(path: str) -> str:
+    """Remove a trailing .gz/.xz/.bz2 suffix from a path."""
+    root, suffix = os.path.splitext(path)
+    return root if suffix.lower() in COMPRESSED_SUFFIXES else path
+
+@contextmanager
+def OpenBinary(source):
+    """Open a source for reading bytes.
+
+    File objects passed in are left open; everything opened here is closed.
+    """
+    if hasattr(source, 'read'):
+        yield source
+    elif IsPath(source):
+        path = os.fspath(source)
+        module = COMPRESSED_SUFFIXES.get(os.path.splitext(path)[1].lower())
+        opener = importlib.import_module(module).open if module else open
+        with opener(path, 'rb') as f:
+            yield f
+    else:
+        with source.open('rb') as f:
+            yield f
+
+@contextmanager
+def OpenText(source):
+    """Open a source for reading text lines, decoding binary streams as they are read."""
+    if isinstance(source, io.TextIOBase):
+        yield source
+        return
+    with OpenBinary(source) as f:
+        text = io.TextIOWrapper(f if isinstance(f, io.BufferedIOBase) else io.BufferedReader(f))
+        try:
+            yield text
+        finally:
+            if f is source:
+                text.detach()  # Do not close the caller's file
+            else:
+                text.close()
+
+@contextmanager
+def OpenArchive(path: str):
+    """Open the nav, seg and aer members of a zip or tar (optionally .gz/.xz/.bz2) archive.
+
+    Members are matched by the end of their file name (e.g. Spain_nav.txt)
+    and decompressed while they are read.
+
+    Yields:
+        dict: {'nav': file, 'seg': file, 'aer': file} binary file objects
+
+    Raises:
+        ValueError: If the file is not an archive or lacks one of the members
+    """
+    import tarfile
+    import zipfile
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            names = _FindMembers(path, [info.filename for info in archive.infolist() if not info.is_dir()])
+            members = {kind: archive.open(name) for kind, name in names.items()}
+            try:
+                yield members
+            finally:
+                for member in members.values():
+                    member.close()
+    elif tarfile.is_tarfile(path):
+        with tarfile.open(path, 'r:*') as archive:
+            files = {info.name: info for info in archive.getmembers() if info.isfile()}
+            names = _FindMembers(path, list(files))
+            yield {kind: archive.extractfile(files[name]) for kind, name in names.items()}
+    else:
+        raise ValueError(f"'{path}' is not a zip or tar archive")
+
+def _FindMembers(path: str, names: list) -> dict:
+    """Pick the first member name ending in each of the DATASET_MEMBERS suffixes."""
+    found = {}
+    for kind, suffix in DATASET_MEMBERS.items():
+        matches = [name for name in names if os.path.basename(name).endswith(suffix)]
+        if not matches:
+            raise ValueError(f"'{path}' has no *{suffix} member")
+        found[kind] = sorted(matches)[0]
+    return found
@@ -0,0 +1,166 @@
+"""Airport to airport shortest-path distance matrices.
+
+A flight leaves an airport through one of its SID navpoints ("XXX.D") and
+arrives through one of its STAR navpoints ("XXX.A"). The distance from
+airport i to airport j is the shortest route from any SID of i to any STAR of
+j, so one multi-source Dijkstra tree per origin airport gives a whole row of
+the matrix. The trees run in parallel (batchRouting.MapOnGraph) and are kept
+as predecessor arrays to recover every route.
+"""
+import numpy as np
+from batchRouting import MapOnGraph, WorkerGraph
+from navStore import StringTable
+from routeCache import DatasetVersion, CachePath, SaveArrays, LoadArrays
+from routing import RouteResult, ShortestPathTree
+
+def AirportEndpoints(airspace, icaos: list = None):
+    """Resolve airports to the store rows of their SID and STAR navpoints.
+
+    Airports without SIDs (STARs) depart from (arrive at) the navpoint named
+    after their ICAO code, if there is one.
+
+    Args:
+        airspace (AirSpace): Loaded airspace
+        icaos (list): ICAO codes, all airports of the airspace by default
+
+    Returns:
+        tuple: (icaos, departures, arrivals), the last two being lists of
+        int lists, one per airport
+
+    Raises:
+        ValueError: If an ICAO code is not an airport of the airspace
+    """
+    store = airspace.get_store()
+    airports = airspace.nav_airports
+    if icaos is not None:
+        by_icao = {airport.icao: airport for airport in airports}
+        missing = [icao for icao in icaos if icao not in by_icao]
+        if missing:
+            raise ValueError(f"Airport {missing[0]} not found")
+        airports = [by_icao[icao] for icao in icaos]
+
+    def resolve(names: list, icao: str) -> list:
+        rows = [store.names.find(name) for name in names] or [store.names.find(icao)]
+        return sorted({row for row in rows if row >= 0})
+
+    departures = [resolve(airport.sids, airport.icao) for airport in airports]
+    arrivals = [resolve(airport.stars, airport.icao) for airport in airports]
+    return [airport.icao for airport in airports], departures, arrivals
+
+def _AirportRow(task):
+    """Worker: Dijkstra tree from the SIDs of one airport, reduced to a matrix row."""
+    departures, arrivals = task
+    dist, parents = ShortestPathTree(WorkerGraph(), departures)
+    dist = np.asarray(dist)
+    row = np.full(len(arrivals), np.inf)
+    ends = np.full(len(arrivals), -1, dtype=np.int32)
+    for j, rows in enumerate(arrivals):
+        if rows:
+            best = rows[int(np.argmin(dist[rows]))]
+            if dist[best] < np.inf:
+                row[j], ends[j] = dist[best], best
+    return row, ends, np.asarray(parents, dtype=np.int32)
+
+class DistanceMatrix:
+    def __init__(self, icaos: list, distances: np.ndarray, ends: np.ndarray, parents: np.ndarray,
+                 version: str = None):
+        """Airport to airport distances with the trees that produced them.
+
+        Args:
+            icaos (list): ICAO code of each row and column
+            distances (np.ndarray): float64 (n, n) km, inf where there is no route;
+                the diagonal is 0
+            ends (np.ndarray): int32 (n, n) STAR row reached by each route, -1 if none
+            parents (np.ndarray): int32 (n, num_nodes) predecessor of every point
+                in the tree of each origin airport, -1 at its SIDs and unreached points
+            version (str): routeCache.DatasetVersion the matrix was computed for
+        """
+        self.icaos = list(icaos)
+        self.distances = distances
+        self.ends = ends
+        self.parents = parents
+        self.version = version
+        self._index = {icao: i for i, icao in enumerate(self.icaos)}
+
+    def __len__(self):
+        return len(self.icaos)
+
+    def index(self, icao: str) -> int:
+        """Row and column of an airport.
+
+        Raises:
+            ValueError: If the airport is not in the matrix
+        """
+        if icao not in self._index:
+            raise ValueError(f"Airport {icao} not in the distance matrix")
+        return self._index[icao]
+
+    def distance(self, origin: str, destination: str) -> float:
+        return float(self.distances[self.index(origin), self.index(destination)])
+
+    def route(self, origin: str, destination: str) -> RouteResult:
+        """Route between two airports, from a SID of origin to a STAR of destination.
+
+        Returns:
+            RouteResult: Route over store row indices (settled is 0, as no
+            search is run); empty if there is no route or origin == destination
+        """
+        i, j = self.index(origin), self.index(destination)
+        node = int(self.ends[i, j])
+        if i == j or node < 0:
+            return RouteResult([], 0.0 if i == j else float('inf'), 0)
+        parents = self.parents[i]
+        nodes = [node]
+        while parents[node] >= 0:
+            node = int(parents[node])
+            nodes.append(node)
+        nodes.reverse()
+        return RouteResult(nodes, float(self.distances[i, j]), 0)
+
+    def arrays(self) -> dict:
+        icaos = StringTable.from_strings(self.icaos)
+        return {'icao_offsets': icaos.offsets, 'icao_data': icaos.data, 'distances': self.distances,
+                'ends': self.ends, 'parents': self.parents}
+
+    @classmethod
+    def from_arrays(cls, arrays: dict, version: str = None) -> 'DistanceMatrix':
+        icaos = list(StringTable(arrays['icao_offsets'], arrays['icao_data']))
+        return cls(icaos, arrays['distances'], arrays['ends'], arrays['parents'], version)
+
+def ComputeDistanceMatrix(airspace, icaos: list = None, workers: int = None, use_cache: bool = True,
+                          cache_dir: str = None) -> DistanceMatrix:
+    """Compute (or load from the routing cache) the airport distance matrix.
+
+    Args:
+        airspace (AirSpace): Loaded airspace
+        icaos (list): ICAO codes of the rows and columns, all airports by default
+        workers (int): Worker processes, os.cpu_count() by default
+        use_cache (bool): Read and write the compressed cache file
+        cache_dir (str): Cache directory, routeCache.CACHE_DIR by default
+
+    Returns:
+        DistanceMatrix: The matrix and its predecessor trees
+    """
+    icaos, departures, arrivals = AirportEndpoints(airspace, icaos)
+    endpoints = "\n".join(f"{icao} {d} {a}" for icao, d, a in zip(icaos, departures, arrivals))
+    version = DatasetVersion(airspace, endpoints)
+    path = CachePath(airspace, "distance_matrix", version, cache_dir)
+    if use_cache:
+        cached = LoadArrays(path, version)
+        if cached is not None:
+            return DistanceMatrix.from_arrays(cached[0], version)
+
+    graph = airspace.get_graph()
+    n = len(icaos)
+    distances = np.full((n, n), np.inf)
+    ends = np.full((n, n), -1, dtype=np.int32)
+    parents = np.full((n, graph.num_nodes), -1, dtype=np.int32)
+    tasks = [(departures[i], arrivals) for i in range(n) if departures[i]]
+    rows = [i for i in range(n) if departures[i]]
+    for i, (row, row_ends, tree) in zip(rows, MapOnGraph(graph, _AirportRow, tasks, workers)):
+        distances[i], ends[i], parents[i] = row, row_ends, tree
+    np.fill_diagonal(distances, 0.0)
+    matrix = DistanceMatrix(icaos, distances, ends, parents, version)
+    if use_cache:
+        SaveArrays(path, matrix.arrays(), version, meta={'airspace': airspace.name})
+    return matrix
@@ -0,0 +1,81 @@
+class Waypoint:
+    def __init__(self, label: str, latitude: float, longitude: float):
+        """Initialize a flight plan waypoint.
+
+        Args:
+            label (str): Name of the waypoint (e.g. "Departure", "TopOfAscend")
+            latitude (float): Geographical latitude in degrees
+            longitude (float): Geographical longitude in degrees
+        """
+        self.label = label
+        self.latitude = latitude
+        self.longitude = longitude
+        self.nav_point = None  # Closest NavPoint, set by SnapFlightPlan
+        self.snap_distance = None  # Distance to nav_point in kilometers
+
+    def __str__(self):
+        if self.nav_point is None:
+            return f"{self.label} ({self.latitude}, {self.longitude})"
+        return f"{self.label} -> {self.nav_point} ({self.snap_distance:.2f} km)"
+
+    def __repr__(self):
+        return f"Waypoint('{self.label}', {self.latitude}, {self.longitude})"
+
+def LoadFlightPlan(filename: str) -> list:
+    """Load flight plan waypoints from a file.
+
+    The file should be in the format:
+    latitude longitude label
+
+    Args:
+        filename (str): Path to the flight plan file
+
+    Returns:
+        list: List of Waypoint objects in flight order
+    """
+    waypoints = []
+    try:
+        with open(filename, 'r') as f:
+            for line in f:
+                # Skip empty lines and comments
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+
+                try:
+                    lat, lon, label = line.split(maxsplit=2)
+                    waypoints.append(Waypoint(label, float(lat), float(lon)))
+                except ValueError as e:
+                    print(f"Error parsing line '{line}': {e}")
+                    continue
+
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found")
+    except Exception as e:
+        print(f"Error reading file '{filename}': {e}")
+
+    return waypoints
+
+def SnapFlightPlan(airspace, waypoints: list, max_distance: float = None) -> list:
+    """Attach each waypoint to its closest navigation point of an airspace.
+
+    Uses the airspace spatial index, so each waypoint costs one grid lookup
+    instead of a scan over all points.
+
+    Args:
+        airspace (AirSpace): Loaded airspace
+        waypoints (list): Waypoint objects, updated in place
+        max_distance (float): Leave waypoints farther than this many km unsnapped
+
+    Returns:
+        list: The Waypoints whose nav_point could not be set
+    """
+    unsnapped = []
+    for waypoint in waypoints:
+        nearest = airspace.find_nearest(waypoint.latitude, waypoint.longitude, 1)
+        if not nearest or (max_distance is not None and nearest[0][1] > max_distance):
+            waypoint.nav_point, waypoint.snap_distance = None, None
+            unsnapped.append(waypoint)
+        else:
+            waypoint.nav_point, waypoint.snap_distance = nearest[0]
+    return unsnapped
@@ -5,26 +5,47 @@ from path import Path, AddNodeToPath, ContainsNode, PlotPath
 class Graph:
 
     def __init__(self):
-        self.list_of_nodes : list = []
+        self.list_of_nodes : list = TrackedList()  # Counts its edits, so the indexes below notice direct changes
         self.list_of_segments : list = []
+        self.nodes_by_name : dict = {}  # First node added with each name
+        self.node_set : set = set()  # Same nodes as list_of_nodes, for O(1) membership
+        self.spatial_index = None  # Built by GetClosest, dropped when nodes are added
+        self.compiled = None  # (edit stamp, csr, nodes, node index, weighted) built by CompileGraph
+        self.indexed = None  # (list_of_nodes, its edit count) when the indexes were last built
+
+def _SyncIndex(G : Graph):
+    # Rebuild the indexes if list_of_nodes was modified or replaced without AddNode.
+    # A plain list assigned to list_of_nodes is wrapped in a TrackedList first.
+    if not isinstance(G.list_of_nodes, TrackedList):
+        G.list_of_nodes = TrackedList(G.list_of_nodes)
+    if G.indexed is None or G.indexed[0] is not G.list_of_nodes or G.indexed[1] != G.list_of_nodes.edits:
+        G.node_set = set(G.list_of_nodes)
+        G.nodes_by_name = {}
+        for node in G.list_of_nodes:
+            G.nodes_by_name.setdefault(node.name, node)
+        G.spatial_index = None
+        G.compiled = None
+        G.indexed = (G.list_of_nodes, G.list_of_nodes.edits)
+    # Drop the compiled graph if nodes or neighbor lists changed since it was built
+    if G.compiled is not None and G.compiled[0] != TrackedList.all_edits:
+        G.compiled = None
 
 def GetNodeByName(G: Graph, name: str):
-    for node in G.list_of_nodes:
-        if node.name == name:
-            return node
-    return None 
+    _SyncIndex(G)
+    return G.nodes_by_name.get(name)
 
 def AddNode(G : Graph, n : Node):
-    Found = False
-
-    for i in G.list_of_nodes:
-        if i == n:
-            Found = True
+    _SyncIndex(G)
 
-    if Found:
+    if n in G.node_set:
         return False
-    elif not Found:
+    else:
         G.list_of_nodes.append(n)
+        G.node_set.add(n)
+        G.nodes_by_name.setdefault(n.name, n)
+        G.spatial_index = None
+        G.compiled = None
+        G.indexed = (G.list_of_nodes, G.list_of_nodes.edits)
         return True
     
 def AddSegment(G : Graph, name_segment, nameOriginNode : str, nameDestinationNode : str):
@@ -37,18 +58,48 @@ def AddSegment(G : Graph, name_segment, nameOriginNode : str, nameDestinationNod
     G.list_of_segments.append(s)
 
     origin_node.list_of_neighbors.append(destination_node)
+    origin_node.neighbor_names.add(destination_node.name)
+    G.compiled = None
 
     return True
+
+def BuildGraph(node_names, node_x, node_y, segment_names, segment_origins, segment_destinations) -> Graph:
+    """Builds a Graph in one pass from parallel sequences (lists or NumPy arrays).
+
+    Node i is (node_names[i], node_x[i], node_y[i]) and segment j goes from the
+    node named segment_origins[j] to the node named segment_destinations[j].
+    Raises KeyError if a segment refers to an unknown node name."""
+    G = Graph()
+    G.list_of_nodes = TrackedList(Node(str(name), x, y) for name, x, y in zip(node_names, node_x, node_y))
+    for n in G.list_of_nodes:
+        G.nodes_by_name.setdefault(n.name, n)
+    G.node_set = set(G.list_of_nodes)
+    G.indexed = (G.list_of_nodes, G.list_of_nodes.edits)
+
+    by_name = G.nodes_by_name
+    for name, origin_name, destination_name in zip(segment_names, segment_origins, segment_destinations):
+        origin_node = by_name[str(origin_name)]
+        destination_node = by_name[str(destination_name)]
+        G.list_of_segments.append(Segment(str(name), origin_node, destination_node))
+        origin_node.list_of_neighbors.append(destination_node)
+        origin_node.neighbor_names.add(destination_node.name)
+    return G
     
 def GetClosest(G : Graph, x : float, y : float):
-    from math import sqrt
-
-    Distances  = []
+    # Grid index over the node coordinates, rebuilt when the node list changes
+    from spatialIndex import SpatialIndex
+    import numpy as np
 
-    for i in G.list_of_nodes:
-        Distances.append(sqrt((i.coordinate_x - x)**2 + (i.coordinate_y - y)**2))
+    _SyncIndex(G)
+    if not G.list_of_nodes:
+        return None
+    if G.spatial_index is None:
+        coords = np.array([(n.coordinate_x, n.coordinate_y) for n in G.list_of_nodes], dtype=np.float64)
+        G.spatial_index = SpatialIndex(coords)
 
-    return G.list_of_nodes[Distances.index(min(Distances))]
+    # Ties go to the node that comes first in list_of_nodes, as with the old scan
+    indices, _ = G.spatial_index.nearest((x, y))
+    return G.list_of_nodes[int(indices[0])]
 
 def Plot(G : Graph):
     import matplotlib.pyplot as plt
@@ -110,69 +161,103 @@ def ImportData(G : Graph):
     except Exception as e:
         print(f"Error reading file: {e}")
     
-def GetReachableNodes(G: Graph, start_node: Node) -> list:
+def CompileGraph(G: Graph, weighted: bool = True):
+    """Returns (csr, nodes): the graph compiled to a csrGraph.CSRGraph whose node i is nodes[i].
+    Edges follow list_of_neighbors and weigh the Distance between their nodes (0 if not weighted).
+    The result is cached on G until list_of_nodes or any neighbor list is edited."""
+    _SyncIndex(G)
+    if G.compiled is None or (weighted and not G.compiled[4]):
+        from csrGraph import CSRGraph
+
+        nodes = list(G.list_of_nodes)
+        index = {node: i for i, node in enumerate(nodes)}
+        origins, destinations, weights = [], [], []
+        for i, node in enumerate(nodes):
+            for neighbor in node.list_of_neighbors:
+                j = index.get(neighbor)
+                if j is not None:
+                    origins.append(i)
+                    destinations.append(j)
+                    if weighted:
+                        weights.append(Distance(node, neighbor))
+        if not weighted:
+            weights = [0.0] * len(origins)
+        csr = CSRGraph(len(nodes), origins, destinations, weights)
+        G.compiled = (TrackedList.all_edits, csr, nodes, index, weighted)
+    return G.compiled[1], G.compiled[2]
+
+def GetReachableNodes(G: Graph, start_node: Node, max_hops: int = None, max_distance: float = None) -> list:
     """Returns a list of all nodes that can be reached from start_node"""
-    visited = set()
-    to_visit = [start_node]
-    
-    while to_visit:
-        current = to_visit.pop(0)
-        if current not in visited:
-            visited.add(current)
-            # Add all unvisited neighbors to the queue
+    _SyncIndex(G)
+    if start_node not in G.node_set:
+        # Not part of the graph: plain breadth-first search over the neighbor lists
+        if max_distance is not None:
+            raise ValueError("max_distance needs a start_node of the graph")
+        from collections import deque
+        visited = {start_node}
+        to_visit = deque([(start_node, 0)])
+        while to_visit:
+            current, hops = to_visit.popleft()
+            if max_hops is not None and hops >= max_hops:
+                continue
             for neighbor in current.list_of_neighbors:
                 if neighbor not in visited:
-                    to_visit.append(neighbor)
-    
-    return list(visited)
+                    visited.add(neighbor)
+                    to_visit.append((neighbor, hops + 1))
+        return list(visited)
+
+    from reachability import ReachableIndices
+    csr, nodes = CompileGraph(G, weighted=max_distance is not None)
+    start = G.compiled[3][start_node]
+    return [nodes[i] for i in ReachableIndices(csr, start, max_hops=max_hops, max_distance=max_distance)]
 
 def FindShortestPath(G: Graph, origin: Node, destination: Node) -> Path:
     """Returns a Path describing the shortest path between origin and destination.
     Returns None if there is no path connecting these nodes."""
-    if origin not in G.list_of_nodes or destination not in G.list_of_nodes:
+    _SyncIndex(G)
+    if origin not in G.node_set or destination not in G.node_set:
         return None
         
-    # Initialize the list of paths with the origin node
-    current_paths = [Path(origin)]
+    from heapq import heappush, heappop
+    from node import Distance
+    
+    # One label per node: best known cost and the node it was reached from.
+    # The heap holds (estimated total cost, cost, tie breaker, node); entries
+    # for nodes that were improved or already expanded are skipped when popped.
+    best_cost = {origin: 0}
+    previous = {origin: None}
+    expanded = set()
+    heap = [(Distance(origin, destination), 0, 0, origin)]
+    counter = 1
     
-    while current_paths:
-        # Find the path with the lowest estimated cost
-        best_path = min(current_paths, key=lambda p: p.get_estimated_cost(destination))
-        current_paths.remove(best_path)
+    while heap:
+        _, cost, _, current = heappop(heap)
+        if current in expanded:
+            continue
+        
+        # If we've reached the destination, rebuild the Path from the labels
+        if current == destination:
+            nodes = []
+            while current is not None:
+                nodes.append(current)
+                current = previous[current]
+            nodes.reverse()
+            path = Path(origin)
+            for node in nodes[1:]:
+                path = AddNodeToPath(path, node)
+            return path
+        expanded.add(current)
         
-        # If we've reached the destination, we're done
-        if best_path.get_last_node() == destination:
-            return best_path
-            
-        # Try to extend the path with each neighbor
-        for neighbor in best_path.get_last_node().list_of_neighbors:
-            # Skip if neighbor is already in the path (avoid cycles)
-            if ContainsNode(best_path, neighbor):
+        # Try to improve the label of each neighbor
+        for neighbor in current.list_of_neighbors:
+            if neighbor in expanded:
                 continue
-                
-            # Create new path with this neighbor
-            new_path = AddNodeToPath(best_path, neighbor)
-            
-            # Check if we already have a better path to this neighbor
-            better_path_exists = False
-            paths_to_remove = []
-            
-            for existing_path in current_paths:
-                if (existing_path.get_last_node() == neighbor and 
-                    existing_path.get_total_cost() <= new_path.get_total_cost()):
-                    better_path_exists = True
-                    break
-                elif (existing_path.get_last_node() == neighbor and 
-                      existing_path.get_total_cost() > new_path.get_total_cost()):
-                    paths_to_remove.append(existing_path)
-            
-            # Remove worse paths
-            for path in paths_to_remove:
-                current_paths.remove(path)
-            
-            # Add the new path if no better path exists
-            if not better_path_exists:
-                current_paths.append(new_path)
+            new_cost = cost + Distance(current, neighbor)
+            if neighbor not in best_cost or new_cost < best_cost[neighbor]:
+                best_cost[neighbor] = new_cost
+                previous[neighbor] = current
+                heappush(heap, (new_cost + Distance(neighbor, destination), new_cost, counter, neighbor))
+                counter += 1
     
     # If we get here, no path was found
     return None
@@ -181,7 +266,7 @@ def PlotReachability(G: Graph, start_node: Node):
     """Plots the graph highlighting reachable nodes from start_node"""
     import matplotlib.pyplot as plt
     
-    reachable = GetReachableNodes(G, start_node)
+    reachable = set(GetReachableNodes(G, start_node))
     
     plt.clf()
     fig = plt.figure()
@@ -1,21 +1,29 @@
 import tkinter as tk
 from tkinter import messagebox, ttk, filedialog
 from graph import *
-import matplotlib.pyplot as plt
-from PIL import Image, ImageTk
+import numpy as np
 import os
 from airSpace import AirSpace
+from routing import FindRoute
+from alternatives import AlternativeRoutes
 import io
 from navPoint import GetNavPointByNumber
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 import traceback
-
-# --- A320 Performance Data (Estimates) ---
-A320_CRUISING_SPEED_KMPH = 840 # Typical cruising speed in km/h
-A320_FUEL_CONSUMPTION_KGPH = 2086.5 # Typical fuel consumption in kg per hour (approx 4600 lbs/hr)
+import threading
+import queue
+from loadProgress import LoadProgress, LoadCancelled
+from airspaceCache import AirspaceCache, DEFAULT_MEMORY_BUDGET
+from aircraft import FlightTimeHours, FuelBurnKg
 
 class AirspaceApp:
-    def __init__(self, root):
+    def __init__(self, root, memory_budget: int = DEFAULT_MEMORY_BUDGET, prefetch: bool = True):
+        """Create the main window.
+        
+        Args:
+            root: Tk root window
+            memory_budget (int): Bytes of loaded airspaces kept in the session cache
+            prefetch (bool): Load all bundled airspaces in the background at startup
+        """
         self.root = root
         self.root.title("Airspace Explorer")
         # Start maximized
@@ -28,6 +36,10 @@ class AirspaceApp:
         self.canvas = None # Store FigureCanvasTkAgg
         self.canvas_widget = None # Store Tkinter canvas widget
         self.toolbar = None # Store NavigationToolbar2Tk
+        self.selection_marker = None # Highlight of the point picked by clicking the map
+        self.load_job = None # (name, LoadProgress, result queue) of the running background load
+        self.load_poll_interval = 100  # milliseconds between load progress updates
+        self.airspace_cache = AirspaceCache(memory_budget=memory_budget) # Airspaces loaded this session
         
         # Set minimum window size
         self.root.minsize(800, 600)
@@ -56,6 +68,8 @@ class AirspaceApp:
         self.root.update_idletasks()
         
         self.setup_ui()
+        if prefetch:
+            self.airspace_cache.prefetch()
         
         # Bind resize event with debouncing
         self.root.bind('<Configure>', self.on_window_resize)
@@ -335,155 +349,104 @@ class AirspaceApp:
             self.path_dest_var.set(values[-1])
 
     def load_selected_airspace(self):
+        """Show the selected airspace, loading it in a background thread if needed.
+        
+        Airspaces already in the session cache (loaded before or prefetched at
+        startup) are shown immediately. Otherwise progress is polled from the
+        Tk event loop by _poll_airspace_load, so the window stays responsive
+        and the previously loaded airspace stays usable until the new one is
+        ready. While loading, the load button cancels the load instead.
+        """
         print("\n=== Starting Airspace Load ===")
+        if self.load_job is not None:
+            return
+        selected_airspace = self.airspace_var.get()
+        print(f"Selected airspace: {selected_airspace}")
+        cached = self.airspace_cache.get(selected_airspace)
+        if cached is not None:
+            print("Using cached airspace")
+            self._install_airspace(selected_airspace, cached)
+            return
         try:
-            selected_airspace = self.airspace_var.get()
-            print(f"Selected airspace: {selected_airspace}")
-            
-            # Map display names to directory names
-            dir_names = {
-                "Catalunya": "airspace_catalonia",
-                "España": "Airspace Spain",
-                "Europe": "ECAC airspace"
-            }
-            base_dir = os.path.join(os.path.dirname(__file__), dir_names[selected_airspace])
-            print(f"Base directory: {base_dir}")
-            
-            # Define file patterns for each airspace
-            file_patterns = {
-                "Catalunya": ("Cat_nav.txt", "Cat_seg.txt", "Cat_aer.txt"),
-                "España": ("Spain_nav.txt", "Spain_seg.txt", "Spain_aer.txt"),
-                "Europe": ("ECAC_nav.txt", "ECAC_seg.txt", "ECAC_aer.txt")
-            }
-            
-            # Disable buttons during loading
-            print("Disabling buttons...")
-            self.load_button.configure(state='disabled')
-            self.visualize_button.configure(state='disabled')
-            self.stop_visualize_button.configure(state='disabled')
-            self.export_kml_button.configure(state='disabled')
-            self.root.update_idletasks()
-            
-            # Handle Spain airspace data which is in a zip file
-            temp_dir = None
-            if selected_airspace == "España":
-                print("Processing Spain airspace data...")
-                self.status_label.config(text="Extracting Spain airspace data...")
-                self.root.update_idletasks()
-                
-                zip_path = os.path.join(base_dir, "Spain_graph.zip")
-                print(f"Looking for zip file at: {zip_path}")
-                if not os.path.exists(zip_path):
-                    raise FileNotFoundError("Spain airspace data zip file not found.")
-                    
-                # Create a temporary directory for extracted files
-                import tempfile
-                import zipfile
-                temp_dir = tempfile.mkdtemp()
-                print(f"Created temporary directory: {temp_dir}")
-                try:
-                    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                        print("Extracting zip file...")
-                        zip_ref.extractall(temp_dir)
-                    base_dir = temp_dir  # Use the temporary directory for file paths
-                    print("Zip file extracted successfully")
-                except Exception as e:
-                    raise Exception(f"Failed to extract Spain airspace data: {str(e)}")
-            
-            # Verify all required files exist
-            nav_file = os.path.join(base_dir, file_patterns[selected_airspace][0])
-            seg_file = os.path.join(base_dir, file_patterns[selected_airspace][1])
-            aer_file = os.path.join(base_dir, file_patterns[selected_airspace][2])
-            
-            print(f"Checking required files:")
-            print(f"  Nav file: {nav_file}")
-            print(f"  Seg file: {seg_file}")
-            print(f"  Aer file: {aer_file}")
-            
-            for file_path in [nav_file, seg_file, aer_file]:
-                if not os.path.exists(file_path):
-                    raise FileNotFoundError(f"Required file not found: {os.path.basename(file_path)}")
-            
-            self.status_label.config(text=f"Loading {selected_airspace} airspace data...")
-            self.root.update_idletasks()
-            
-            # Create new airspace instance
-            print("Creating new AirSpace instance...")
-            self.airspace = AirSpace(name=selected_airspace)
-            
-            # Load data with timeout
-            import threading
-            import queue
-            
-            result_queue = queue.Queue()
-            
-            def load_data_thread():
-                try:
-                    print("Starting data load in thread...")
-                    success = self.airspace.load_data(nav_file, seg_file, aer_file)
-                    print(f"Data load completed with success: {success}")
-                    result_queue.put(("success", success))
-                except Exception as e:
-                    print(f"Error in load thread: {str(e)}")
-                    result_queue.put(("error", str(e)))
-            
-            # Start loading in a separate thread
-            print("Starting load thread...")
-            thread = threading.Thread(target=load_data_thread)
-            thread.daemon = True
-            thread.start()
-            
-            # Wait for result with timeout
+            dataset = self.airspace_cache.datasets[selected_airspace]
+            print(f"Checking required files: {dataset.paths()}")
+            dataset.check()
+        except Exception as e:
+            print(f"Error loading airspace: {e}")
+            messagebox.showerror("Error", f"Failed to load {selected_airspace} airspace data: {e}")
+            self.status_label.config(text="Status: Failed to load data.")
+            return
+        
+        progress = LoadProgress()
+        results = queue.Queue()
+        
+        def load_data_thread():
             try:
-                print("Waiting for load result...")
-                result_type, result = result_queue.get(timeout=30)  # 30 second timeout
-                if result_type == "error":
-                    raise Exception(result)
-                if not result:
-                    raise Exception(f"Failed to load {selected_airspace} airspace data.")
-            except queue.Empty:
-                raise Exception("Loading timed out after 30 seconds")
-            
-            self.status_label.config(text=f"Status: {selected_airspace} airspace loaded.")
-            self.visualize_button.config(state='normal')
-            self.export_kml_button.config(state='normal')
-            self.show_airspace_info()
-            self.update_v2_dropdowns()
-            print("Airspace load completed successfully")
+                print("Starting data load in thread...")
+                airspace = self.airspace_cache.load(selected_airspace, progress)
+                print(f"Data load completed with success: {airspace is not None}")
+                results.put(("success", airspace))
+            except LoadCancelled:
+                print("Data load cancelled")
+                results.put(("cancelled", None))
+            except Exception as e:
+                print(f"Error in load thread: {str(e)}")
+                results.put(("error", str(e)))
+        
+        self.load_job = (selected_airspace, progress, results)
+        self.load_button.configure(text="Cancel Loading", command=self.cancel_airspace_load)
+        self.status_label.config(text=f"Loading {selected_airspace} airspace data...")
+        thread = threading.Thread(target=load_data_thread)
+        thread.daemon = True
+        thread.start()
+        self.root.after(self.load_poll_interval, self._poll_airspace_load)
+        
+    def cancel_airspace_load(self):
+        """Ask the running airspace load to stop; _poll_airspace_load reports when it has."""
+        if self.load_job is not None:
+            selected_airspace, progress, _ = self.load_job
+            progress.cancel()
+            self.status_label.config(text=f"Cancelling {selected_airspace} load...")
             
-        except Exception as e:
-            error_msg = str(e)
+    def _poll_airspace_load(self):
+        """Show the progress of the background load, or install its result once it finished."""
+        if self.load_job is None:
+            return
+        selected_airspace, progress, results = self.load_job
+        try:
+            result_type, result = results.get_nowait()
+        except queue.Empty:
+            if not progress.cancelled:
+                self.status_label.config(text=f"Loading {selected_airspace}: {progress}")
+            self.root.after(self.load_poll_interval, self._poll_airspace_load)
+            return
+        
+        self.load_job = None
+        self.load_button.configure(text="Load Selected Airspace", command=self.load_selected_airspace)
+        if result_type == "cancelled":
+            self.status_label.config(text=f"Status: Loading {selected_airspace} cancelled.")
+            return
+        if result_type == "error" or not result:
+            error_msg = result if result_type == "error" else f"Failed to load {selected_airspace} airspace data."
             print(f"Error loading airspace: {error_msg}")
             messagebox.showerror("Error", f"Failed to load {selected_airspace} airspace data: {error_msg}")
             self.status_label.config(text="Status: Failed to load data.")
-            self.visualize_button.configure(state='disabled')
-            self.export_kml_button.configure(state='disabled')
-            
-        finally:
-            # Clean up temporary directory for Spain airspace
-            if temp_dir and os.path.exists(temp_dir):
-                try:
-                    print(f"Cleaning up temporary directory: {temp_dir}")
-                    import shutil
-                    shutil.rmtree(temp_dir)
-                except Exception as e:
-                    print(f"Error cleaning up temp directory: {str(e)}")
-            
-            # Set the current graph data
-            self.current_graph_type = 'airspace'
-            self.current_graph_data = self.airspace
-
-            # Clear any previously loaded simple graph data
-            # Note: We don't explicitly clear the airspace object here as it's replaced
-            # but we should clear the simple graph data structure if that was loaded previously.
-            # This might involve adding a dedicated cleanup method or checking type.
-            # For now, assume switching from simple to airspace replaces the need to clear simple data.
-
-            # Re-enable buttons
-            self.load_button.configure(state='normal')
-            self.visualize_button.configure(state='normal')
-            self.stop_visualize_button.configure(state='disabled')
-            self.root.update_idletasks()
+            return
+        self._install_airspace(selected_airspace, result)
+        
+    def _install_airspace(self, selected_airspace: str, airspace: AirSpace):
+        """Make a loaded airspace the current one and refresh the controls."""
+        # Set the current graph data
+        self.airspace = airspace
+        self.current_graph_type = 'airspace'
+        self.current_graph_data = self.airspace
+        self.status_label.config(text=f"Status: {selected_airspace} airspace loaded.")
+        self.visualize_button.config(state='normal')
+        self.export_kml_button.config(state='normal')
+        self.stop_visualize_button.configure(state='disabled')
+        self.show_airspace_info()
+        self.update_v2_dropdowns()
+        print("Airspace load completed successfully")
 
     def show_airspace_info(self):
         """Show airspace statistics in a message box."""
@@ -580,6 +543,9 @@ class AirspaceApp:
 
     def visualize_airspace(self):
         """Visualize the airspace with proper error handling and state management"""
+        import matplotlib.pyplot as plt
+        from PIL import Image
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
         print("\n=== Starting Airspace Visualization ===")
         if not self.airspace:
             messagebox.showwarning("No Data", "Please load airspace data first.")
@@ -709,13 +675,14 @@ class AirspaceApp:
                 # Group segments by type for better performance
                 airport_segments = []
                 nav_segments = []
+                airport_set = set(getattr(self.airspace, 'nav_airports', []))
                 for segment in self.airspace.nav_segments:
                     try:
                         # Check if either origin or destination is an airport
                         origin = self.airspace.get_nav_point(segment.origin_number)
                         dest = self.airspace.get_nav_point(segment.destination_number)
                         if origin and dest and hasattr(self.airspace, 'nav_airports'):
-                            if origin in self.airspace.nav_airports or dest in self.airspace.nav_airports:
+                            if origin in airport_set or dest in airport_set:
                                 airport_segments.append(segment)
                             else:
                                 nav_segments.append(segment)
@@ -770,8 +737,9 @@ class AirspaceApp:
                     # Group points by type
                     airports = []
                     nav_points = []
+                    airport_set = set(getattr(self.airspace, 'nav_airports', []))
                     for point in self.airspace.nav_points:
-                        if hasattr(self.airspace, 'nav_airports') and point in self.airspace.nav_airports:
+                        if point in airport_set:
                             airports.append(point)
                         else:
                             nav_points.append(point)
@@ -854,6 +822,8 @@ class AirspaceApp:
             print("Creating new FigureCanvasTkAgg...")
             self.canvas = FigureCanvasTkAgg(self.fig, master=self.airspace_canvas_frame)
             self.canvas_widget = self.canvas.get_tk_widget()
+            self.selection_marker = None
+            self.canvas.mpl_connect('button_press_event', self._on_airspace_click)
 
             # Create the navigation toolbar
             print("Creating navigation toolbar...")
@@ -888,6 +858,38 @@ class AirspaceApp:
             self.stop_visualize_button.configure(state='disabled')
             self.root.update_idletasks()
 
+    def _on_airspace_click(self, event):
+        """Select the navigation point closest to a click on the airspace map.
+
+        Left click selects the point as reachability start and path origin,
+        right click as path destination.
+        """
+        if not self.airspace or event.inaxes is not self.ax or event.xdata is None:
+            return
+        if self.toolbar is not None and self.toolbar.mode:
+            return  # Zooming or panning
+
+        point = self.airspace.get_closest(event.ydata, event.xdata)
+        if point is None:
+            return
+        label = f"{point.number} ({point.name})"
+
+        if self.selection_marker is not None:
+            self.selection_marker.remove()
+        self.selection_marker = self.ax.scatter(point.longitude, point.latitude, s=120, facecolors='none',
+                                                edgecolors='magenta', linewidths=2, zorder=5)
+        self.canvas.draw_idle()
+
+        if event.button == 3:
+            if hasattr(self, 'path_dest_var'):
+                self.path_dest_var.set(label)
+            self.status_label.config(text=f"Status: Selected {label} as destination.")
+        else:
+            if hasattr(self, 'reach_point_var'):
+                self.reach_point_var.set(label)
+                self.path_origin_var.set(label)
+            self.status_label.config(text=f"Status: Selected {label}.")
+
     def show_v2_features(self):
         """Show a modal window with reachability and shortest path features."""
         print("\n=== Starting Path Finding Features Window Setup ===")
@@ -935,8 +937,15 @@ class AirspaceApp:
         if self.airspace.nav_points:
             self.reach_point_dropdown.set(f"{self.airspace.nav_points[0].number} ({self.airspace.nav_points[0].name})")
         
+        ttk.Label(control_frame, text="Max hops (optional):").grid(row=1, column=0, padx=5)
+        self.reach_hops_entry = ttk.Entry(control_frame, width=10)
+        self.reach_hops_entry.grid(row=1, column=1, padx=5, sticky='w')
+        ttk.Label(control_frame, text="Max distance km (optional):").grid(row=2, column=0, padx=5)
+        self.reach_distance_entry = ttk.Entry(control_frame, width=10)
+        self.reach_distance_entry.grid(row=2, column=1, padx=5, sticky='w')
+        
         ttk.Button(control_frame, text="Show Reachability", 
-                  command=self._show_reachability).grid(row=1, column=0, columnspan=2, pady=10)
+                  command=self._show_reachability).grid(row=3, column=0, columnspan=2, pady=10)
         
         # Status text area for reachability
         status_frame = ttk.Frame(reachability_frame)
@@ -982,8 +991,15 @@ class AirspaceApp:
         if self.airspace.nav_points:
             self.path_dest_dropdown.set(f"{self.airspace.nav_points[-1].number} ({self.airspace.nav_points[-1].name})")
         
+        ttk.Label(path_control_frame, text="Alternatives (optional):").grid(row=2, column=0, padx=5)
+        self.path_alternatives_entry = ttk.Entry(path_control_frame, width=10)
+        self.path_alternatives_entry.grid(row=2, column=1, padx=5, sticky='w')
+        ttk.Label(path_control_frame, text="Min. dissimilarity 0-1 (optional):").grid(row=3, column=0, padx=5)
+        self.path_dissimilarity_entry = ttk.Entry(path_control_frame, width=10)
+        self.path_dissimilarity_entry.grid(row=3, column=1, padx=5, sticky='w')
+        
         ttk.Button(path_control_frame, text="Find Shortest Path", 
-                  command=self._find_path).grid(row=2, column=0, columnspan=2, pady=10)
+                  command=self._find_path).grid(row=4, column=0, columnspan=2, pady=10)
         
         # Status text area for path finding
         path_status_frame = ttk.Frame(path_frame)
@@ -1038,8 +1054,38 @@ class AirspaceApp:
             except Exception as e:
                 print(f"Error during plot window resize: {e}")
 
+    def _read_reachability_limits(self):
+        """Read the optional max hops / max distance limits of the reachability tab."""
+        def read(entry, convert):
+            text = entry.get().strip() if entry is not None else ''
+            return convert(text) if text else None
+        try:
+            max_hops = read(getattr(self, 'reach_hops_entry', None), int)
+            max_distance = read(getattr(self, 'reach_distance_entry', None), float)
+        except ValueError:
+            raise ValueError("Max hops must be an integer and max distance a number")
+        if max_hops is not None and max_distance is not None:
+            raise ValueError("Use either a max hops or a max distance limit, not both")
+        return max_hops, max_distance
+
+    def _read_alternative_options(self):
+        """Read the number of routes and the optional dissimilarity threshold of the path tab."""
+        def read(entry, convert, default):
+            text = entry.get().strip() if entry is not None else ''
+            return convert(text) if text else default
+        try:
+            count = read(getattr(self, 'path_alternatives_entry', None), int, 1)
+            min_dissimilarity = read(getattr(self, 'path_dissimilarity_entry', None), float, 0.0)
+        except ValueError:
+            raise ValueError("Alternatives must be an integer and min. dissimilarity a number")
+        if count < 1 or not 0.0 <= min_dissimilarity < 1.0:
+            raise ValueError("Alternatives must be at least 1 and min. dissimilarity in [0, 1)")
+        return count, min_dissimilarity
+
     def _show_reachability(self):
         """Show the reachability graph in a new window."""
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
         print("\n=== Starting Reachability Analysis ===")
         if not self.airspace or not self.airspace.nav_points:
             messagebox.showwarning("No Data", "Please load airspace data first.")
@@ -1097,25 +1143,15 @@ class AirspaceApp:
             )
 
             # Perform reachability calculation
-            reachable = set()
-            queue = [start_point]
-            visited = {start_point.number}
-            while queue:
-                current = queue.pop(0)
-                reachable.add(current)
-                for segment in self.airspace.get_segments_from(current.number):
-                    dest_number = segment.destination_number
-                    if dest_number not in visited:
-                        visited.add(dest_number)
-                        dest_point = self.airspace.get_nav_point(dest_number)
-                        if dest_point:
-                            queue.append(dest_point)
-
-
-            # Highlight reachable points and the start point
-            for point in reachable:
-                ax.plot(point.longitude, point.latitude, 'go', 
-                       markersize=8, alpha=0.8, label='Reachable' if point == start_point else "", zorder=3)
+            max_hops, max_distance = self._read_reachability_limits()
+            store = self.airspace.get_store()
+            reachable_mask = self.airspace.get_reachable(point_number, max_hops=max_hops,
+                                                         max_distance=max_distance)
+            reachable_rows = np.flatnonzero(reachable_mask)
+
+            # Highlight reachable points (one scatter call) and the start point
+            ax.scatter(store.longitudes[reachable_mask], store.latitudes[reachable_mask], c='green',
+                       s=64, alpha=0.8, label='Reachable', zorder=3)
             ax.plot(start_point.longitude, start_point.latitude, 'ro',
                    markersize=10, alpha=1.0, label='Start Point', zorder=4)
 
@@ -1150,8 +1186,8 @@ class AirspaceApp:
             reachability_window.bind('<Configure>', lambda event: self._on_plot_window_resize(event, fig, canvas))
 
             # Update status text in the main window
-            reachable_names = [f"{p.number} ({p.name})" for p in reachable]
-            status_text = f"From point {point_number}, you can reach {len(reachable)} points:\n" + \
+            reachable_names = [f"{store.numbers[i]} ({store.names[i]})" for i in reachable_rows]
+            status_text = f"From point {point_number}, you can reach {len(reachable_rows)} points:\n" + \
                         ", ".join(reachable_names)
             
             # Update the status text in the features window
@@ -1173,6 +1209,8 @@ class AirspaceApp:
 
     def _find_path(self):
         """Show the shortest path graph (animated) in a new window."""
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
         if not self.airspace or not self.airspace.nav_points:
             messagebox.showwarning("No Data", "Please load airspace data first.")
             return
@@ -1194,58 +1232,16 @@ class AirspaceApp:
                 messagebox.showerror("Error", "Selected points not found")
                 return
 
-            # --- Path Finding (A*) ---
-            def heuristic(a, b):
-                return ((a.longitude - b.longitude) ** 2 + 
-                       (a.latitude - b.latitude) ** 2) ** 0.5
-
-            def get_neighbors(point):
-                return [self.airspace.get_nav_point(seg.destination_number)
-                       for seg in self.airspace.get_segments_from(point.number)]
-
-            def get_cost(a, b):
-                for seg in self.airspace.get_segments_from(a.number):
-                    if seg.destination_number == b.number:
-                        return seg.distance
-                return float('inf')
-
-            open_set = {origin.number}
-            closed_set = set()
-            came_from = {}
-            g_score = {origin.number: 0}
-            f_score = {origin.number: heuristic(origin, destination)}
-
-            path = []
-            while open_set:
-                current_number = min(open_set, key=lambda x: f_score.get(x, float('inf')))
-                current = self.airspace.get_nav_point(current_number)
-
-                if current_number == destination.number:
-                    # Path found, reconstruct it
-                    while current_number in came_from:
-                        path.append(self.airspace.get_nav_point(current_number))
-                        current_number = came_from[current_number]
-                    path.append(origin)
-                    path.reverse()
-                    break # Exit the while loop
-
-                open_set.remove(current_number)
-                closed_set.add(current_number)
-
-                for neighbor in get_neighbors(current):
-                    if neighbor.number in closed_set:
-                        continue
-
-                    tentative_g = g_score[current_number] + get_cost(current, neighbor)
-
-                    if neighbor.number not in open_set:
-                        open_set.add(neighbor.number)
-                    elif tentative_g >= g_score.get(neighbor.number, float('inf')):
-                        continue
-
-                    came_from[neighbor.number] = current_number
-                    g_score[neighbor.number] = tentative_g
-                    f_score[neighbor.number] = tentative_g + heuristic(neighbor, destination)
+            # --- Path Finding (A*, or Yen's k shortest routes for alternatives) ---
+            count, min_dissimilarity = self._read_alternative_options()
+            if count > 1:
+                routes = AlternativeRoutes(self.airspace, origin_number, dest_number, count, min_dissimilarity)
+            else:
+                routes = [FindRoute(self.airspace, origin_number, dest_number, method='astar')]
+            store = self.airspace.get_store()
+            routes = [([self.airspace.get_nav_point(number) for number in route.numbers(store)], route.distance)
+                      for route in routes if route.found]
+            path = routes[0][0] if routes else []
 
             if not path:
                 if hasattr(self, 'path_status_text') and self.path_status_text:
@@ -1293,6 +1289,13 @@ class AirspaceApp:
                 airport_alpha=0.7
             )
 
+            # Overlay the alternatives under the shortest path
+            colors = ['orange', 'purple', 'teal', 'brown', 'olive', 'magenta', 'navy', 'gold', 'cyan']
+            for i, (alternative, distance) in enumerate(routes[1:]):
+                ax_path.plot([p.longitude for p in alternative], [p.latitude for p in alternative], '--',
+                             color=colors[i % len(colors)], linewidth=1.5, alpha=0.7,
+                             label=f'Alternative {i + 2} ({distance:.0f} km)', zorder=3)
+
             # Plot the path
             path_x = [p.longitude for p in path]
             path_y = [p.latitude for p in path]
@@ -1329,14 +1332,14 @@ class AirspaceApp:
             path_window.after(10, lambda: self._on_plot_window_resize(None, fig_path, canvas_path))
 
             # Calculate path statistics
-            total_distance = sum(get_cost(path[i], path[i+1]) for i in range(len(path)-1))
+            total_distance = routes[0][1]
             path_points = [f"{p.number} ({p.name})" for p in path]
 
             # Calculate estimated flight data
-            estimated_time_hours_float = total_distance / A320_CRUISING_SPEED_KMPH
+            estimated_time_hours_float = FlightTimeHours(total_distance)
             estimated_hours = int(estimated_time_hours_float)
             estimated_minutes = int((estimated_time_hours_float * 60) % 60)
-            estimated_fuel_kg = estimated_time_hours_float * A320_FUEL_CONSUMPTION_KGPH
+            estimated_fuel_kg = FuelBurnKg(estimated_time_hours_float)
 
             # Update status text
             status_text = f"Path: {' -> '.join(path_points)}\n" + \
@@ -1344,6 +1347,10 @@ class AirspaceApp:
                         f"Estimated A320 Flight Data:\n" + \
                         f"  Flight Time: {estimated_hours}h {estimated_minutes}m\n" + \
                         f"  Fuel Burn: {estimated_fuel_kg:.2f} kg"
+            for i, (alternative, distance) in enumerate(routes[1:]):
+                status_text += f"\n\nAlternative {i + 2}: {distance:.2f} km " + \
+                               f"(+{100 * (distance / total_distance - 1) if total_distance else 0:.1f}%)\n" + \
+                               ' -> '.join(f"{p.number} ({p.name})" for p in alternative)
 
             if hasattr(self, 'path_status_text') and self.path_status_text:
                 self.path_status_text.config(state='normal')
@@ -1393,6 +1400,7 @@ class AirspaceApp:
 
     def _show_predefined_image(self):
         """Show a predefined graph image in a new window."""
+        from PIL import Image, ImageTk
         image_path = os.path.join('V8', 'Figure_2.png')
         
         if not os.path.exists(image_path):
@@ -1593,6 +1601,8 @@ class AirspaceApp:
 
     def _visualize_simple_graph(self):
         """Visualizes the loaded simple graph in the main canvas."""
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
         if not self.current_graph_data or self.current_graph_type != 'simple':
             messagebox.showwarning("Visualization Error", "No simple graph data available to visualize.")
             return
@@ -1979,6 +1989,7 @@ class AirspaceApp:
 
     def show_photo_group(self):
         """Show the photo group images in a new window."""
+        from PIL import Image, ImageTk
         print("\n=== Opening Photo Group Window ===")
         
         # Create a new window
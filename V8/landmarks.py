@@ -0,0 +1,167 @@
+"""ALT (A*, landmarks, triangle inequality) preprocessing.
+
+For a few landmark nodes l the exact distances d(l, v) and d(v, l) to and from
+every node are precomputed. The triangle inequality then bounds the remaining
+cost from any node u to a target t:
+
+    d(u, t) >= d(l, t) - d(l, u)    and    d(u, t) >= d(u, l) - d(t, l)
+
+Unlike the straight-line heuristic, these bounds know about the detours that
+airways make around restricted areas, so A* settles far fewer nodes on long
+crossings.
+"""
+import numpy as np
+from routeCache import DatasetVersion, CachePath, SaveArrays, LoadArrays
+from routing import ShortestPathTree
+
+DEFAULT_LANDMARKS = 16
+ACTIVE_LANDMARKS = 4  # Landmarks used by one query, the best ones for its endpoints
+LANDMARK_METHODS = ('farthest', 'airports')
+
+def SelectLandmarks(graph, count: int, candidates=None, seed: int = 0) -> tuple:
+    """Pick landmarks by farthest-point selection.
+
+    Each new landmark is the candidate farthest (in route distance, either
+    direction) from the landmarks chosen so far; candidates no landmark
+    reaches are taken first, so every strongly connected part gets one.
+    Nodes without any segment are never chosen.
+
+    Args:
+        graph (CSRGraph): Graph to search
+        count (int): Number of landmarks
+        candidates: Node indices to choose from, all nodes by default
+        seed (int): Seed of the random start node
+
+    Returns:
+        tuple: (landmarks, forward, backward) with forward[i][v] = d(landmark i, v)
+        and backward[i][v] = d(v, landmark i) as float64 arrays
+    """
+    connected = (graph.out_degree() + graph.in_degree()) > 0
+    candidates = np.arange(graph.num_nodes) if candidates is None else np.unique(np.asarray(candidates))
+    candidates = candidates[connected[candidates]]
+    landmarks, forward, backward = [], [], []
+    if len(candidates) == 0:
+        return np.zeros(0, dtype=np.int32), np.zeros((0, graph.num_nodes)), np.zeros((0, graph.num_nodes))
+    start = int(candidates[np.random.default_rng(seed).integers(len(candidates))])
+    start_dist = np.asarray(ShortestPathTree(graph, start)[0])
+    # Farthest reachable candidate from a random start, then farthest from the landmarks
+    reached = np.isfinite(start_dist[candidates])
+    landmark = int(candidates[np.argmax(np.where(reached, start_dist[candidates], -1.0))])
+    nearest = np.full(len(candidates), np.inf)
+    for _ in range(min(count, len(candidates))):
+        landmarks.append(landmark)
+        forward.append(np.asarray(ShortestPathTree(graph, landmark)[0]))
+        backward.append(np.asarray(ShortestPathTree(graph, landmark, reverse=True)[0]))
+        nearest = np.minimum(nearest, np.minimum(forward[-1][candidates], backward[-1][candidates]))
+        nearest[np.searchsorted(candidates, landmarks)] = -1.0
+        unreached = np.isinf(nearest)
+        landmark = int(candidates[np.argmax(unreached) if unreached.any() else np.argmax(nearest)])
+    return np.asarray(landmarks, dtype=np.int32), np.vstack(forward), np.vstack(backward)
+
+class LandmarkTable:
+    def __init__(self, landmarks: np.ndarray, forward: np.ndarray, backward: np.ndarray, version: str = None):
+        """Landmark distances of a graph.
+
+        Args:
+            landmarks (np.ndarray): int32 node index of each landmark
+            forward (np.ndarray): float64 (L, num_nodes) distances from each landmark
+            backward (np.ndarray): float64 (L, num_nodes) distances to each landmark
+            version (str): routeCache.DatasetVersion of the graph
+        """
+        self.landmarks = landmarks
+        self.forward = forward
+        self.backward = backward
+        self.version = version
+        self._rows = None
+
+    def __len__(self):
+        return len(self.landmarks)
+
+    def _node_rows(self):
+        """Per-node lists of the forward and backward distances, for the search loop."""
+        if self._rows is None:
+            self._rows = (self.forward.T.tolist(), self.backward.T.tolist())
+        return self._rows
+
+    def lower_bound(self, u: int, target: int) -> float:
+        """Largest triangle-inequality bound on d(u, target) over all landmarks."""
+        return self.heuristic(target, u, active=len(self))(u)
+
+    def heuristic(self, target: int, source: int = None, active: int = ACTIVE_LANDMARKS, base=None):
+        """Return h(u), a consistent lower bound of the cost from u to target.
+
+        Only the `active` landmarks giving the best bound at source are used,
+        which keeps each evaluation cheap without losing much precision.
+        Landmarks that cannot reach target, or that target cannot reach, give
+        no bound and are skipped. If base is given (another consistent
+        heuristic, e.g. routing.HaversineHeuristic), h is the larger of both.
+        """
+        forward_rows, backward_rows = self._node_rows()
+        to_target, from_target = forward_rows[target], backward_rows[target]
+        useful = [i for i in range(len(self))
+                  if to_target[i] != float('inf') and from_target[i] != float('inf')]
+        if source is not None and len(useful) > active:
+            f_s, b_s = forward_rows[source], backward_rows[source]
+            useful.sort(key=lambda i: -max(to_target[i] - f_s[i], b_s[i] - from_target[i]))
+        useful = useful[:active]
+        pairs = [(to_target[i], from_target[i], i) for i in useful]
+        def h(u):
+            f_u, b_u = forward_rows[u], backward_rows[u]
+            best = base(u) if base is not None else 0.0
+            for f_t, b_t, i in pairs:
+                bound = f_t - f_u[i]
+                if bound > best:
+                    best = bound
+                bound = b_u[i] - b_t
+                if bound > best:
+                    best = bound
+            return best
+        return h
+
+    @property
+    def nbytes(self) -> int:
+        return self.landmarks.nbytes + self.forward.nbytes + self.backward.nbytes
+
+    def arrays(self) -> dict:
+        return {'landmarks': self.landmarks, 'forward': self.forward, 'backward': self.backward}
+
+    @classmethod
+    def from_arrays(cls, arrays: dict, version: str = None) -> 'LandmarkTable':
+        return cls(arrays['landmarks'], arrays['forward'], arrays['backward'], version)
+
+def BuildLandmarks(airspace, count: int = DEFAULT_LANDMARKS, method: str = 'farthest', use_cache: bool = True,
+                   cache_dir: str = None) -> LandmarkTable:
+    """Select landmarks and compute their distance arrays, or load them from the routing cache.
+
+    Args:
+        airspace (AirSpace): Loaded airspace
+        count (int): Number of landmarks
+        method (str): 'farthest' (among all points) or 'airports' (among the
+            SID and STAR points of the airports)
+        use_cache (bool): Read and write the compressed cache file
+        cache_dir (str): Cache directory, routeCache.CACHE_DIR by default
+
+    Raises:
+        ValueError: If the method is unknown
+    """
+    if method not in LANDMARK_METHODS:
+        raise ValueError(f"Unknown landmark method '{method}'")
+    candidates = None
+    if method == 'airports':
+        from distanceMatrix import AirportEndpoints
+        _, departures, arrivals = AirportEndpoints(airspace)
+        candidates = np.array(sorted({row for rows in departures + arrivals for row in rows}), dtype=np.int64)
+    version = DatasetVersion(airspace, method, str(count),
+                             candidates if candidates is not None else np.zeros(0, dtype=np.int64))
+    path = CachePath(airspace, f"landmarks_{method}{count}", version, cache_dir)
+    if use_cache:
+        cached = LoadArrays(path, version)
+        if cached is not None:
+            return LandmarkTable.from_arrays(cached[0], version)
+    graph = airspace.get_graph()
+    if candidates is not None and len(candidates) == 0:
+        candidates = None  # No airports: fall back to all points
+    table = LandmarkTable(*SelectLandmarks(graph, count, candidates), version)
+    if use_cache:
+        SaveArrays(path, table.arrays(), version, meta={'airspace': airspace.name, 'method': method})
+    return table
@@ -0,0 +1,49 @@
+"""Progress reporting and cancellation for long airspace loads.
+
+A loader running in a worker thread updates a LoadProgress as it goes; the
+thread that started it (e.g. the Tk main loop, through root.after) reads the
+phase and line count and may call cancel(), which makes the loader raise
+LoadCancelled at its next progress update.
+"""
+import threading
+
+class LoadCancelled(BaseException):
+    """Raised inside a loader whose LoadProgress was cancelled.
+
+    Like KeyboardInterrupt it derives from BaseException, so the loaders'
+    `except Exception` error handlers let it through.
+    """
+
+class LoadProgress:
+    def __init__(self):
+        """Initialize the progress of a load that has not started yet."""
+        self.phase = "Starting"  # Description of the current step
+        self.lines = 0  # Input lines read so far, over all files
+        self._cancelled = threading.Event()
+
+    def start_phase(self, phase: str):
+        """Enter a new step of the load."""
+        self.check()
+        self.phase = phase
+
+    def advance(self, lines: int = 1):
+        """Count lines read and stop the load if it was cancelled."""
+        self.lines += lines
+        if self._cancelled.is_set():
+            raise LoadCancelled(self.phase)
+
+    def check(self):
+        """Raise LoadCancelled if cancel() was called."""
+        if self._cancelled.is_set():
+            raise LoadCancelled(self.phase)
+
+    def cancel(self):
+        """Ask the loader to stop; safe to call from any thread."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def __str__(self):
+        return f"{self.phase} ({self.lines:,} lines read)"
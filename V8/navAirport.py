@@ -1,5 +1,6 @@
 from navPoint import NavPoint, GetNavPointByNumber, GetNavPointByName
 from navSegment import NavSegment, GetSegmentsByOrigin, GetSegmentsByDestination
+from dataSource import OpenText, SourceName
 
 class NavAirport:
     def __init__(self, icao: str, name: str, latitude: float, longitude: float, 
@@ -76,7 +77,7 @@ class NavAirport:
         """
         return sorted(self.stars)
 
-def LoadNavAirports(filename: str, nav_points: list) -> list:
+def LoadNavAirports(filename: str, nav_points: list, progress=None) -> list:
     """Load airports from a file and link them to NavPoints.
     
     The file should be in the format:
@@ -91,8 +92,10 @@ def LoadNavAirports(filename: str, nav_points: list) -> list:
     ...
     
     Args:
-        filename (str): Path to the airports file
+        filename: Path to the airports file (optionally .gz/.xz/.bz2
+            compressed) or an open file, e.g. an archive member
         nav_points (list): List of NavPoint objects to link with airports
+        progress (LoadProgress): Updated per line read; cancelling it raises LoadCancelled
         
     Returns:
         list: List of NavAirport objects
@@ -101,8 +104,10 @@ def LoadNavAirports(filename: str, nav_points: list) -> list:
     current_airport = None
     
     try:
-        with open(filename, 'r') as f:
+        with OpenText(filename) as f:
             for line in f:
+                if progress is not None:
+                    progress.advance()
                 # Skip empty lines and comments
                 line = line.strip()
                 if not line or line.startswith('#'):
@@ -140,9 +145,9 @@ def LoadNavAirports(filename: str, nav_points: list) -> list:
             nav_airports.append(current_airport)
             
     except FileNotFoundError:
-        print(f"Error: File '{filename}' not found")
+        print(f"Error: File '{SourceName(filename)}' not found")
     except Exception as e:
-        print(f"Error reading file '{filename}': {e}")
+        print(f"Error reading file '{SourceName(filename)}': {e}")
         
     # TODO: Update airport coordinates and elevations with actual data
     # For now, we'll try to find matching NavPoints by name
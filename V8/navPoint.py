@@ -63,47 +63,42 @@ def Distance(point1: NavPoint, point2: NavPoint) -> float:
     
     return distance
 
-def LoadNavPoints(filename: str) -> list:
+def NavPointsFromColumns(columns: dict) -> list:
+    """Build NavPoint objects from the columns of bulkParser.ParseNavPoints.
+    
+    Args:
+        columns (dict): 'numbers', 'names', 'latitudes' and 'longitudes' columns
+        
+    Returns:
+        list: List of NavPoint objects, in row order
+    """
+    return [NavPoint(number, name, latitude, longitude) for number, name, latitude, longitude in
+            zip(columns['numbers'].tolist(), columns['names'], columns['latitudes'].tolist(),
+                columns['longitudes'].tolist())]
+
+def LoadNavPoints(filename: str, progress=None) -> list:
     """Load navigation points from a file.
     
     The file should be in the format:
     number name latitude longitude
     
+    The file is parsed in one go by bulkParser.ParseNavPoints; malformed lines
+    are skipped and reported in a single summary.
+    
     Args:
-        filename (str): Path to the navigation points file
+        filename: Path to the navigation points file (optionally .gz/.xz/.bz2
+            compressed) or an open file, e.g. an archive member
+        progress (LoadProgress): Advanced by the lines read once the file is
+            parsed; cancelling it raises LoadCancelled
         
     Returns:
         list: List of NavPoint objects
     """
-    nav_points = []
-    try:
-        with open(filename, 'r') as f:
-            for line in f:
-                # Skip empty lines and comments
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                    
-                # Parse the line
-                try:
-                    number, name, lat, lon = line.split()
-                    nav_point = NavPoint(
-                        number=int(number),
-                        name=name,
-                        latitude=float(lat),
-                        longitude=float(lon)
-                    )
-                    nav_points.append(nav_point)
-                except ValueError as e:
-                    print(f"Error parsing line '{line}': {e}")
-                    continue
-                    
-    except FileNotFoundError:
-        print(f"Error: File '{filename}' not found")
-    except Exception as e:
-        print(f"Error reading file '{filename}': {e}")
-        
-    return nav_points
+    from bulkParser import ParseNavPoints
+    columns, report = ParseNavPoints(filename, progress)
+    if not report.ok:
+        print(report)
+    return NavPointsFromColumns(columns)
 
 def GetNavPointByNumber(nav_points: list, number: int) -> NavPoint:
     """Find a NavPoint by its number.
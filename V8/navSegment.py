@@ -34,61 +34,78 @@ class NavSegment:
         """Detailed string representation of the NavSegment"""
         return f"NavSegment({self.origin_number}, {self.destination_number}, {self.distance})"
 
-def LoadNavSegments(filename: str, nav_points: list) -> list:
-    """Load navigation segments from a file and link them to NavPoints.
+def LinkNavSegments(columns: dict, nav_points: list) -> list:
+    """Build NavSegment objects from the columns of bulkParser.ParseNavSegments and link them to NavPoints.
     
-    The file should be in the format:
-    origin_number destination_number distance
+    The NavPoints are indexed by number once, so every segment is linked in
+    constant time. Segments whose end points cannot be found are skipped and
+    reported in a single summary warning.
     
     Args:
-        filename (str): Path to the segments file
+        columns (dict): 'origins', 'destinations' and 'distances' columns
         nav_points (list): List of NavPoint objects to link with segments
         
     Returns:
-        list: List of NavSegment objects
+        list: List of NavSegment objects, in row order
     """
-    from navPoint import GetNavPointByNumber
+    # Index the points by number (first occurrence wins, like GetNavPointByNumber)
+    points_by_number = {}
+    for point in nav_points:
+        points_by_number.setdefault(point.number, point)
     
     nav_segments = []
-    try:
-        with open(filename, 'r') as f:
-            for line in f:
-                # Skip empty lines and comments
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                    
-                # Parse the line
-                try:
-                    orig_num, dest_num, dist = line.split()
-                    segment = NavSegment(
-                        origin_number=int(orig_num),
-                        destination_number=int(dest_num),
-                        distance=float(dist)
-                    )
-                    
-                    # Link to NavPoints
-                    segment.origin = GetNavPointByNumber(nav_points, segment.origin_number)
-                    segment.destination = GetNavPointByNumber(nav_points, segment.destination_number)
-                    
-                    if segment.origin and segment.destination:
-                        # Add to neighbors list
-                        segment.origin.neighbors.append(segment.destination)
-                        nav_segments.append(segment)
-                    else:
-                        print(f"Warning: Could not find NavPoints for segment {segment}")
-                        
-                except ValueError as e:
-                    print(f"Error parsing line '{line}': {e}")
-                    continue
-                    
-    except FileNotFoundError:
-        print(f"Error: File '{filename}' not found")
-    except Exception as e:
-        print(f"Error reading file '{filename}': {e}")
+    unresolved = 0
+    missing_numbers = set()
+    for orig_num, dest_num, dist in zip(columns['origins'].tolist(), columns['destinations'].tolist(),
+                                        columns['distances'].tolist()):
+        origin = points_by_number.get(orig_num)
+        destination = points_by_number.get(dest_num)
+        if origin is not None and destination is not None:
+            segment = NavSegment(orig_num, dest_num, dist)
+            segment.origin, segment.destination = origin, destination
+            # Add to neighbors list
+            origin.neighbors.append(destination)
+            nav_segments.append(segment)
+        else:
+            unresolved += 1
+            if origin is None:
+                missing_numbers.add(orig_num)
+            if destination is None:
+                missing_numbers.add(dest_num)
+        
+    if unresolved:
+        sample = ", ".join(str(number) for number in sorted(missing_numbers)[:10])
+        more = "..." if len(missing_numbers) > 10 else ""
+        print(f"Warning: skipped {unresolved} segments referencing {len(missing_numbers)} "
+              f"unknown NavPoints ({sample}{more})")
         
     return nav_segments
 
+def LoadNavSegments(filename: str, nav_points: list, progress=None) -> list:
+    """Load navigation segments from a file and link them to NavPoints.
+    
+    The file should be in the format:
+    origin_number destination_number distance
+    
+    The file is parsed in one go by bulkParser.ParseNavSegments and linked by
+    LinkNavSegments; malformed lines are skipped and reported in a single summary.
+    
+    Args:
+        filename: Path to the segments file (optionally .gz/.xz/.bz2
+            compressed) or an open file, e.g. an archive member
+        nav_points (list): List of NavPoint objects to link with segments
+        progress (LoadProgress): Advanced by the lines read once the file is
+            parsed; cancelling it raises LoadCancelled
+        
+    Returns:
+        list: List of NavSegment objects
+    """
+    from bulkParser import ParseNavSegments
+    columns, report = ParseNavSegments(filename, progress)
+    if not report.ok:
+        print(report)
+    return LinkNavSegments(columns, nav_points)
+
 def GetSegmentsByOrigin(nav_segments: list, origin_number: int) -> list:
     """Find all segments starting from a given origin point.
     
@@ -129,8 +146,9 @@ def PlotNavSegment(segment: NavSegment, nav_points: list, ax=None, color='gray',
     if ax is None:
         _, ax = plt.subplots()
         
-    origin = GetNavPointByNumber(nav_points, segment.origin_number)
-    destination = GetNavPointByNumber(nav_points, segment.destination_number)
+    # Use the linked NavPoints when available instead of scanning the list
+    origin = segment.origin or GetNavPointByNumber(nav_points, segment.origin_number)
+    destination = segment.destination or GetNavPointByNumber(nav_points, segment.destination_number)
     if origin and destination:
         ax.plot([origin.longitude, destination.longitude], [origin.latitude, destination.latitude], color=color, linewidth=width, alpha=alpha, zorder=1)
         
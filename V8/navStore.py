@@ -0,0 +1,251 @@
+import numpy as np
+from navPoint import NavPoint
+
+class StringTable:
+    def __init__(self, offsets: np.ndarray, data: np.ndarray):
+        """Initialize a string table from its packed representation.
+
+        String i is the UTF-8 text in data[offsets[i]:offsets[i + 1]].
+
+        Args:
+            offsets (np.ndarray): int64 array of len(table) + 1 byte offsets
+            data (np.ndarray): uint8 array holding all strings back to back
+        """
+        self.offsets = offsets
+        self.data = data
+        self._lookup = None  # Lazily built {string: first index}
+
+    @classmethod
+    def from_strings(cls, strings) -> 'StringTable':
+        """Pack a sequence of strings into a StringTable."""
+        encoded = [s.encode('utf-8') for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        if encoded:
+            np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        return cls(offsets, data)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.data[start:end].tobytes().decode('utf-8')
+
+    def __iter__(self):
+        raw = self.data.tobytes()
+        offsets = self.offsets.tolist()
+        for i in range(len(offsets) - 1):
+            yield raw[offsets[i]:offsets[i + 1]].decode('utf-8')
+
+    def find(self, s: str) -> int:
+        """Return the index of the first occurrence of s, or -1."""
+        if self._lookup is None:
+            self._lookup = {}
+            for i, value in enumerate(self):
+                self._lookup.setdefault(value, i)
+        return self._lookup.get(s, -1)
+
+    @property
+    def nbytes(self) -> int:
+        return self.offsets.nbytes + self.data.nbytes
+
+class NavPointView:
+    __slots__ = ('_store', 'index')
+
+    def __init__(self, store: 'NavStore', index: int):
+        """Lightweight NavPoint-like view of one row of a NavStore.
+
+        Args:
+            store (NavStore): The store holding the data
+            index (int): Row of the point in the store arrays
+        """
+        self._store = store
+        self.index = index
+
+    @property
+    def number(self) -> int:
+        return int(self._store.numbers[self.index])
+
+    @property
+    def name(self) -> str:
+        return self._store.names[self.index]
+
+    @property
+    def latitude(self) -> float:
+        return float(self._store.latitudes[self.index])
+
+    @property
+    def longitude(self) -> float:
+        return float(self._store.longitudes[self.index])
+
+    @property
+    def neighbors(self) -> list:
+        """Views of the points reachable through one outgoing segment."""
+        return [NavPointView(self._store, int(j)) for j in self._store.neighbor_indices(self.index)]
+
+    def to_nav_point(self) -> NavPoint:
+        """Create a standalone NavPoint (without neighbors) from this view."""
+        return NavPoint(self.number, self.name, self.latitude, self.longitude)
+
+    def __eq__(self, other):
+        """Views compare equal to NavPoints and views with the same number"""
+        if not isinstance(other, (NavPoint, NavPointView)):
+            return False
+        return self.number == other.number
+
+    def __hash__(self):
+        return hash(self.number)
+
+    def __str__(self):
+        return f"{self.name} ({self.number})"
+
+    def __repr__(self):
+        return f"NavPointView({self.number}, '{self.name}', {self.latitude}, {self.longitude})"
+
+class NavStore:
+    def __init__(self, numbers: np.ndarray, latitudes: np.ndarray, longitudes: np.ndarray,
+                 names: StringTable, seg_origins: np.ndarray, seg_destinations: np.ndarray,
+                 seg_distances: np.ndarray, airport_icaos: StringTable, airport_points: np.ndarray):
+        """Struct-of-arrays representation of an airspace.
+
+        Segments and airports refer to points by their row index in the point
+        arrays, not by their navigation number.
+
+        Args:
+            numbers (np.ndarray): int64 navigation point numbers
+            latitudes (np.ndarray): float64 latitudes in degrees
+            longitudes (np.ndarray): float64 longitudes in degrees
+            names (StringTable): Navigation point names
+            seg_origins (np.ndarray): int32 origin point index of each segment
+            seg_destinations (np.ndarray): int32 destination point index of each segment
+            seg_distances (np.ndarray): float64 segment distances in kilometers
+            airport_icaos (StringTable): ICAO code of each airport
+            airport_points (np.ndarray): int32 point index of each airport, -1 if unlinked
+        """
+        self.numbers = numbers
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.names = names
+        self.seg_origins = seg_origins
+        self.seg_destinations = seg_destinations
+        self.seg_distances = seg_distances
+        self.airport_icaos = airport_icaos
+        self.airport_points = airport_points
+        self._number_order = None  # Stable argsort of numbers, for index_of
+        self._out_order = None  # Segment indices sorted by origin
+        self._out_offsets = None  # Start of each point's run in _out_order
+
+    @classmethod
+    def from_objects(cls, nav_points: list, nav_segments: list, nav_airports: list) -> 'NavStore':
+        """Build a store from NavPoint, NavSegment and NavAirport lists."""
+        n = len(nav_points)
+        numbers = np.fromiter((p.number for p in nav_points), dtype=np.int64, count=n)
+        latitudes = np.fromiter((p.latitude for p in nav_points), dtype=np.float64, count=n)
+        longitudes = np.fromiter((p.longitude for p in nav_points), dtype=np.float64, count=n)
+        store = cls(numbers, latitudes, longitudes, StringTable.from_strings(p.name for p in nav_points),
+                    np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float64),
+                    StringTable.from_strings([]), np.zeros(0, dtype=np.int32))
+
+        m = len(nav_segments)
+        origins = store.indices_of(np.fromiter((s.origin_number for s in nav_segments), dtype=np.int64, count=m))
+        destinations = store.indices_of(np.fromiter((s.destination_number for s in nav_segments), dtype=np.int64, count=m))
+        distances = np.fromiter((s.distance for s in nav_segments), dtype=np.float64, count=m)
+        valid = (origins >= 0) & (destinations >= 0)
+        store.seg_origins = origins[valid].astype(np.int32)
+        store.seg_destinations = destinations[valid].astype(np.int32)
+        store.seg_distances = distances[valid]
+
+        store._link_airports(nav_airports)
+        return store
+
+    @classmethod
+    def from_columns(cls, points: dict, segments: dict, nav_airports: list) -> 'NavStore':
+        """Build a store from the columns of bulkParser.ParseNavPoints and ParseNavSegments.
+
+        Segments with an unknown end point are dropped, like LinkNavSegments does.
+        """
+        store = cls(points['numbers'], points['latitudes'], points['longitudes'], points['names'],
+                    np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float64),
+                    StringTable.from_strings([]), np.zeros(0, dtype=np.int32))
+        origins = store.indices_of(segments['origins'])
+        destinations = store.indices_of(segments['destinations'])
+        valid = (origins >= 0) & (destinations >= 0)
+        store.seg_origins = origins[valid].astype(np.int32)
+        store.seg_destinations = destinations[valid].astype(np.int32)
+        store.seg_distances = segments['distances'][valid]
+        store._link_airports(nav_airports)
+        return store
+
+    def _link_airports(self, nav_airports: list):
+        """Fill the airport columns from NavAirport objects."""
+        self.airport_icaos = StringTable.from_strings(a.icao for a in nav_airports)
+        self.airport_points = np.array(
+            [self.index_of(a.nav_point.number) if a.nav_point is not None else -1 for a in nav_airports],
+            dtype=np.int32)
+
+    def __len__(self):
+        return len(self.numbers)
+
+    @property
+    def num_segments(self) -> int:
+        return len(self.seg_origins)
+
+    def index_of(self, number: int) -> int:
+        """Return the row index of a navigation number, or -1 if absent."""
+        return int(self.indices_of(np.array([number], dtype=np.int64))[0])
+
+    def indices_of(self, numbers: np.ndarray) -> np.ndarray:
+        """Vectorized index_of: map an array of navigation numbers to row indices (-1 if absent)."""
+        if self._number_order is None:
+            self._number_order = np.argsort(self.numbers, kind='stable')
+        numbers = np.asarray(numbers, dtype=np.int64)
+        if len(self.numbers) == 0:
+            return np.full(len(numbers), -1, dtype=np.int64)
+        sorted_numbers = self.numbers[self._number_order]
+        pos = np.searchsorted(sorted_numbers, numbers)
+        pos = np.minimum(pos, len(sorted_numbers) - 1)
+        found = sorted_numbers[pos] == numbers
+        return np.where(found, self._number_order[pos], -1)
+
+    def point(self, index: int) -> NavPointView:
+        """Return a view of the point at a row index."""
+        return NavPointView(self, index)
+
+    def get_point(self, number: int):
+        """Return a view of the point with a navigation number, or None."""
+        index = self.index_of(number)
+        return None if index < 0 else NavPointView(self, index)
+
+    def points(self):
+        """Iterate over views of all points."""
+        for i in range(len(self.numbers)):
+            yield NavPointView(self, i)
+
+    def out_segments(self, index: int) -> np.ndarray:
+        """Indices of the segments leaving the point at a row index."""
+        if self._out_order is None:
+            self._out_order = np.argsort(self.seg_origins, kind='stable')
+            self._out_offsets = np.searchsorted(self.seg_origins[self._out_order],
+                                                np.arange(len(self.numbers) + 1))
+        return self._out_order[self._out_offsets[index]:self._out_offsets[index + 1]]
+
+    def neighbor_indices(self, index: int) -> np.ndarray:
+        """Row indices of the points reachable through one outgoing segment."""
+        return self.seg_destinations[self.out_segments(index)]
+
+    def segment_coordinates(self) -> np.ndarray:
+        """Return an (S, 2, 2) array of [[lon, lat], [lon, lat]] segment end points."""
+        lines = np.empty((self.num_segments, 2, 2), dtype=np.float64)
+        lines[:, 0, 0] = self.longitudes[self.seg_origins]
+        lines[:, 0, 1] = self.latitudes[self.seg_origins]
+        lines[:, 1, 0] = self.longitudes[self.seg_destinations]
+        lines[:, 1, 1] = self.latitudes[self.seg_destinations]
+        return lines
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the arrays, in bytes."""
+        arrays = (self.numbers, self.latitudes, self.longitudes, self.seg_origins,
+                  self.seg_destinations, self.seg_distances, self.airport_points)
+        return sum(a.nbytes for a in arrays) + self.names.nbytes + self.airport_icaos.nbytes
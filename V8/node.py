@@ -1,22 +1,39 @@
+class TrackedList(list):
+    """A list that counts its changes, so that indexes built from it can tell when they are stale.
+    edits counts the changes of this list and TrackedList.all_edits those of every TrackedList."""
+    edits : int = 0
+    all_edits : int = 0
+
+def _Tracked(name : str):
+    method = getattr(list, name)
+
+    def changed(self, *args, **kwargs):
+        self.edits += 1
+        TrackedList.all_edits += 1
+        return method(self, *args, **kwargs)
+
+    changed.__name__ = name
+    return changed
+
+for _name in ("__setitem__", "__delitem__", "__iadd__", "__imul__", "append", "extend",
+              "insert", "pop", "remove", "clear", "sort", "reverse"):
+    setattr(TrackedList, _name, _Tracked(_name))
+
 class Node:
 
     def __init__(self, name : str, coordinate_x : float, coordinate_y : float):
         self.name : str = name
         self.coordinate_x : float = coordinate_x
         self.coordinate_y : float = coordinate_y
-        self.list_of_neighbors : list = []
+        self.list_of_neighbors : list = TrackedList()  # Counts its edits for the compiled graph cache
+        self.neighbor_names : set = set()  # Names in list_of_neighbors, for O(1) AddNeighbor
 
 def AddNeighbor(n1 : Node, n2 : Node):
-    Found = False
-
-    for i in n1.list_of_neighbors:
-        if i.name == n2.name:
-            Found = True
-    
-    if Found:
+    if n2.name in n1.neighbor_names:
         return False
-    elif not Found:
+    else:
         n1.list_of_neighbors.append(n2)
+        n1.neighbor_names.add(n2.name)
         return True
     
 def Distance(n1 : Node, n2 : Node):
@@ -0,0 +1,181 @@
+"""Multi-criteria route optimisation: the Pareto front of distance, time, fuel, ...
+
+Every segment carries a cost vector. A route is Pareto-optimal when no other
+route is at least as good in every criterion; ParetoRoutes returns all such
+routes with a label-setting search (multi-criteria Dijkstra). Labels are
+settled in lexicographic order of their cost vectors, so a settled label is
+never dominated by a later one, and new labels are dropped when a settled
+label at the same node dominates them.
+
+Labels are also pruned against the routes already found: one reverse Dijkstra
+per criterion gives a lower bound of the remaining cost vector from every
+node, and a label whose cost plus that bound is dominated by a found route
+cannot lead to a new one.
+
+Fronts can grow quickly with conflicting criteria, so max_labels bounds the
+labels settled per node; the search then keeps the lexicographically best
+labels and returns a subset of the front (always including the route that is
+best in the first criterion).
+
+With the default constant cruising speed and fuel flow, time and fuel are
+proportional to distance and the front is a single route; they only conflict
+when per-segment speeds (winds, congestion, altitude) or fuel flows are given.
+"""
+from heapq import heappush, heappop
+import numpy as np
+from aircraft import A320_CRUISING_SPEED_KMPH, A320_FUEL_CONSUMPTION_KGPH
+from csrGraph import CSRGraph
+from routing import RouteResult, ShortestPathTree
+
+CRITERIA = ('distance', 'time', 'fuel', 'segments')
+DEFAULT_CRITERIA = ('distance', 'time', 'fuel')
+
+class ParetoRoute(RouteResult):
+    def __init__(self, nodes: list, costs: tuple, settled: int):
+        """A Pareto-optimal route with its cost vector.
+
+        Args:
+            nodes (list): Node row indices from origin to destination
+            costs (tuple): Total cost of the route in each criterion
+            settled (int): Number of labels settled by the search
+        """
+        super().__init__(nodes, costs[0], settled)
+        self.costs = costs
+
+    def __repr__(self):
+        return f"ParetoRoute(nodes={len(self.nodes)}, costs={tuple(round(c, 2) for c in self.costs)})"
+
+def SegmentCosts(airspace, criteria=DEFAULT_CRITERIA, speeds=None, fuel_flows=None) -> np.ndarray:
+    """Cost vectors of the segments of an airspace, in store segment order.
+
+    Args:
+        airspace (AirSpace): Loaded airspace
+        criteria: Names from CRITERIA: 'distance' (km), 'time' (hours), 'fuel'
+            (kg) or 'segments' (1 per segment)
+        speeds: Ground speed in km/h, one per segment or a single value
+            (A320 cruising speed by default)
+        fuel_flows: Fuel consumption in kg/h, one per segment or a single value
+            (A320 consumption by default)
+
+    Returns:
+        np.ndarray: float64 (num_segments, len(criteria)) array
+
+    Raises:
+        ValueError: If a criterion is unknown
+    """
+    unknown = [name for name in criteria if name not in CRITERIA]
+    if unknown:
+        raise ValueError(f"Unknown routing criterion '{unknown[0]}'")
+    distances = np.asarray(airspace.get_store().seg_distances, dtype=np.float64)
+    hours = distances / np.asarray(A320_CRUISING_SPEED_KMPH if speeds is None else speeds, dtype=np.float64)
+    columns = {
+        'distance': distances,
+        'time': hours,
+        'fuel': hours * np.asarray(A320_FUEL_CONSUMPTION_KGPH if fuel_flows is None else fuel_flows,
+                                   dtype=np.float64),
+        'segments': np.ones(len(distances)),
+    }
+    return np.column_stack([columns[name] for name in criteria])
+
+def _LowerBounds(graph, costs: np.ndarray, target: int) -> list:
+    """Per node, the tuple of shortest distances to target in each criterion separately."""
+    arrays = graph.arrays()
+    trees = []
+    for c in range(costs.shape[1]):
+        column = np.ascontiguousarray(costs[:, c])
+        criterion = CSRGraph.from_arrays(graph.num_nodes, dict(arrays, weights=column[graph.edge_ids],
+                                                               rev_weights=column[graph.rev_edge_ids]))
+        trees.append(ShortestPathTree(criterion, target, reverse=True)[0])
+    return list(zip(*trees))
+
+def _Dominated(cost: tuple, front: list) -> bool:
+    """True if a cost vector of front is at least as good as cost in every criterion."""
+    for other in front:
+        for a, b in zip(other, cost):
+            if a > b:
+                break
+        else:
+            return True
+    return False
+
+def ParetoRoutes(graph, source: int, target: int, costs: np.ndarray, max_labels: int = None) -> list:
+    """Pareto-optimal routes between two nodes by label-setting with dominance pruning.
+
+    Args:
+        graph (CSRGraph): Graph to search
+        source (int): Origin node
+        target (int): Destination node
+        costs (np.ndarray): (num_edges, C) non-negative cost vectors, in the edge
+            order the graph was compiled from (store segment order)
+        max_labels (int): Bound on the labels settled per node, None for the
+            exact front
+
+    Returns:
+        list: ParetoRoutes in lexicographic order of their costs (shortest in
+        the first criterion first); empty if target is unreachable
+    """
+    costs = np.asarray(costs, dtype=np.float64)
+    bounds = _LowerBounds(graph, costs, target)
+    if bounds[source][0] == float('inf'):
+        return []
+    offsets, heads = graph.offsets.tolist(), graph.targets.tolist()
+    edge_costs = [tuple(row) for row in costs[graph.edge_ids].tolist()]
+    zero = (0.0,) * costs.shape[1]
+    label_nodes, label_parents = [source], [-1]
+    settled = {}  # Node -> cost vectors of its settled labels
+    found, front = [], []  # Settled target labels and their costs
+    count = 0
+    heap = [(zero, 0)]
+    while heap:
+        cost, label = heappop(heap)
+        u = label_nodes[label]
+        labels = settled.setdefault(u, [])
+        if _Dominated(cost, labels) or (max_labels is not None and len(labels) >= max_labels):
+            continue
+        if front and _Dominated(tuple(a + b for a, b in zip(cost, bounds[u])), front):
+            continue
+        labels.append(cost)
+        count += 1
+        if u == target:
+            found.append(label)
+            front.append(cost)
+            continue
+        for k in range(offsets[u], offsets[u + 1]):
+            v = heads[k]
+            bound = bounds[v]
+            if bound[0] == float('inf'):
+                continue
+            new = tuple(a + b for a, b in zip(cost, edge_costs[k]))
+            if v in settled and _Dominated(new, settled[v]):
+                continue
+            if front and _Dominated(tuple(a + b for a, b in zip(new, bound)), front):
+                continue
+            label_nodes.append(v)
+            label_parents.append(label)
+            heappush(heap, (new, len(label_nodes) - 1))
+    routes = []
+    for label, cost in zip(found, front):
+        nodes = []
+        while label >= 0:
+            nodes.append(label_nodes[label])
+            label = label_parents[label]
+        nodes.reverse()
+        routes.append(ParetoRoute(nodes, cost, count))
+    return routes
+
+def FindParetoRoutes(airspace, origin_number: int, destination_number: int, criteria=DEFAULT_CRITERIA,
+                     max_labels: int = None, speeds=None, fuel_flows=None) -> list:
+    """Pareto front of routes between two navigation points of an AirSpace.
+
+    See SegmentCosts for criteria, speeds and fuel_flows; route.costs follows
+    the order of criteria.
+
+    Raises:
+        ValueError: If a point or a criterion does not exist
+    """
+    store = airspace.get_store()
+    source, target = store.index_of(origin_number), store.index_of(destination_number)
+    if source < 0 or target < 0:
+        raise ValueError(f"Point {origin_number if source < 0 else destination_number} not found")
+    costs = SegmentCosts(airspace, criteria, speeds, fuel_flows)
+    return ParetoRoutes(airspace.get_graph(), source, target, costs, max_labels)
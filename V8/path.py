@@ -1,13 +1,95 @@
 from node import Node
-import matplotlib.pyplot as plt
+
+# Each Path carries a persistent hash map of node -> cost to its first
+# occurrence: a 32-way trie over the bits of hash(node) whose tables are
+# never modified, so extending a path copies one table per level and shares
+# everything else with the path it extends. Tables are lists, entries are
+# (node, cost) tuples and nodes whose hashes match in every bit share a dict.
+_BITS = 5
+_WIDTH = 1 << _BITS
+_HASH_BITS = 64
+
+def _MapGet(table, key, default):
+    h = hash(key)
+    shift = 0
+    while table is not None:
+        slot = table[(h >> shift) & (_WIDTH - 1)]
+        if type(slot) is list:
+            table = slot
+            shift += _BITS
+        elif type(slot) is tuple:
+            return slot[1] if slot[0] is key or slot[0] == key else default
+        elif type(slot) is dict:
+            return slot.get(key, default)
+        else:
+            return default
+    return default
+
+def _MapAdd(table, key, h, value, shift=0):
+    """A copy of table with key -> value added, or None if key is already there."""
+    index = (h >> shift) & (_WIDTH - 1)
+    slot = None if table is None else table[index]
+    if slot is None:
+        new_slot = (key, value)
+    elif type(slot) is tuple:
+        if slot[0] is key or slot[0] == key:
+            return None
+        if shift + _BITS >= _HASH_BITS:
+            new_slot = {slot[0]: slot[1], key: value}
+        else:
+            new_slot = _MapAdd(_MapAdd(None, slot[0], hash(slot[0]), slot[1], shift + _BITS),
+                               key, h, value, shift + _BITS)
+    elif type(slot) is dict:
+        if key in slot:
+            return None
+        new_slot = dict(slot)
+        new_slot[key] = value
+    else:
+        new_slot = _MapAdd(slot, key, h, value, shift + _BITS)
+        if new_slot is None:
+            return None
+    new_table = [None] * _WIDTH if table is None else list(table)
+    new_table[index] = new_slot
+    return new_table
 
 class Path:
+    """A path stored as a link in a tree of paths that share their prefixes.
+
+    Each Path only knows its last node, its cumulative cost, its depth, the
+    Path it extends and a persistent map of node -> cost to its first
+    occurrence. AddNodeToPath never copies the node list and only copies one
+    small table per level of the map (O(log n) with base 32, at most 13
+    levels), and ContainsNode and CostToNode are a single lookup in that map.
+    Only the node list is built lazily.
+    """
+    __slots__ = ('_node', '_parent', '_depth', 'cost', '_costs', '_nodes')
+
     def __init__(self, origin_node: Node):
-        self.nodes = [origin_node]  # List of nodes in the path
+        self._node = origin_node  # Last node of the path
+        self._parent = None  # Path this one extends, None for the origin
+        self._depth = 0  # Number of links before this one
         self.cost = 0  # Total cost of the path
+        self._costs = _MapAdd(None, origin_node, hash(origin_node), 0)  # Node -> cost to its first occurrence
+        self._nodes = None  # Cached list of nodes
+
+    @property
+    def nodes(self) -> list:
+        """List of nodes in the path, from the origin to the last node"""
+        if self._nodes is None:
+            nodes = []
+            link = self
+            while link is not None:
+                nodes.append(link._node)
+                link = link._parent
+            nodes.reverse()
+            self._nodes = nodes
+        return self._nodes
+
+    def __len__(self):
+        return self._depth + 1
         
     def get_last_node(self) -> Node:
-        return self.nodes[-1]
+        return self._node
         
     def get_total_cost(self) -> float:
         return self.cost
@@ -20,32 +102,29 @@ class Path:
 def AddNodeToPath(path: Path, node: Node) -> Path:
     """Adds a node to the path and updates the cost"""
     from node import Distance
-    new_path = Path(path.nodes[0])  # Create new path with same origin
-    new_path.nodes = path.nodes.copy()  # Copy existing nodes
-    new_path.nodes.append(node)  # Add new node
+    new_path = Path.__new__(Path)
+    new_path._node = node
+    new_path._parent = path  # Share the existing nodes instead of copying them
+    new_path._depth = path._depth + 1
     new_path.cost = path.cost + Distance(path.get_last_node(), node)  # Update cost
+    # A revisited node keeps the cost to its first occurrence
+    costs = _MapAdd(path._costs, node, hash(node), new_path.cost)
+    new_path._costs = path._costs if costs is None else costs
+    new_path._nodes = None
     return new_path
 
 def ContainsNode(path: Path, node: Node) -> bool:
     """Returns True if the Node is in the Path and False otherwise"""
-    return node in path.nodes
+    return _MapGet(path._costs, node, None) is not None
 
 def CostToNode(path: Path, node: Node) -> float:
     """Returns the total cost from the origin of the Path to the Node.
     Returns -1 if the Node is not in the Path."""
-    if not ContainsNode(path, node):
-        return -1
-        
-    from node import Distance
-    total_cost = 0
-    for i in range(len(path.nodes) - 1):
-        if path.nodes[i] == node:
-            break
-        total_cost += Distance(path.nodes[i], path.nodes[i + 1])
-    return total_cost
+    return _MapGet(path._costs, node, -1)
 
 def PlotPath(graph, path: Path):
     """Plots the Path in the Graph"""
+    import matplotlib.pyplot as plt
     plt.clf()
     fig = plt.figure()
     
@@ -0,0 +1,56 @@
+"""Reachability queries over a compiled CSRGraph.
+
+Used by both the AirSpace (AirSpace.get_reachable) and the simple Graph
+(graph.GetReachableNodes), and returns NumPy masks the plots can use directly.
+"""
+import numpy as np
+
+def ReachableMask(graph, sources, max_hops: int = None, max_distance: float = None,
+                  reverse: bool = False) -> np.ndarray:
+    """Find every node that can be reached from any of the sources.
+
+    Without a distance limit this is a level-synchronous breadth-first search:
+    each level gathers the CSR rows of the whole frontier at once, so every
+    node and edge is visited once (O(V + E)).
+
+    Args:
+        graph (CSRGraph): Graph to search
+        sources: A node index or an iterable of node indices
+        max_hops (int): Only follow paths of at most this many segments
+        max_distance (float): Only keep nodes whose shortest distance is at most this
+        reverse (bool): Follow segments backwards (nodes that can reach the sources)
+
+    Returns:
+        np.ndarray: Boolean mask of length graph.num_nodes, True for reachable nodes
+            (sources included)
+    """
+    sources = np.atleast_1d(np.asarray(sources, dtype=np.int64))
+    if max_distance is not None:
+        from routing import ShortestPathTree
+        if max_hops is not None:
+            raise ValueError("Use either max_hops or max_distance, not both")
+        dist, _ = ShortestPathTree(graph, sources.tolist(), reverse=reverse, max_distance=max_distance)
+        return np.isfinite(np.asarray(dist, dtype=np.float64))
+
+    offsets, targets = (graph.rev_offsets, graph.rev_sources) if reverse else (graph.offsets, graph.targets)
+    visited = np.zeros(graph.num_nodes, dtype=bool)
+    frontier = np.unique(sources)
+    visited[frontier] = True
+    hops = 0
+    while frontier.size and (max_hops is None or hops < max_hops):
+        starts = offsets[frontier]
+        counts = offsets[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            break
+        # Positions of all edges leaving the frontier
+        row_start = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        neighbors = targets[row_start + np.arange(total)]
+        frontier = np.unique(neighbors[~visited[neighbors]])
+        visited[frontier] = True
+        hops += 1
+    return visited
+
+def ReachableIndices(graph, sources, **kwargs) -> np.ndarray:
+    """Same as ReachableMask but returns the sorted indices of the reachable nodes."""
+    return np.flatnonzero(ReachableMask(graph, sources, **kwargs))
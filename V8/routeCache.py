@@ -0,0 +1,85 @@
+"""On-disk cache of routing data derived from an airspace graph.
+
+Precomputed tables (distance matrices, landmark distances, ...) are stored as
+compressed .npz files named after the airspace, the kind of table and the
+dataset version: a hash of the compiled graph and of any extra inputs, so a
+table is never reused for data it was not computed from.
+"""
+import hashlib
+import json
+import os
+import re
+import zipfile
+import numpy as np
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "routing_cache")
+
+def DatasetVersion(airspace, *extra) -> str:
+    """Hex digest identifying the routing data of an airspace.
+
+    Covers the point numbers and the CSR graph (hashed once per compiled
+    graph), plus any extra arrays or strings the cached table depends on.
+    """
+    graph = airspace.get_graph()
+    base = graph.cache.get('dataset_version')
+    if base is None:
+        digest = hashlib.sha1()
+        for a in (airspace.get_store().numbers, graph.offsets, graph.targets, graph.weights):
+            digest.update(np.ascontiguousarray(a).tobytes())
+        base = graph.cache['dataset_version'] = digest.hexdigest()
+    if not extra:
+        return base
+    digest = hashlib.sha1(base.encode('ascii'))
+    for item in extra:
+        digest.update(item.encode('utf-8') if isinstance(item, str) else np.ascontiguousarray(item).tobytes())
+    return digest.hexdigest()
+
+def CachePath(airspace, kind: str, version: str, cache_dir: str = None) -> str:
+    """File holding a table of the given kind for an airspace version."""
+    name = re.sub(r'\W+', '_', airspace.name)
+    return os.path.join(cache_dir or CACHE_DIR, f"{name}_{kind}_{version[:16]}.npz")
+
+def SaveArrays(path: str, arrays: dict, version: str, meta: dict = None) -> bool:
+    """Write arrays to a compressed .npz file, replacing it atomically.
+
+    Returns:
+        bool: True if the file was written
+    """
+    header = json.dumps({'version': version, 'meta': meta or {}}).encode('utf-8')
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, _header=np.frombuffer(header, dtype=np.uint8), **arrays)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Warning: could not write routing cache '{path}': {e}")
+        return False
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return True
+
+def LoadArrays(path: str, version: str = None):
+    """Read a file written by SaveArrays.
+
+    Args:
+        path (str): File to read
+        version (str): Version the file must have been written for, None for any
+
+    Returns:
+        tuple: (arrays dict, meta dict), or None if the file is missing,
+        unreadable or was written for another version
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path) as data:
+            header = json.loads(data['_header'].tobytes().decode('utf-8'))
+            if version is not None and header['version'] != version:
+                return None
+            arrays = {name: data[name] for name in data.files if name != '_header'}
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+        print(f"Warning: ignoring routing cache '{path}': {e}")
+        return None
+    return arrays, header['meta']
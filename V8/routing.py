@@ -0,0 +1,340 @@
+"""Shortest-path routing over a compiled CSRGraph.
+
+Everything here works on node row indices and Python lists, without Tk or
+matplotlib, so it can be used from the UI, scripts and tests alike.
+"""
+from heapq import heappush, heappop
+from math import asin, sqrt
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0  # Same radius as navPoint.Distance
+
+class RouteResult:
+    def __init__(self, nodes: list, distance: float, settled: int):
+        """Result of a point-to-point query.
+
+        Args:
+            nodes (list): Node row indices from origin to destination (empty if no route)
+            distance (float): Total route cost, inf if no route
+            settled (int): Number of nodes settled by the search
+        """
+        self.nodes = nodes
+        self.distance = distance
+        self.settled = settled
+
+    @property
+    def found(self) -> bool:
+        return bool(self.nodes)
+
+    def numbers(self, store) -> list:
+        """Navigation numbers of the route nodes."""
+        return [int(store.numbers[i]) for i in self.nodes]
+
+    def __repr__(self):
+        return f"RouteResult(nodes={len(self.nodes)}, distance={self.distance:.2f}, settled={self.settled})"
+
+def _unit_vectors(graph):
+    """Cached (x, y, z) lists of the node positions on the unit sphere."""
+    if 'unit_vectors' not in graph.cache:
+        lat = np.radians(graph.latitudes)
+        lon = np.radians(graph.longitudes)
+        graph.cache['unit_vectors'] = ((np.cos(lat) * np.cos(lon)).tolist(),
+                                       (np.cos(lat) * np.sin(lon)).tolist(),
+                                       np.sin(lat).tolist())
+    return graph.cache['unit_vectors']
+
+def HeuristicScale(graph) -> float:
+    """Largest factor c <= 1 such that c * great-circle distance never exceeds an edge weight.
+
+    Segment distances in the data files are rounded and can be slightly shorter
+    than the haversine distance between their end points. Scaling the
+    heuristic by c keeps it admissible and consistent on every edge.
+    """
+    if 'heuristic_scale' not in graph.cache:
+        scale = 1.0
+        if graph.num_edges:
+            origins = np.repeat(np.arange(graph.num_nodes), np.diff(graph.offsets))
+            x, y, z = (np.asarray(a) for a in _unit_vectors(graph))
+            chord = np.sqrt((x[origins] - x[graph.targets]) ** 2 + (y[origins] - y[graph.targets]) ** 2 +
+                            (z[origins] - z[graph.targets]) ** 2)
+            great_circle = 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, chord / 2))
+            positive = great_circle > 0
+            if positive.any():
+                scale = min(1.0, float((graph.weights[positive] / great_circle[positive]).min()))
+        graph.cache['heuristic_scale'] = max(scale, 0.0)
+    return graph.cache['heuristic_scale']
+
+def HaversineHeuristic(graph, target: int):
+    """Return h(u), an admissible estimate in kilometers of the cost from u to target."""
+    x, y, z = _unit_vectors(graph)
+    tx, ty, tz = x[target], y[target], z[target]
+    factor = 2 * EARTH_RADIUS_KM * HeuristicScale(graph)
+    def h(u):
+        chord = sqrt((x[u] - tx) ** 2 + (y[u] - ty) ** 2 + (z[u] - tz) ** 2)
+        return factor * asin(min(1.0, chord / 2))
+    return h
+
+def _build_route(parent: dict, source: int, target: int) -> list:
+    """Follow parent pointers back from target and return the node list."""
+    nodes = [target]
+    while nodes[-1] != source:
+        nodes.append(parent[nodes[-1]])
+    nodes.reverse()
+    return nodes
+
+def AStar(graph, source: int, target: int, heuristic=None) -> RouteResult:
+    """A* search with a binary heap and lazy deletion.
+
+    Args:
+        graph (CSRGraph): Graph to search
+        source (int): Origin node
+        target (int): Destination node
+        heuristic: Function h(u) giving a consistent lower bound of the cost from
+            u to target. Defaults to the scaled haversine distance.
+
+    Returns:
+        RouteResult: The shortest route, or an empty result if target is unreachable
+    """
+    if heuristic is None:
+        heuristic = HaversineHeuristic(graph, target)
+    offsets, targets, weights = graph.as_lists()
+    inf = float('inf')
+    g = {source: 0.0}
+    parent = {}
+    settled = set()
+    heap = [(heuristic(source), 0.0, source)]
+    while heap:
+        _, g_u, u = heappop(heap)
+        if u in settled:
+            continue  # Stale entry
+        settled.add(u)
+        if u == target:
+            return RouteResult(_build_route(parent, source, target), g_u, len(settled))
+        for k in range(offsets[u], offsets[u + 1]):
+            v = targets[k]
+            g_v = g_u + weights[k]
+            if g_v < g.get(v, inf):
+                g[v] = g_v
+                parent[v] = u
+                heappush(heap, (g_v + heuristic(v), g_v, v))
+    return RouteResult([], inf, len(settled))
+
+def Dijkstra(graph, source: int, target: int) -> RouteResult:
+    """Dijkstra's algorithm from source, stopping as soon as target is settled."""
+    return AStar(graph, source, target, heuristic=lambda u: 0.0)
+
+def BidirectionalSearch(graph, source: int, target: int, heuristic=None, reverse_heuristic=None) -> RouteResult:
+    """Grow a forward search from source and a backward search from target until they meet.
+
+    The backward search runs over the reverse CSR arrays. Each step advances
+    the side whose heap top is smaller. With heuristics, both searches use
+    the averaged potential p(u) = (heuristic(u) - reverse_heuristic(u)) / 2
+    (forward keys d + p, backward keys d - p), which is consistent in both
+    directions. Either way the search stops once the two heap tops add up to
+    at least the best route seen so far.
+
+    Args:
+        graph (CSRGraph): Graph to search
+        source (int): Origin node
+        target (int): Destination node
+        heuristic: Consistent lower bound h(u) of the cost from u to target,
+            or None for bidirectional Dijkstra
+        reverse_heuristic: Consistent lower bound of the cost from source to u;
+            required with heuristic
+
+    Returns:
+        RouteResult: The shortest route, or an empty result if target is unreachable;
+        settled counts the nodes settled by both searches
+    """
+    inf = float('inf')
+    if source == target:
+        return RouteResult([source], 0.0, 1)
+    if heuristic is None:
+        potential = lambda u: 0.0
+    else:
+        known = {}  # Nodes are often labeled by both searches and more than once
+        def potential(u):
+            p = known.get(u)
+            if p is None:
+                p = known[u] = 0.5 * (heuristic(u) - reverse_heuristic(u))
+            return p
+    adjacency = (graph.as_lists(), graph.reverse_as_lists())
+    dist = ({source: 0.0}, {target: 0.0})
+    parent = ({}, {})
+    settled = (set(), set())
+    heaps = ([(potential(source), 0.0, source)], [(-potential(target), 0.0, target)])
+    best, meet = inf, -1
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        _, d_u, u = heappop(heaps[side])
+        if u in settled[side]:
+            continue  # Stale entry
+        settled[side].add(u)
+        offsets, heads, weights = adjacency[side]
+        own, other, heap = dist[side], dist[1 - side], heaps[side]
+        sign = 1.0 if side == 0 else -1.0
+        for k in range(offsets[u], offsets[u + 1]):
+            v = heads[k]
+            d_v = d_u + weights[k]
+            if d_v < own.get(v, inf):
+                own[v] = d_v
+                parent[side][v] = u
+                heappush(heap, (d_v + sign * potential(v), d_v, v))
+                if v in other and d_v + other[v] < best:
+                    best, meet = d_v + other[v], v
+    count = len(settled[0]) + len(settled[1])
+    if meet < 0:
+        return RouteResult([], inf, count)
+    nodes = _build_route(parent[0], source, meet)
+    while nodes[-1] != target:
+        nodes.append(parent[1][nodes[-1]])
+    return RouteResult(nodes, best, count)
+
+def BidirectionalDijkstra(graph, source: int, target: int) -> RouteResult:
+    """Bidirectional Dijkstra over the forward and reverse graph."""
+    return BidirectionalSearch(graph, source, target)
+
+def BidirectionalAStar(graph, source: int, target: int) -> RouteResult:
+    """Bidirectional A* with the averaged haversine potential of both endpoints."""
+    return BidirectionalSearch(graph, source, target, HaversineHeuristic(graph, target),
+                               HaversineHeuristic(graph, source))
+
+def RoutesFromSource(graph, source: int, targets) -> list:
+    """Shortest routes from one source to several targets with a single Dijkstra.
+
+    The search stops as soon as every target is settled, so a batch of
+    destinations sharing an origin costs one (partial) tree instead of one
+    search each.
+
+    Args:
+        graph (CSRGraph): Graph to search
+        source (int): Origin node
+        targets: Destination nodes (duplicates allowed)
+
+    Returns:
+        list: A RouteResult per entry of targets, in the same order; settled
+        counts the nodes settled when that target was reached
+    """
+    offsets, heads, weights = graph.as_lists()
+    inf = float('inf')
+    remaining = set(targets)
+    reached = {}  # Target -> (distance, settled count)
+    dist = {source: 0.0}
+    parent = {}
+    settled = set()
+    heap = [(0.0, source)]
+    while heap and remaining:
+        d_u, u = heappop(heap)
+        if u in settled:
+            continue
+        settled.add(u)
+        if u in remaining:
+            remaining.discard(u)
+            reached[u] = (d_u, len(settled))
+        for k in range(offsets[u], offsets[u + 1]):
+            v = heads[k]
+            d_v = d_u + weights[k]
+            if d_v < dist.get(v, inf):
+                dist[v] = d_v
+                parent[v] = u
+                heappush(heap, (d_v, v))
+    results = []
+    for target in targets:
+        if target in reached:
+            distance, count = reached[target]
+            results.append(RouteResult(_build_route(parent, source, target), distance, count))
+        else:
+            results.append(RouteResult([], inf, len(settled)))
+    return results
+
+def ShortestPathTree(graph, sources, reverse: bool = False, max_distance: float = float('inf')):
+    """Run Dijkstra from one or more sources over the whole graph.
+
+    Args:
+        graph (CSRGraph): Graph to search
+        sources: A node or an iterable of nodes, all starting at distance 0
+        reverse (bool): Search the reverse graph (distances *to* the sources)
+        max_distance (float): Stop once the next node is farther than this
+
+    Returns:
+        tuple: (distances, parents) lists of length num_nodes; unreached nodes
+        have distance inf and parent -1, sources have parent -1
+    """
+    offsets, targets, weights = graph.reverse_as_lists() if reverse else graph.as_lists()
+    inf = float('inf')
+    dist = [inf] * graph.num_nodes
+    parent = [-1] * graph.num_nodes
+    done = [False] * graph.num_nodes
+    if isinstance(sources, (int, np.integer)):
+        sources = [sources]
+    heap = []
+    for s in sources:
+        s = int(s)
+        dist[s] = 0.0
+        heap.append((0.0, s))
+    while heap:
+        d_u, u = heappop(heap)
+        if done[u]:
+            continue
+        if d_u > max_distance:
+            break
+        done[u] = True
+        for k in range(offsets[u], offsets[u + 1]):
+            v = targets[k]
+            d_v = d_u + weights[k]
+            if d_v < dist[v]:
+                dist[v] = d_v
+                parent[v] = u
+                heappush(heap, (d_v, v))
+    if max_distance != inf:
+        # Drop tentative labels that were never settled
+        for v in range(graph.num_nodes):
+            if not done[v]:
+                dist[v] = inf
+                parent[v] = -1
+    return dist, parent
+
+def FindRoute(airspace, origin_number: int, destination_number: int, method: str = 'astar',
+              cache_dir: str = None) -> RouteResult:
+    """Find the shortest route between two navigation points of an AirSpace.
+
+    Args:
+        airspace (AirSpace): Loaded airspace
+        origin_number (int): Navigation number of the origin point
+        destination_number (int): Navigation number of the destination point
+        method (str): 'astar', 'alt' (A* bounded by the landmarks of
+            airspace.get_landmarks() and the haversine distance), 'ch' (the
+            airspace's contraction hierarchy, Dijkstra if it has none or it is
+            stale), 'dijkstra', or 'biastar' / 'bidijkstra' (the bidirectional
+            variants of A* and Dijkstra)
+        cache_dir (str): Routing cache directory the 'alt' landmarks are read
+            from and written to, routeCache.CACHE_DIR by default
+
+    Returns:
+        RouteResult: Route over store row indices; use result.numbers(store) for numbers
+
+    Raises:
+        ValueError: If a point does not exist or the method is unknown
+    """
+    store = airspace.get_store()
+    source, target = store.index_of(origin_number), store.index_of(destination_number)
+    if source < 0 or target < 0:
+        raise ValueError(f"Point {origin_number if source < 0 else destination_number} not found")
+    graph = airspace.get_graph()
+    if method == 'astar':
+        return AStar(graph, source, target)
+    if method == 'alt':
+        heuristic = airspace.get_landmarks(cache_dir=cache_dir).heuristic(target, source, base=HaversineHeuristic(graph, target))
+        return AStar(graph, source, target, heuristic=heuristic)
+    if method == 'ch':
+        from contraction import HierarchyRoute
+        return HierarchyRoute(airspace, airspace.get_contraction_hierarchy(), source, target)
+    if method == 'dijkstra':
+        return Dijkstra(graph, source, target)
+    if method == 'biastar':
+        return BidirectionalAStar(graph, source, target)
+    if method == 'bidijkstra':
+        return BidirectionalDijkstra(graph, source, target)
+    raise ValueError(f"Unknown routing method '{method}'")
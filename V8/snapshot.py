@@ -0,0 +1,128 @@
+"""Binary snapshots of parsed airspace data, also used as the airspace file format.
+
+A snapshot file is an 8-byte magic, a little-endian uint32 format version and
+uint32 header length, a JSON header, and then the raw array bytes, each array
+starting on a 64-byte boundary. The header lists every array (dtype, shape,
+offset) and a key for every source file (size, mtime, content hash), so a
+snapshot can be memory-mapped and checked against its sources without reading
+the text files again.
+"""
+import hashlib
+import json
+import os
+import struct
+import numpy as np
+from dataSource import StripCompression
+
+SNAPSHOT_MAGIC = b"AIRSNAP\0"
+SNAPSHOT_VERSION = 2
+SNAPSHOT_SUFFIX = ".snapshot"
+_ALIGNMENT = 64
+_PREAMBLE = struct.Struct("<8sII")
+
+def SnapshotPath(nav_file: str) -> str:
+    """Path of the snapshot written next to a navigation points file or dataset archive."""
+    root = StripCompression(os.fspath(nav_file))
+    root = os.path.splitext(root)[0]
+    if root.endswith('.tar'):
+        root = root[:-4]
+    return root + SNAPSHOT_SUFFIX
+
+def FileHash(path: str) -> str:
+    """SHA-1 hex digest of a file's contents."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def SourceKey(path: str) -> dict:
+    """Size, modification time and content hash identifying a source file."""
+    stat = os.stat(path)
+    return {'name': os.path.basename(path), 'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns, 'sha1': FileHash(path)}
+
+def SourcesMatch(keys: list, paths: list) -> bool:
+    """Check that source files still match the keys stored in a snapshot.
+
+    Files whose size and mtime are unchanged are trusted without hashing. If
+    only the mtime changed (a touched or copied file), the content hash decides.
+    """
+    if len(keys) != len(paths):
+        return False
+    for key, path in zip(keys, paths):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if key['name'] != os.path.basename(path) or key['size'] != stat.st_size:
+            return False
+        if key['mtime_ns'] != stat.st_mtime_ns and key['sha1'] != FileHash(path):
+            return False
+    return True
+
+def WriteSnapshot(path: str, arrays: dict, sources: list, meta: dict = None):
+    """Write named arrays and source keys to a snapshot file.
+
+    The file is written under a temporary name and renamed into place, so
+    readers never see a partial snapshot.
+
+    Args:
+        path (str): Snapshot file to create or replace
+        arrays (dict): Name -> np.ndarray
+        sources (list): SourceKey dicts of the files the arrays were built from
+        meta (dict): Extra JSON-serializable header fields
+    """
+    arrays = {name: np.ascontiguousarray(a) for name, a in arrays.items()}
+    layout = {}
+    offset = 0
+    for name, a in arrays.items():
+        layout[name] = {'dtype': a.dtype.str, 'shape': list(a.shape), 'offset': offset}
+        offset += -(-a.nbytes // _ALIGNMENT) * _ALIGNMENT
+    header = json.dumps({'sources': sources, 'arrays': layout, 'meta': meta or {}}).encode('utf-8')
+    data_start = -(-(_PREAMBLE.size + len(header)) // _ALIGNMENT) * _ALIGNMENT
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(_PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(header)))
+            f.write(header)
+            for name, a in arrays.items():
+                f.seek(data_start + layout[name]['offset'])
+                f.write(a.tobytes())
+            f.truncate(data_start + offset)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def ReadSnapshot(path: str):
+    """Memory-map a snapshot file.
+
+    Returns:
+        tuple: (header dict, {name: read-only np.ndarray view of the file})
+
+    Raises:
+        ValueError: If the file is not a snapshot of the current format version
+    """
+    with open(path, 'rb') as f:
+        preamble = f.read(_PREAMBLE.size)
+        if len(preamble) < _PREAMBLE.size:
+            raise ValueError(f"'{path}' is not an airspace snapshot")
+        magic, version, header_length = _PREAMBLE.unpack(preamble)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"'{path}' is not an airspace snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"'{path}' has snapshot version {version}, expected {SNAPSHOT_VERSION}")
+        header = json.loads(f.read(header_length).decode('utf-8'))
+    data_start = -(-(_PREAMBLE.size + header_length) // _ALIGNMENT) * _ALIGNMENT
+
+    buffer = np.memmap(path, dtype=np.uint8, mode='r')
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        dtype = np.dtype(spec['dtype'])
+        count = int(np.prod(spec['shape'], dtype=np.int64))
+        start = data_start + spec['offset']
+        raw = buffer[start:start + count * dtype.itemsize]
+        arrays[name] = raw.view(dtype).reshape(spec['shape'])
+    return header, arrays
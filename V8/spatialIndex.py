@@ -0,0 +1,221 @@
+"""Uniform-grid spatial index for nearest-point, radius and box queries.
+
+SpatialIndex works on plain coordinates (the x/y plane of the simple Graph).
+GeoIndex stores latitude/longitude points as 3D unit vectors, so distances
+are chord lengths that convert exactly to great-circle kilometers.
+"""
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0  # Same radius as navPoint.Distance
+
+class SpatialIndex:
+    def __init__(self, coords: np.ndarray, points_per_cell: float = 4.0, intrinsic_dim: int = None):
+        """Bucket points into a uniform grid of cells.
+
+        Args:
+            coords (np.ndarray): (N, D) array of point coordinates
+            points_per_cell (float): Target average number of points per cell
+            intrinsic_dim (int): Dimension of the set the points lie on (2 for
+                points on a sphere in 3D); defaults to D
+        """
+        self.coords = np.ascontiguousarray(coords, dtype=np.float64)
+        n, dims = self.coords.shape
+        self.dims = dims
+        self.lower = self.coords.min(axis=0) if n else np.zeros(dims)
+        extent = float((self.coords.max(axis=0) - self.lower).max()) if n else 1.0
+        intrinsic_dim = intrinsic_dim or dims
+        cells_per_side = max(1.0, (n / points_per_cell) ** (1.0 / intrinsic_dim))
+        self.cell = extent / cells_per_side if extent > 0 else 1.0
+        self.shape = np.floor((self.coords.max(axis=0) - self.lower) / self.cell).astype(np.int64) + 1 \
+            if n else np.ones(dims, dtype=np.int64)
+
+        keys = self._keys(self._cells(self.coords))
+        self.order = np.argsort(keys, kind='stable')  # Point indices grouped by cell
+        self.cell_keys, self.cell_starts = np.unique(keys[self.order], return_index=True)
+        self.cell_ends = np.append(self.cell_starts[1:], n)
+        self._cell_coords = None  # Grid coordinates of the occupied cells, decoded on first use
+
+    def __len__(self):
+        return len(self.coords)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in (self.coords, self.order, self.cell_keys, self.cell_starts, self.cell_ends))
+
+    def _cells(self, coords: np.ndarray) -> np.ndarray:
+        return np.floor((coords - self.lower) / self.cell).astype(np.int64)
+
+    def _keys(self, cells: np.ndarray) -> np.ndarray:
+        keys = np.zeros(len(cells), dtype=np.int64)
+        for d in range(self.dims):
+            keys = keys * self.shape[d] + cells[:, d]
+        return keys
+
+    def _occupied_cells(self) -> np.ndarray:
+        """Cached (cells, D) grid coordinates of the cells holding points, in key order."""
+        if self._cell_coords is None:
+            keys = self.cell_keys.copy()
+            cells = np.zeros((len(keys), self.dims), dtype=np.int64)
+            for d in reversed(range(self.dims)):
+                cells[:, d] = keys % self.shape[d]
+                keys //= self.shape[d]
+            self._cell_coords = cells
+        return self._cell_coords
+
+    def _box_cells(self, low: np.ndarray, high: np.ndarray):
+        """First and last grid cell overlapping the box [low, high], clipped to the grid."""
+        first = np.maximum(self._cells(low[None, :])[0], 0)
+        last = np.minimum(self._cells(high[None, :])[0], self.shape - 1)
+        return first, last
+
+    def _points_in(self, pos: np.ndarray) -> np.ndarray:
+        """Indices of the points of the occupied cells at positions pos of cell_keys."""
+        starts, ends = self.cell_starts[pos], self.cell_ends[pos]
+        counts = ends - starts
+        rows = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+        return self.order[rows]
+
+    def _candidates(self, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+        """Indices of the points in all grid cells overlapping the box [low, high]."""
+        first, last = self._box_cells(low, high)
+        if (last < first).any() or not len(self.cell_keys):
+            return np.zeros(0, dtype=np.int64)
+        if np.prod((last - first + 1).astype(np.float64)) > len(self.cell_keys):
+            # More cells in the box than occupied cells: filter the occupied ones
+            cells = self._occupied_cells()
+            pos = np.flatnonzero(((cells >= first) & (cells <= last)).all(axis=1))
+        else:
+            axes = [np.arange(a, b + 1) for a, b in zip(first, last)]
+            cells = np.stack(np.meshgrid(*axes, indexing='ij'), axis=-1).reshape(-1, self.dims)
+            keys = self._keys(cells)
+            pos = np.minimum(np.searchsorted(self.cell_keys, keys), len(self.cell_keys) - 1)
+            pos = pos[self.cell_keys[pos] == keys]  # Only cells holding points
+        return self._points_in(pos)
+
+    def _nearest_by_cells(self, point: np.ndarray, k: int):
+        """k nearest points by ranking the occupied cells on their distance to the point.
+
+        Used when the search box would hold more cells than are occupied (far
+        queries and sparse, clustered data): only the cells that can hold one
+        of the k nearest points are scanned.
+        """
+        low = self.lower + self._occupied_cells() * self.cell
+        gap = np.maximum(np.maximum(low - point, point - (low + self.cell)), 0)
+        bounds = np.sqrt((gap ** 2).sum(axis=1))  # No point of a cell is nearer than this
+        order = np.argsort(bounds)
+        # The nearest cells holding k points bound the k-th distance from above
+        counts = np.cumsum((self.cell_ends - self.cell_starts)[order])
+        enough = order[:int(np.searchsorted(counts, k)) + 1]
+        candidates = self._points_in(enough)
+        distances = np.sqrt(((self.coords[candidates] - point) ** 2).sum(axis=1))
+        kth = np.partition(distances, k - 1)[k - 1]
+        candidates = self._points_in(np.flatnonzero(bounds <= kth))
+        distances = np.sqrt(((self.coords[candidates] - point) ** 2).sum(axis=1))
+        return self._k_smallest(candidates, distances, k)
+
+    def _k_smallest(self, candidates: np.ndarray, distances: np.ndarray, k: int):
+        """The k nearest candidates, sorted; only they and their ties are sorted."""
+        keep = distances <= np.partition(distances, k - 1)[k - 1]
+        indices, distances = self._sorted(candidates[keep], distances[keep])
+        return indices[:k], distances[:k]
+
+    def _sorted(self, indices: np.ndarray, distances: np.ndarray):
+        """Sort by distance, ties broken by the lower point index."""
+        order = np.lexsort((indices, distances))
+        return indices[order], distances[order]
+
+    def within_radius(self, point, radius: float):
+        """Return (indices, distances) of the points at most radius away, nearest first."""
+        point = np.asarray(point, dtype=np.float64)
+        candidates = self._candidates(point - radius, point + radius)
+        distances = np.sqrt(((self.coords[candidates] - point) ** 2).sum(axis=1))
+        keep = distances <= radius
+        return self._sorted(candidates[keep], distances[keep])
+
+    def nearest(self, point, k: int = 1):
+        """Return (indices, distances) of the k nearest points, nearest first."""
+        point = np.asarray(point, dtype=np.float64)
+        k = min(k, len(self.coords))
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        # Distance from the point to the grid, so the first search box is never empty
+        outside = np.maximum(np.maximum(self.lower - point, point - (self.lower + self.shape * self.cell)), 0)
+        radius = float(np.sqrt((outside ** 2).sum())) + self.cell
+        while True:
+            first, last = self._box_cells(point - radius, point + radius)
+            if np.prod((last - first + 1).astype(np.float64)) > len(self.cell_keys):
+                return self._nearest_by_cells(point, k)
+            candidates = self._candidates(point - radius, point + radius)
+            if len(candidates) >= k:
+                distances = np.sqrt(((self.coords[candidates] - point) ** 2).sum(axis=1))
+                # The box contains the whole ball of this radius, so the result is exact
+                if np.partition(distances, k - 1)[k - 1] <= radius:
+                    return self._k_smallest(candidates, distances, k)
+            radius *= 2
+
+    def in_box(self, low, high) -> np.ndarray:
+        """Return the sorted indices of the points inside the box [low, high]."""
+        low, high = np.asarray(low, dtype=np.float64), np.asarray(high, dtype=np.float64)
+        candidates = self._candidates(low, high)
+        coords = self.coords[candidates]
+        inside = ((coords >= low) & (coords <= high)).all(axis=1)
+        return np.sort(candidates[inside])
+
+def UnitVectors(latitudes, longitudes) -> np.ndarray:
+    """Convert latitudes/longitudes in degrees to an (N, 3) array of unit vectors."""
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=1)
+
+def _chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, chord / 2))
+
+def _km_to_chord(km: float) -> float:
+    return 2 * np.sin(min(km / EARTH_RADIUS_KM, np.pi) / 2)
+
+class GeoIndex:
+    def __init__(self, latitudes, longitudes, points_per_cell: float = 4.0):
+        """Spatial index over geographic points with great-circle distances in km.
+
+        Args:
+            latitudes: Point latitudes in degrees
+            longitudes: Point longitudes in degrees
+            points_per_cell (float): Target average number of points per grid cell
+        """
+        self.latitudes = np.asarray(latitudes, dtype=np.float64)
+        self.longitudes = np.asarray(longitudes, dtype=np.float64)
+        self.grid = SpatialIndex(UnitVectors(self.latitudes, self.longitudes), points_per_cell, intrinsic_dim=2)
+        self.lat_order = np.argsort(self.latitudes, kind='stable')  # For box queries
+
+    def __len__(self):
+        return len(self.latitudes)
+
+    @property
+    def nbytes(self) -> int:
+        return self.grid.nbytes + self.lat_order.nbytes
+
+    def nearest(self, latitude: float, longitude: float, k: int = 1):
+        """Return (indices, distances_km) of the k points nearest to a position."""
+        indices, chords = self.grid.nearest(UnitVectors([latitude], [longitude])[0], k)
+        return indices, _chord_to_km(chords)
+
+    def within_radius(self, latitude: float, longitude: float, radius_km: float):
+        """Return (indices, distances_km) of the points at most radius_km away, nearest first."""
+        indices, chords = self.grid.within_radius(UnitVectors([latitude], [longitude])[0], _km_to_chord(radius_km))
+        return indices, _chord_to_km(chords)
+
+    def in_box(self, lat_min: float, lat_max: float, lon_min: float, lon_max: float) -> np.ndarray:
+        """Return the sorted indices of the points inside a latitude/longitude box.
+
+        If lon_min > lon_max the box is taken to cross the antimeridian.
+        """
+        sorted_lats = self.latitudes[self.lat_order]
+        start = np.searchsorted(sorted_lats, lat_min, side='left')
+        end = np.searchsorted(sorted_lats, lat_max, side='right')
+        candidates = self.lat_order[start:end]
+        lons = self.longitudes[candidates]
+        if lon_min <= lon_max:
+            inside = (lons >= lon_min) & (lons <= lon_max)
+        else:
+            inside = (lons >= lon_min) | (lons <= lon_max)
+        return np.sort(candidates[inside])
@@ -2,6 +2,15 @@ from airSpace import AirSpace
 import matplotlib.pyplot as plt
 import os
 
+def _load_catalonia():
+    """Load the Catalonia airspace from its text files without writing a snapshot."""
+    airspace = AirSpace(name="Catalunya")
+    base_dir = os.path.join(os.path.dirname(__file__), "airspace_catalonia")
+    assert airspace.load_data(os.path.join(base_dir, "Cat_nav.txt"),
+                              os.path.join(base_dir, "Cat_seg.txt"),
+                              os.path.join(base_dir, "Cat_aer.txt"), use_snapshot=False)
+    return airspace
+
 def test_catalonia_airspace():
     """Test loading and visualizing Catalunya's airspace data."""
     # Create airspace instance
@@ -15,7 +24,7 @@ def test_catalonia_airspace():
     
     # Load data
     print("Loading Catalunya airspace data...")
-    success = airspace.load_data(nav_file, seg_file, aer_file)
+    success = airspace.load_data(nav_file, seg_file, aer_file, use_snapshot=False)
     assert success, "Failed to load airspace data"
     
     # Print statistics
@@ -72,6 +81,506 @@ def test_catalonia_airspace():
     
     print("\nAll tests passed successfully!")
 
+def test_airspace_indexes():
+    """Test that the lookup indexes agree with the lists and follow mutations."""
+    from navPoint import NavPoint
+    from navSegment import NavSegment
+    from navAirport import NavAirport
+    
+    airspace = _load_catalonia()
+    
+    # Indexed lookups must match the lists
+    for point in airspace.nav_points:
+        assert airspace.get_nav_point(point.number) is point
+        assert airspace.get_nav_point_by_name(point.name) is point
+        expected = [seg for seg in airspace.nav_segments if seg.origin_number == point.number]
+        assert airspace.get_segments_from(point.number) == expected
+        expected = [seg for seg in airspace.nav_segments if seg.destination_number == point.number]
+        assert airspace.get_segments_to(point.number) == expected
+    assert airspace.get_nav_point(-1) is None
+    assert airspace.get_airport("XXXX") is None
+    
+    # Mutations keep the indexes consistent
+    first = airspace.nav_points[0]
+    new_point = NavPoint(999999, "TESTPT", 41.0, 2.0)
+    assert airspace.add_nav_point(new_point)
+    assert not airspace.add_nav_point(NavPoint(999999, "DUP", 0.0, 0.0))
+    assert airspace.get_nav_point(999999) is new_point
+    
+    segment = NavSegment(first.number, 999999, 10.0)
+    assert airspace.add_segment(segment)
+    assert not airspace.add_segment(NavSegment(first.number, 123456789, 1.0))
+    assert segment in airspace.get_segments_from(first.number)
+    assert airspace.get_segments_to(999999) == [segment]
+    assert new_point in first.neighbors
+    
+    assert airspace.remove_segment(NavSegment(first.number, 999999, 0.0))
+    assert airspace.get_segments_to(999999) == []
+    assert segment not in airspace.nav_segments
+    assert not airspace.remove_segment(segment)
+    
+    assert airspace.add_airport(NavAirport("TEST", "Test", 41.0, 2.0, 0.0))
+    assert not airspace.add_airport(NavAirport("TEST", "Dup", 0.0, 0.0, 0.0))
+    assert airspace.get_airport("TEST").name == "Test"
+    print("Airspace index tests passed!")
+
+def test_load_segments_unresolved():
+    """Test that segments with unknown end points are skipped and the rest are linked."""
+    import tempfile
+    from navPoint import NavPoint
+    from navSegment import LoadNavSegments
+    
+    points = [NavPoint(1, "A", 41.0, 2.0), NavPoint(2, "B", 41.5, 2.5)]
+    with tempfile.TemporaryDirectory() as directory:
+        seg_file = os.path.join(directory, "seg.txt")
+        with open(seg_file, 'w') as f:
+            f.write("1 2 70.0\n2 1 70.0\n1 3 5.0\n4 5 1.0\n")
+        segments = LoadNavSegments(seg_file, points)
+    
+    assert [(s.origin_number, s.destination_number) for s in segments] == [(1, 2), (2, 1)]
+    assert segments[0].origin is points[0] and segments[0].destination is points[1]
+    assert points[0].neighbors == [points[1]]
+    print("Segment loading tests passed!")
+
+def test_nav_store():
+    """Test the columnar store against the object lists it is built from."""
+    airspace = _load_catalonia()
+    store = airspace.get_store()
+    assert len(store) == len(airspace.nav_points)
+    assert store.num_segments == len(airspace.nav_segments)
+    
+    for i, point in enumerate(airspace.nav_points):
+        view = store.point(i)
+        assert view == point
+        assert (view.number, view.name, view.latitude, view.longitude) == \
+            (point.number, point.name, point.latitude, point.longitude)
+        assert [n.number for n in view.neighbors] == [n.number for n in point.neighbors]
+    assert store.get_point(-5) is None
+    
+    for k, segment in enumerate(airspace.nav_segments):
+        assert store.numbers[store.seg_origins[k]] == segment.origin_number
+        assert store.numbers[store.seg_destinations[k]] == segment.destination_number
+        assert store.seg_distances[k] == segment.distance
+    
+    # The store is rebuilt after a mutation
+    from navPoint import NavPoint
+    airspace.add_nav_point(NavPoint(999999, "TESTPT", 41.0, 2.0))
+    assert airspace.get_store() is not store
+    assert airspace.get_store().get_point(999999).name == "TESTPT"
+    print("Nav store tests passed!")
+
+def test_csr_graph():
+    """Test the compiled CSR graph against the segment lists."""
+    from navSegment import NavSegment
+    
+    airspace = _load_catalonia()
+    graph = airspace.get_graph()
+    store = airspace.get_store()
+    assert graph is airspace.get_graph()  # Cached
+    assert graph.num_nodes == len(store) and graph.num_edges == len(airspace.nav_segments)
+    
+    for i, point in enumerate(airspace.nav_points):
+        targets, weights = graph.neighbors(i)
+        expected = airspace.get_segments_from(point.number)
+        assert [store.numbers[t] for t in targets] == [s.destination_number for s in expected]
+        assert list(weights) == [s.distance for s in expected]
+        sources, _ = graph.predecessors(i)
+        assert sorted(store.numbers[s] for s in sources) == \
+            sorted(s.origin_number for s in airspace.get_segments_to(point.number))
+    
+    # Changing the segments invalidates the cached graph
+    first, last = airspace.nav_points[0], airspace.nav_points[-1]
+    airspace.add_segment(NavSegment(first.number, last.number, 1.0))
+    new_graph = airspace.get_graph()
+    assert new_graph is not graph and new_graph.num_edges == graph.num_edges + 1
+    assert new_graph.edge_weight(0, len(store) - 1) == 1.0
+    print("CSR graph tests passed!")
+
+def test_spatial_index():
+    """Test nearest, radius and box queries against a scan over all points."""
+    import random
+    from navPoint import NavPoint, Distance
+    from flightPlan import LoadFlightPlan, SnapFlightPlan
+    
+    airspace = _load_catalonia()
+    rng = random.Random(1)
+    for _ in range(50):
+        lat, lon = rng.uniform(39, 44), rng.uniform(-1, 5)
+        target = NavPoint(0, "", lat, lon)
+        by_distance = sorted(((Distance(p, target), i) for i, p in enumerate(airspace.nav_points)))
+        nearest = airspace.find_nearest(lat, lon, 5)
+        assert [p for p, _ in nearest] == [airspace.nav_points[i] for _, i in by_distance[:5]]
+        assert all(abs(d - e) < 1e-6 for (_, d), (e, _) in zip(nearest, by_distance))
+        assert airspace.get_closest(lat, lon) is airspace.nav_points[by_distance[0][1]]
+        
+        radius = rng.uniform(5, 60)
+        within = airspace.find_within(lat, lon, radius)
+        assert [p for p, _ in within] == [airspace.nav_points[i] for d, i in by_distance if d <= radius]
+        
+        box = airspace.find_in_box(lat, lat + 0.5, lon, lon + 0.7)
+        assert box == [p for p in airspace.nav_points
+                       if lat <= p.latitude <= lat + 0.5 and lon <= p.longitude <= lon + 0.7]
+    
+    # Tight clusters leave most grid cells empty; far queries scan only occupied cells
+    import numpy as np
+    from spatialIndex import GeoIndex, UnitVectors
+    gen = np.random.default_rng(2)
+    lats = np.concatenate([gen.normal(41, 0.05, 10000), gen.normal(60, 0.05, 10000)])
+    lons = np.concatenate([gen.normal(2, 0.05, 10000), gen.normal(25, 0.05, 10000)])
+    clustered = GeoIndex(lats, lons)
+    for lat, lon in ((41, 2), (50, 12), (-30, -60), (0, 100), (89, 0)):
+        chords = ((UnitVectors(lats, lons) - UnitVectors([lat], [lon])[0]) ** 2).sum(axis=1)
+        indices, _ = clustered.nearest(lat, lon, 7)
+        assert list(indices) == list(np.lexsort((np.arange(len(lats)), chords))[:7])
+    
+    # The index follows changes to the airspace
+    index = airspace.get_spatial_index()
+    assert index is airspace.get_spatial_index()
+    new_point = NavPoint(999999, "NEW", 10.0, 10.0)
+    airspace.add_nav_point(new_point)
+    assert airspace.get_spatial_index() is not index
+    assert airspace.get_closest(10.1, 10.1) is new_point
+    
+    # Flight plan waypoints snap to the closest navigation point
+    waypoints = LoadFlightPlan(os.path.join(os.path.dirname(__file__), "Flightplan.txt"))
+    assert [w.label for w in waypoints][0] == "Departure" and len(waypoints) == 6
+    assert SnapFlightPlan(airspace, waypoints) == []
+    for waypoint in waypoints:
+        assert waypoint.nav_point is airspace.get_closest(waypoint.latitude, waypoint.longitude)
+    assert SnapFlightPlan(airspace, waypoints, max_distance=0.001) == waypoints
+    print("Spatial index tests passed!")
+
+def test_snapshot():
+    """Test that snapshots reproduce the parsed airspace and follow source changes."""
+    import shutil
+    import tempfile
+    from snapshot import SnapshotPath
+    
+    def contents(airspace):
+        return ([(p.number, p.name, p.latitude, p.longitude, [n.number for n in p.neighbors])
+                 for p in airspace.nav_points],
+                [(s.origin_number, s.destination_number, s.distance, s.origin.number, s.destination.number)
+                 for s in airspace.nav_segments],
+                [(a.icao, a.name, a.latitude, a.longitude, a.sids, a.stars,
+                  a.nav_point.number if a.nav_point else None) for a in airspace.nav_airports])
+    
+    base_dir = os.path.join(os.path.dirname(__file__), "airspace_catalonia")
+    with tempfile.TemporaryDirectory() as directory:
+        files = []
+        for name in ("Cat_nav.txt", "Cat_seg.txt", "Cat_aer.txt"):
+            shutil.copy(os.path.join(base_dir, name), directory)
+            files.append(os.path.join(directory, name))
+        snapshot_path = SnapshotPath(files[0])
+        
+        parsed = AirSpace(name="Catalunya")
+        assert parsed.load_data(*files)
+        assert os.path.exists(snapshot_path)
+        
+        cached = AirSpace(name="Catalunya")
+        assert cached.load_data(*files)
+        assert contents(cached) == contents(parsed)
+        assert cached.get_store() is cached._store  # Store comes straight from the snapshot
+        assert list(cached.get_store().names) == list(parsed.get_store().names)
+        assert cached.get_graph().num_edges == parsed.get_graph().num_edges
+        
+        # Touching a file without changing it keeps the snapshot (the hash matches)
+        stamp = os.stat(snapshot_path).st_mtime_ns
+        os.utime(files[1], ns=(stamp + 10**9, stamp + 10**9))
+        assert AirSpace().load_data(*files)
+        assert os.stat(snapshot_path).st_mtime_ns == stamp
+        
+        # Changing a source invalidates it
+        first_point = parsed.nav_points[0]
+        with open(files[0], 'a') as f:
+            f.write(f"999999 NEWPT {first_point.latitude} {first_point.longitude}\n")
+        reloaded = AirSpace()
+        assert reloaded.load_data(*files)
+        assert reloaded.get_nav_point(999999) is not None
+        assert len(reloaded.nav_points) == len(parsed.nav_points) + 1
+        
+        # A damaged snapshot is ignored and rewritten
+        with open(snapshot_path, 'wb') as f:
+            f.write(b"garbage")
+        damaged = AirSpace()
+        assert damaged.load_data(*files)
+        assert contents(damaged) == contents(reloaded)
+        assert AirSpace().load_data(*files)
+    print("Snapshot tests passed!")
+
+def test_mapped_airspace():
+    """Test that an airspace file opens without building objects and answers like the parsed one."""
+    import tempfile
+    from routing import FindRoute
+    from navSegment import NavSegment
+    
+    base_dir = os.path.join(os.path.dirname(__file__), "ECAC airspace")
+    parsed = AirSpace(name="Europe")
+    assert parsed.load_data(os.path.join(base_dir, "ECAC_nav.txt"), os.path.join(base_dir, "ECAC_seg.txt"),
+                            os.path.join(base_dir, "ECAC_aer.txt"), use_snapshot=False)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "ecac.airspace")
+        assert parsed.save(path)
+        mapped = AirSpace.open(path)
+        assert mapped.name == "Europe"
+        
+        # Store, graph and statistics come from the mapped sections
+        assert mapped._mapped is not None
+        assert mapped.get_statistics() == parsed.get_statistics()
+        graph, parsed_graph = mapped.get_graph(), parsed.get_graph()
+        for name, values in parsed_graph.arrays().items():
+            assert (graph.arrays()[name] == values).all()
+        numbers = [p.number for p in parsed.nav_points]
+        for origin, destination in zip(numbers[::37], numbers[::-41]):
+            assert FindRoute(mapped, origin, destination).distance == FindRoute(parsed, origin, destination).distance
+        assert mapped.get_reachable(numbers[0]).sum() == parsed.get_reachable(numbers[0]).sum()
+        assert mapped.get_store().index_of(numbers[5]) == 5
+        assert mapped._mapped is not None
+        
+        # The object API builds the objects once, keeping the mapped store and graph
+        point = mapped.get_nav_point(numbers[3])
+        assert mapped._mapped is None and point is mapped.nav_points[3]
+        assert [n.number for n in point.neighbors] == [n.number for n in parsed.nav_points[3].neighbors]
+        assert [a.get_sids() for a in mapped.nav_airports] == [a.get_sids() for a in parsed.nav_airports]
+        assert mapped.get_graph() is graph
+        
+        # Changes still invalidate the mapped data
+        assert mapped.add_segment(NavSegment(numbers[0], numbers[1], 1.0))
+        assert mapped.get_graph() is not graph
+        assert mapped.get_graph().num_edges == graph.num_edges + 1
+        
+        with open(os.path.join(directory, "bad.airspace"), 'wb') as f:
+            f.write(b"not an airspace")
+        try:
+            AirSpace.open(os.path.join(directory, "bad.airspace"))
+            assert False, "Expected ValueError"
+        except ValueError:
+            pass
+    print("Mapped airspace tests passed!")
+
+def test_bulk_parser():
+    """Test that the bulk parser matches the line loaders and reports malformed lines."""
+    from bulkParser import ParseColumns, ParseNavPoints, ParseNavSegments
+    from navPoint import LoadNavPoints
+    from navSegment import LoadNavSegments
+    
+    base_dir = os.path.join(os.path.dirname(__file__), "airspace_catalonia")
+    nav_file, seg_file = os.path.join(base_dir, "Cat_nav.txt"), os.path.join(base_dir, "Cat_seg.txt")
+    points = LoadNavPoints(nav_file)
+    columns, report = ParseNavPoints(nav_file)
+    assert report.ok and report.lines == len(points)
+    assert columns['numbers'].tolist() == [p.number for p in points]
+    assert list(columns['names']) == [p.name for p in points]
+    assert columns['latitudes'].tolist() == [p.latitude for p in points]
+    assert columns['longitudes'].tolist() == [p.longitude for p in points]
+    
+    segments = LoadNavSegments(seg_file, points)
+    columns, report = ParseNavSegments(seg_file)
+    assert report.ok
+    assert list(zip(columns['origins'].tolist(), columns['destinations'].tolist(),
+                    columns['distances'].tolist())) == \
+        [(s.origin_number, s.destination_number, s.distance) for s in segments]
+
+    # load_data builds the store from the parsed columns; it matches the objects
+    from navStore import NavStore
+    airspace = _load_catalonia()
+    store = airspace.get_store()
+    rebuilt = NavStore.from_objects(airspace.nav_points, airspace.nav_segments, airspace.nav_airports)
+    for name in ('numbers', 'latitudes', 'longitudes', 'seg_origins', 'seg_destinations', 'seg_distances',
+                 'airport_points', 'names', 'airport_icaos'):
+        assert list(getattr(store, name)) == list(getattr(rebuilt, name)), name
+
+    data = (b"# comment\n1 A 41.5 2\n\n2 B 1e1 -.25\n3 C x 1\n4 D 1 2 3\n"
+            b"5.5 E 1 1\r\n6 F +7 -0.000001\n12345678901234567 G 1.23456789012345678 1")
+    (numbers, names, lats, lons), report = ParseColumns(data, 'isff')
+    assert numbers.tolist() == [1, 2, 6, 12345678901234567]
+    assert list(names) == ["A", "B", "F", "G"]
+    assert lats.tolist() == [41.5, 10.0, 7.0, 1.23456789012345678]
+    assert lons.tolist() == [2.0, -0.25, -0.000001, 1.0]
+    assert [(line, reason.split()[0]) for line, _, reason in report.errors] == \
+        [(5, "invalid"), (6, "expected"), (7, "invalid")]
+    assert report.errors[0][1] == "3 C x 1" and report.lines == 4
+    
+    columns, report = ParseNavPoints(os.path.join(base_dir, "missing.txt"))
+    assert len(columns['numbers']) == 0 and len(columns['names']) == 0
+    
+    # Files with decimal points but no complete line parse as empty
+    (numbers, names, lats, lons), report = ParseColumns(b"# exported 2.1\n1 A 2.5\n", 'isff')
+    assert len(numbers) == 0 and len(lats) == 0 and len(report.errors) == 1
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        header_only = os.path.join(directory, "nav.txt")
+        with open(header_only, "w") as f:
+            f.write("# exported 2.1\n")
+        assert LoadNavPoints(header_only) == []
+    print("Bulk parser tests passed!")
+
+def test_load_archive():
+    """Test loading from zip/tar archives, compressed files and file objects."""
+    import gzip
+    import io
+    import shutil
+    import tarfile
+    import tempfile
+    from navPoint import LoadNavPoints
+    from bulkParser import ParseNavPoints
+    from snapshot import SnapshotPath
+    
+    def contents(airspace):
+        return ([(p.number, p.name, p.latitude, p.longitude, [n.number for n in p.neighbors])
+                 for p in airspace.nav_points],
+                [(s.origin_number, s.destination_number, s.distance) for s in airspace.nav_segments],
+                [(a.icao, a.sids, a.stars) for a in airspace.nav_airports])
+    
+    base_dir = os.path.join(os.path.dirname(__file__), "airspace_catalonia")
+    names = ("Cat_nav.txt", "Cat_seg.txt", "Cat_aer.txt")
+    files = [os.path.join(base_dir, name) for name in names]
+    expected = _load_catalonia()
+    with tempfile.TemporaryDirectory() as directory:
+        # Spain ships as a zip; its members are parsed without extraction
+        zip_path = os.path.join(directory, "Spain_graph.zip")
+        shutil.copy(os.path.join(os.path.dirname(__file__), "Airspace Spain", "Spain_graph.zip"), zip_path)
+        spain = AirSpace(name="España")
+        assert spain.load_archive(zip_path)
+        assert len(spain.nav_points) > 0 and len(spain.nav_segments) > 0 and len(spain.nav_airports) > 0
+        assert sorted(os.listdir(directory)) == ["Spain_graph.snapshot", "Spain_graph.zip"]  # Nothing extracted
+        cached = AirSpace(name="España")
+        assert cached.load_archive(zip_path) and cached._mapped is not None
+        assert contents(cached) == contents(spain)
+        
+        tar_path = os.path.join(directory, "Cat.tar.xz")
+        with tarfile.open(tar_path, 'w:xz') as archive:
+            for name, path in zip(names, files):
+                archive.add(path, arcname=f"catalonia/{name}")
+        airspace = AirSpace()
+        assert airspace.load_archive(tar_path)
+        assert contents(airspace) == contents(expected)
+        assert SnapshotPath(tar_path) == os.path.join(directory, "Cat.snapshot")
+        
+        gz_files = []
+        for path in files:
+            gz_files.append(os.path.join(directory, os.path.basename(path) + ".gz"))
+            with open(path, 'rb') as src, gzip.open(gz_files[-1], 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+        airspace = AirSpace()
+        assert airspace.load_data(*gz_files)
+        assert contents(airspace) == contents(expected)
+        assert os.path.exists(os.path.join(directory, "Cat_nav.snapshot"))
+        
+        assert not AirSpace().load_archive(files[0])  # Not an archive
+    
+    with open(files[0], 'rb') as f:
+        data = f.read()
+    points = LoadNavPoints(io.BytesIO(data))
+    assert [(p.number, p.name) for p in points] == [(p.number, p.name) for p in expected.nav_points]
+    columns, report = ParseNavPoints(io.BytesIO(data))
+    assert report.ok and columns['numbers'].tolist() == [p.number for p in points]
+    airspace = AirSpace()
+    with open(files[0]) as nav, open(files[1]) as seg, open(files[2]) as aer:
+        assert airspace.load_data(nav, seg, aer)
+    assert contents(airspace) == contents(expected)
+    print("Archive loading tests passed!")
+
+def test_load_progress():
+    """Test that loads report their phases and lines and can be cancelled midway."""
+    from loadProgress import LoadProgress, LoadCancelled
+    
+    class RecordingProgress(LoadProgress):
+        def __init__(self, cancel_after=None):
+            super().__init__()
+            self.phases = []
+            self.cancel_after = cancel_after
+        
+        def start_phase(self, phase):
+            super().start_phase(phase)
+            self.phases.append(phase)
+        
+        def advance(self, lines=1):
+            if self.cancel_after is not None and self.lines >= self.cancel_after:
+                self.cancel()
+            super().advance(lines)
+    
+    base_dir = os.path.join(os.path.dirname(__file__), "airspace_catalonia")
+    files = [os.path.join(base_dir, name) for name in ("Cat_nav.txt", "Cat_seg.txt", "Cat_aer.txt")]
+    line_counts = []
+    for path in files:
+        with open(path) as f:
+            line_counts.append(sum(1 for _ in f))
+    line_count = sum(line_counts)
+    
+    progress = RecordingProgress()
+    assert AirSpace().load_data(*files, use_snapshot=False, progress=progress)
+    assert progress.phases == ["Parsing navigation points", "Parsing segments", "Parsing airports",
+                               "Building indexes"]
+    assert progress.lines == line_count and "lines read" in str(progress)
+    
+    # Text files are parsed whole, so the first chance to cancel comes after the nav file
+    progress = RecordingProgress(cancel_after=line_counts[0])
+    airspace = AirSpace()
+    try:
+        airspace.load_data(*files, use_snapshot=False, progress=progress)
+        assert False, "Load should have been cancelled"
+    except LoadCancelled:
+        pass
+    assert progress.cancelled and progress.phases[-1] == "Parsing segments"
+    print("Load progress tests passed!")
+
+def test_airspace_cache():
+    """Test the session cache: prefetching, LRU order and the memory budget."""
+    import shutil
+    import tempfile
+    from airspaceCache import AirspaceCache, Dataset
+    
+    base_dir = os.path.join(os.path.dirname(__file__), "airspace_catalonia")
+    names = ("Cat_nav.txt", "Cat_seg.txt", "Cat_aer.txt")
+    with tempfile.TemporaryDirectory() as directory:
+        datasets = {}
+        for region in ("A", "B", "C"):
+            os.makedirs(os.path.join(directory, region))
+            for name in names:
+                shutil.copy(os.path.join(base_dir, name), os.path.join(directory, region))
+            datasets[region] = Dataset(region, os.path.join(directory, region), files=names)
+        
+        cache = AirspaceCache(datasets)
+        futures = cache.prefetch(["A", "B"])
+        airspaces = [future.result(timeout=30) for future in futures]
+        assert all(airspace is not None for airspace in airspaces)
+        assert cache.names() == ["B", "A"]  # Prefetched entries go in as least recently used
+        assert cache.load("A") is airspaces[0] and cache.names() == ["B", "A"]
+        assert cache.get("B") is airspaces[1] and cache.names() == ["A", "B"]
+        assert cache.prefetch(["A", "B"]) == []  # Already cached
+        size = airspaces[0].memory_usage()
+        assert size > 0 and cache.memory_usage() == size + airspaces[1].memory_usage()
+        
+        # A budget for two airspaces evicts the least recently used one
+        cache.memory_budget = 2 * size + size // 2
+        loaded = cache.load("C")
+        assert loaded is not None and loaded.name == "C"
+        assert cache.names() == ["B", "C"]
+        
+        # A prefetch never displaces airspaces in use: it is the first to go
+        cache.memory_budget = cache.memory_usage()
+        assert cache.prefetch(["A"])[0].result(timeout=30) is not None
+        assert cache.names() == ["B", "C"]
+        
+        # The most recent airspace stays even if it alone exceeds the budget
+        cache.memory_budget = 0
+        cache.put("A", airspaces[0])
+        assert cache.names() == ["A"]
+        assert Dataset("Missing", directory, files=("x_nav.txt", "x_seg.txt", "x_aer.txt")).load() is None
+    print("Airspace cache tests passed!")
+
+def test_core_imports_without_matplotlib():
+    """Test that the non-plotting core modules do not import matplotlib, PIL or tkinter."""
+    import subprocess
+    import sys
+    code = ("import sys, graph, path, navPoint, navSegment, navAirport, airSpace, routing, airspaceCache\n"
+            "print(sorted({m.split('.')[0] for m in sys.modules} & {'matplotlib', 'PIL', 'tkinter'}))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]", result.stdout
+    print("Core import tests passed!")
+
 def test_spain_airspace():
     """Test loading and visualizing Spain's airspace data."""
     # Create airspace instance
@@ -90,7 +599,7 @@ def test_spain_airspace():
         
     # Load data
     print("\nLoading Spain airspace data...")
-    success = airspace.load_data(nav_file, seg_file, aer_file)
+    success = airspace.load_data(nav_file, seg_file, aer_file, use_snapshot=False)
     assert success, "Failed to load Spain airspace data"
     
     # Print statistics
@@ -139,7 +648,7 @@ def test_europe_airspace():
         
     # Load data
     print("\nLoading European airspace data...")
-    success = airspace.load_data(nav_file, seg_file, aer_file)
+    success = airspace.load_data(nav_file, seg_file, aer_file, use_snapshot=False)
     assert success, "Failed to load European airspace data"
     
     # Print statistics
@@ -174,6 +683,18 @@ if __name__ == "__main__":
     print("Testing Catalunya Airspace Implementation")
     print("=" * 40)
     test_catalonia_airspace()
+    test_airspace_indexes()
+    test_load_segments_unresolved()
+    test_nav_store()
+    test_csr_graph()
+    test_spatial_index()
+    test_snapshot()
+    test_mapped_airspace()
+    test_bulk_parser()
+    test_load_archive()
+    test_load_progress()
+    test_airspace_cache()
+    test_core_imports_without_matplotlib()
     
     print("\nTesting Spain Airspace Implementation")
     print("=" * 40)
@@ -0,0 +1,121 @@
+from cli import main, LoadAirspace
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+OPTIONS = ["--no-snapshot"]  # Leave the bundled data directories untouched
+
+def run(argv: list, stdin: str = "") -> list:
+    """Run the command line tool and return its JSON lines."""
+    out = io.StringIO()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        assert main(OPTIONS + ["--cache-dir", cache_dir] + argv, stdin=io.StringIO(stdin), stdout=out) == 0
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+def test_stats_and_neighbors():
+    stats, = run(["Catalunya", "stats"])
+    assert stats['name'] == "Catalunya" and stats['num_nav_points'] > 0 and stats['num_edges'] > 0
+    
+    records = run(["Catalunya", "neighbors", "6063", "IZA.D", "NOPE"])
+    assert records[0]['neighbors'] == records[1]['neighbors']  # Number and name of the same point
+    assert {n['name'] for n in records[0]['neighbors']} >= {"LAMPA", "MOLAR"}
+    assert records[2] == {'query': "NOPE", 'error': "Point NOPE not found"}
+    
+def test_shortest_path_batch():
+    # Batch from stdin, with a bad line in the middle that does not stop the batch
+    records = run(["Catalunya", "shortest-path", "--method", "dijkstra"],
+                  "# origin destination\n6063 6937\nonly-one\n\n6937 6063\n")
+    assert len(records) == 3
+    assert records[0]['found'] and records[0]['route'][0]['number'] == 6063
+    assert records[0]['route'][-1]['number'] == 6937 and records[0]['distance'] > 0
+    assert records[1] == {'query': "only-one", 'error': "expected 2 fields, got 1"}
+    assert records[2]['origin'] == "6937"
+    astar = run(["Catalunya", "shortest-path", "6063", "6937"])[0]
+    assert abs(astar['distance'] - records[0]['distance']) < 1e-9
+    alt = run(["Catalunya", "shortest-path", "6063", "6937", "--method", "alt"])[0]
+    assert abs(alt['distance'] - records[0]['distance']) < 1e-9
+    ch = run(["Catalunya", "shortest-path", "6063", "6937", "--method", "ch"])[0]
+    assert abs(ch['distance'] - records[0]['distance']) < 1e-9
+    for method in ("biastar", "bidijkstra"):
+        both = run(["Catalunya", "shortest-path", "6063", "6937", "--method", method])[0]
+        assert abs(both['distance'] - records[0]['distance']) < 1e-9
+    
+    # Same batch on a process pool, with an unknown point
+    pooled = run(["Catalunya", "shortest-path", "--workers", "2"],
+                 "6063 6937\nonly-one\n6063 NOWHERE\n6937 6063\n")
+    assert pooled[0] == dict(records[0], settled=pooled[0]['settled'])
+    assert pooled[1] == records[1] and pooled[2]['error'] == "Point NOWHERE not found"
+    assert pooled[3]['route'] == records[2]['route']
+    assert main(["Catalunya", "shortest-path", "--workers", "2", "--method", "ch"], stdout=io.StringIO()) == 2
+
+    # Piped queries are answered one by one, not when the window fills
+    import threading
+
+    class Written(io.StringIO):
+        def __init__(self):
+            super().__init__()
+            self.event = threading.Event()
+
+        def write(self, text):
+            count = super().write(text)
+            self.event.set()
+            return count
+
+    out = Written()
+    read_fd, write_fd = os.pipe()
+    with open(read_fd) as source:
+        thread = threading.Thread(target=main, args=(OPTIONS + ["Catalunya", "shortest-path", "--workers", "1"],),
+                                  kwargs={'stdin': source, 'stdout': out})
+        thread.start()
+        with open(write_fd, 'w') as sink:
+            sink.write("6063 6937\n")
+            sink.flush()
+            assert out.event.wait(60)  # Answered while stdin is still open
+        thread.join()
+    assert json.loads(out.getvalue())['route'] == records[0]['route']
+    
+def test_load_by_path_and_reachability():
+    nav_file = os.path.join(BASE_DIR, "airspace_catalonia", "Cat_nav.txt")
+    by_name = LoadAirspace("Catalunya", use_snapshot=False)
+    for spec in (nav_file, os.path.dirname(nav_file)):
+        assert len(LoadAirspace(spec, use_snapshot=False).get_store()) == len(by_name.get_store())
+    spain = LoadAirspace(os.path.join(BASE_DIR, "Airspace Spain", "Spain_graph.zip"), use_snapshot=False)
+    assert spain.get_graph().num_edges > 0
+    
+    one_hop, = run([nav_file, "reachability", "6063", "--max-hops", "1"])
+    everything, = run([nav_file, "reachability", "6063"])
+    assert 6063 in one_hop['reachable'] and one_hop['count'] == len(one_hop['reachable'])
+    assert set(one_hop['reachable']) <= set(everything['reachable'])
+    assert main(["no such airspace", "stats"], stdout=io.StringIO()) == 1
+    
+    # A missing --input file is reported, not raised
+    import contextlib
+    errors = io.StringIO()
+    with contextlib.redirect_stderr(errors):
+        status = main(OPTIONS + [nav_file, "neighbors", "--input", os.path.join(BASE_DIR, "no_such_queries.txt")],
+                      stdout=io.StringIO())
+    assert status == 2 and errors.getvalue().startswith("Error: ")
+    
+def test_no_tkinter():
+    # Run as a script: stdout must be pure JSON lines and tkinter never imported
+    code = ("import sys, runpy; sys.argv = ['cli.py', '--no-snapshot', 'Catalunya', 'stats']\n"
+            "try:\n    runpy.run_path('cli.py', run_name='__main__')\n"
+            "except SystemExit:\n    pass\n"
+            "assert 'tkinter' not in sys.modules and 'matplotlib' not in sys.modules")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=BASE_DIR)
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout)['name'] == "Catalunya"
+
+def run_all_tests():
+    test_stats_and_neighbors()
+    test_shortest_path_batch()
+    test_load_by_path_and_reachability()
+    test_no_tkinter()
+    print("All CLI tests passed!")
+
+if __name__ == "__main__":
+    run_all_tests()
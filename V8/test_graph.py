@@ -85,3 +85,73 @@ def CreateGraph_2():
     return G
 
 G2 = CreateGraph_2()
+
+def test_graph_indexes():
+    # Lookups by name and duplicate checks use the indexes
+    G3 = CreateGraph_2()
+    assert GetNodeByName(G, "D").name == "D"
+    assert GetNodeByName(G, "Z") is None
+    assert not AddNode(G3, G3.list_of_nodes[0])
+    
+    n = Node("M", 5, 5)
+    assert AddNode(G3, n) and GetNodeByName(G3, "M") is n
+    assert AddNeighbor(n, G3.list_of_nodes[0])
+    assert not AddNeighbor(n, G3.list_of_nodes[0])
+    assert n.list_of_neighbors == [G3.list_of_nodes[0]]
+    
+    # Nodes appended to the list directly are picked up as well
+    extra = Node("N", 7, 7)
+    G3.list_of_nodes.append(extra)
+    assert GetNodeByName(G3, "N") is extra
+    assert not AddNode(G3, extra)
+    
+    # So are nodes replaced in place and lists assigned as a whole
+    replaced = G3.list_of_nodes[2]
+    G3.list_of_nodes[2] = Node("Z", 9, 9)
+    assert GetNodeByName(G3, "Z") is G3.list_of_nodes[2]
+    assert GetNodeByName(G3, replaced.name) is None and AddNode(G3, replaced)
+    G3.list_of_nodes = [Node("Y", 1, 1)]
+    assert GetNodeByName(G3, "Y") is G3.list_of_nodes[0] and GetNodeByName(G3, "Z") is None
+    G3.list_of_nodes[0] = Node("X", 2, 2)
+    assert GetNodeByName(G3, "X") is G3.list_of_nodes[0]
+    print("Graph index tests passed!")
+
+def test_build_graph():
+    # The bulk builder produces the same graph as AddNode/AddSegment
+    names = [n.name for n in G.list_of_nodes]
+    xs = [n.coordinate_x for n in G.list_of_nodes]
+    ys = [n.coordinate_y for n in G.list_of_nodes]
+    seg_names = [s.name for s in G.list_of_segments]
+    origins = [s.origin_node.name for s in G.list_of_segments]
+    destinations = [s.destination_node.name for s in G.list_of_segments]
+    B = BuildGraph(names, xs, ys, seg_names, origins, destinations)
+    
+    assert [n.name for n in B.list_of_nodes] == names
+    assert [(s.name, s.cost) for s in B.list_of_segments] == [(s.name, s.cost) for s in G.list_of_segments]
+    for node in G.list_of_nodes:
+        built = GetNodeByName(B, node.name)
+        assert [n.name for n in built.list_of_neighbors] == [n.name for n in node.list_of_neighbors]
+    print("Build graph tests passed!")
+
+def test_get_closest():
+    # The grid index gives the same node as a scan, ties going to the first node
+    import random
+    rng = random.Random(3)
+    for _ in range(200):
+        x, y = rng.uniform(-5, 25), rng.uniform(-5, 25)
+        distances = [((n.coordinate_x - x) ** 2 + (n.coordinate_y - y) ** 2) ** 0.5 for n in G.list_of_nodes]
+        assert GetClosest(G, x, y) is G.list_of_nodes[distances.index(min(distances))]
+    assert GetClosest(G, 1, 20) is GetNodeByName(G, "A")
+    
+    # Nodes added later are found as well
+    n = Node("FAR", 100, 100)
+    AddNode(G, n)
+    assert GetClosest(G, 99, 99) is n
+    G.list_of_nodes.remove(n)
+    assert GetClosest(G, 99, 99) is not n
+    print("Closest node tests passed!")
+
+if __name__ == "__main__":
+    test_graph_indexes()
+    test_build_graph()
+    test_get_closest()
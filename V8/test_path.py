@@ -1,6 +1,7 @@
 from path import *
-from test_graph import G, G2
-from graph import GetReachableNodes, FindShortestPath, PlotReachability
+from test_graph import G, G2, CreateGraph_2
+from node import AddNeighbor
+from graph import Graph, GetReachableNodes, FindShortestPath, PlotReachability, AddNode, AddSegment
 
 def test_path_creation():
     # Test creating a path from a node
@@ -38,6 +39,57 @@ def test_path_operations():
     
     print("Path operations tests passed!")
 
+def prefix_cost(path, position):
+    # Cost from the origin to the node at a position, summed segment by segment
+    from node import Distance
+    return sum(Distance(a, b) for a, b in zip(path.nodes[:position], path.nodes[1:position + 1]))
+
+def test_path_sharing():
+    # Extending a path must not change it, and branches share the same prefix
+    node = G.list_of_nodes[0]
+    base = AddNodeToPath(Path(node), node.list_of_neighbors[0])
+    assert ContainsNode(base, node)
+    branch_1 = AddNodeToPath(base, G.list_of_nodes[5])
+    branch_2 = AddNodeToPath(base, G.list_of_nodes[6])
+    
+    assert len(base.nodes) == 2 and len(base) == 2
+    assert branch_1.nodes[:2] == base.nodes and branch_2.nodes[:2] == base.nodes
+    assert branch_1.nodes[-1] == G.list_of_nodes[5]
+    assert ContainsNode(branch_1, G.list_of_nodes[5]) and not ContainsNode(branch_1, G.list_of_nodes[6])
+    assert not ContainsNode(base, G.list_of_nodes[5])
+    assert CostToNode(branch_2, G.list_of_nodes[6]) == branch_2.cost
+    assert CostToNode(branch_2, base.nodes[1]) == base.cost
+    
+    # Revisiting a node keeps the cost to its first occurrence
+    loop = AddNodeToPath(branch_1, node)
+    assert CostToNode(loop, node) == 0
+    
+    # Random trees of branches agree with the node lists
+    import random
+    rng = random.Random(7)
+    paths = [Path(node)]
+    for _ in range(300):
+        paths.append(AddNodeToPath(rng.choice(paths), rng.choice(G.list_of_nodes)))
+    for path in rng.sample(paths, 50):
+        for other in G.list_of_nodes:
+            assert ContainsNode(path, other) == (other in path.nodes)
+            if other in path.nodes:
+                first = path.nodes.index(other)
+                assert abs(CostToNode(path, other) - prefix_cost(path, first)) < 1e-9
+    
+    # Nodes whose hashes agree in every bit still get their own costs
+    class SameHash(Node):
+        def __hash__(self):
+            return 12345
+    twins = [SameHash(f"T{i}", i, 0) for i in range(4)]
+    path = Path(node)
+    for twin in twins[:3]:
+        path = AddNodeToPath(path, twin)
+    assert all(ContainsNode(path, twin) for twin in twins[:3]) and not ContainsNode(path, twins[3])
+    assert [CostToNode(path, twin) for twin in twins[:3]] == [prefix_cost(path, i) for i in (1, 2, 3)]
+    
+    print("Path sharing tests passed!")
+
 def test_reachability():
     # Test reachability from a node
     start_node = G.list_of_nodes[0]
@@ -51,12 +103,42 @@ def test_reachability():
         assert neighbor in reachable
     
     # Test with a different graph
-    start_node = G2.list_of_nodes[0]
-    reachable = GetReachableNodes(G2, start_node)
+    G3 = CreateGraph_2()
+    start_node = G3.list_of_nodes[0]
+    reachable = GetReachableNodes(G3, start_node)
     assert start_node in reachable
-    
+
+    # The compiled graph is reused between queries and rebuilt after AddSegment
+    compiled = G3.compiled
+    GetReachableNodes(G3, start_node, max_hops=1)
+    assert G3.compiled is compiled
+    near = set(GetReachableNodes(G3, start_node, max_distance=0.0))
+    assert near == {start_node} and G3.compiled[4]
+    lone = Node("Q", 30, 30)
+    AddNode(G3, lone)
+    assert lone not in GetReachableNodes(G3, start_node)
+    AddSegment(G3, "XQ", start_node.name, lone.name)
+    assert lone in GetReachableNodes(G3, start_node)
+
     print("Reachability tests passed!")
 
+def test_reachability_after_neighbor_edits():
+    # Neighbor lists edited without AddSegment are seen by the next query
+    G3 = Graph()
+    a, b, c = Node("A", 0, 0), Node("B", 1, 0), Node("C", 2, 0)
+    for node in (a, b, c):
+        AddNode(G3, node)
+    AddSegment(G3, "AB", "A", "B")
+    assert set(GetReachableNodes(G3, a)) == {a, b}
+
+    AddNeighbor(b, c)
+    assert set(GetReachableNodes(G3, a)) == {a, b, c}
+
+    a.list_of_neighbors.remove(b)
+    assert GetReachableNodes(G3, a) == [a]
+
+    print("Reachability after neighbor edits tests passed!")
+
 def test_shortest_path():
     # Test finding shortest path between two nodes
     origin = G.list_of_nodes[0]
@@ -80,12 +162,36 @@ def test_shortest_path():
     
     print("Shortest path tests passed!")
 
+def test_shortest_path_is_optimal():
+    # Compare every origin/destination pair with Bellman-Ford distances
+    from node import Distance
+    for graph in (G, G2):
+        for origin in graph.list_of_nodes:
+            best = {origin: 0}
+            for _ in range(len(graph.list_of_nodes)):
+                for segment in graph.list_of_segments:
+                    a, b = segment.origin_node, segment.destination_node
+                    if a in best and best[a] + Distance(a, b) < best.get(b, float('inf')) - 1e-12:
+                        best[b] = best[a] + Distance(a, b)
+            for destination in graph.list_of_nodes:
+                path = FindShortestPath(graph, origin, destination)
+                if destination not in best:
+                    assert path is None
+                    continue
+                assert abs(path.cost - best[destination]) < 1e-9
+                assert abs(CostToNode(path, destination) - path.cost) < 1e-9
+    
+    print("Shortest path optimality tests passed!")
+
 def run_all_tests():
     print("Running path tests...")
     test_path_creation()
     test_path_operations()
+    test_path_sharing()
     test_reachability()
+    test_reachability_after_neighbor_edits()
     test_shortest_path()
+    test_shortest_path_is_optimal()
     print("All tests passed!")
 
 if __name__ == "__main__":
@@ -0,0 +1,451 @@
+from airSpace import AirSpace
+from routing import AStar, Dijkstra, ShortestPathTree, FindRoute, HaversineHeuristic
+from routing import BidirectionalAStar, BidirectionalDijkstra
+import os
+import random
+import numpy as np
+
+def load_airspace(directory: str, prefix: str, name: str) -> AirSpace:
+    """Load one of the bundled airspaces."""
+    base_dir = os.path.join(os.path.dirname(__file__), directory)
+    airspace = AirSpace(name=name)
+    assert airspace.load_data(os.path.join(base_dir, f"{prefix}_nav.txt"),
+                              os.path.join(base_dir, f"{prefix}_seg.txt"),
+                              os.path.join(base_dir, f"{prefix}_aer.txt"), use_snapshot=False)
+    return airspace
+
+CATALONIA = load_airspace("airspace_catalonia", "Cat", "Catalunya")
+EUROPE = load_airspace("ECAC airspace", "ECAC", "Europe")
+
+def check_route(graph, result, source, target, expected_distance):
+    """Check that a route is continuous and as short as expected."""
+    if expected_distance == float('inf'):
+        assert not result.found and result.distance == float('inf')
+        return
+    assert result.found
+    assert result.nodes[0] == source and result.nodes[-1] == target
+    total = sum(graph.edge_weight(u, v) for u, v in zip(result.nodes, result.nodes[1:]))
+    assert abs(total - result.distance) < 1e-6
+    assert abs(result.distance - expected_distance) < 1e-6
+
+def test_astar_matches_dijkstra():
+    # Compare point-to-point searches with a full shortest path tree
+    rng = random.Random(42)
+    for airspace in (CATALONIA, EUROPE):
+        graph = airspace.get_graph()
+        for _ in range(40):
+            source = rng.randrange(graph.num_nodes)
+            target = rng.randrange(graph.num_nodes)
+            dist, _ = ShortestPathTree(graph, source)
+            check_route(graph, AStar(graph, source, target), source, target, dist[target])
+            check_route(graph, Dijkstra(graph, source, target), source, target, dist[target])
+    print("A*/Dijkstra tests passed!")
+
+def test_heuristic_is_consistent():
+    # h(u) <= w(u, v) + h(v) on every edge, so A* never reopens a node
+    graph = EUROPE.get_graph()
+    h = HaversineHeuristic(graph, 0)
+    for u in range(graph.num_nodes):
+        targets, weights = graph.neighbors(u)
+        for v, w in zip(targets, weights):
+            assert h(u) <= w + h(int(v)) + 1e-9
+    print("Heuristic tests passed!")
+
+def test_find_route():
+    # FindRoute works on navigation numbers
+    store = CATALONIA.get_store()
+    origin, destination = CATALONIA.nav_points[0], CATALONIA.nav_points[-1]
+    result = FindRoute(CATALONIA, origin.number, destination.number)
+    if result.found:
+        numbers = result.numbers(store)
+        assert numbers[0] == origin.number and numbers[-1] == destination.number
+        for a, b in zip(numbers, numbers[1:]):
+            assert any(s.destination_number == b for s in CATALONIA.get_segments_from(a))
+    try:
+        FindRoute(CATALONIA, origin.number, -1)
+        assert False, "Expected ValueError for an unknown point"
+    except ValueError:
+        pass
+    print("FindRoute tests passed!")
+
+def test_shortest_path_tree_cutoff():
+    graph = CATALONIA.get_graph()
+    full, _ = ShortestPathTree(graph, 0)
+    cut, parent = ShortestPathTree(graph, 0, max_distance=200.0)
+    for v in range(graph.num_nodes):
+        if full[v] <= 200.0:
+            assert cut[v] == full[v]
+        else:
+            assert cut[v] == float('inf') and parent[v] == -1
+    print("Shortest path tree tests passed!")
+
+def _bfs_hops(airspace, origins):
+    """Reference breadth-first search: {number: hops} over the segment lists."""
+    from collections import deque
+    hops = {number: 0 for number in origins}
+    queue = deque(origins)
+    while queue:
+        current = queue.popleft()
+        for segment in airspace.get_segments_from(current):
+            if segment.destination_number not in hops:
+                hops[segment.destination_number] = hops[current] + 1
+                queue.append(segment.destination_number)
+    return hops
+
+def test_reachability_engine():
+    from reachability import ReachableMask
+    for airspace in (CATALONIA, EUROPE):
+        store = airspace.get_store()
+        origins = [airspace.nav_points[0].number, airspace.nav_points[len(airspace.nav_points) // 2].number]
+        hops = _bfs_hops(airspace, origins)
+        
+        mask = airspace.get_reachable(origins)
+        assert set(int(n) for n in store.numbers[mask]) == set(hops)
+        
+        mask = airspace.get_reachable(origins, max_hops=2)
+        assert set(int(n) for n in store.numbers[mask]) == {n for n, h in hops.items() if h <= 2}
+        
+        graph = airspace.get_graph()
+        dist, _ = ShortestPathTree(graph, [store.index_of(n) for n in origins])
+        mask = airspace.get_reachable(origins, max_distance=300.0)
+        assert (mask == (np.asarray(dist) <= 300.0)).all()
+        
+        # Reverse search: nodes that can reach the origin
+        target = store.index_of(origins[0])
+        reverse = ReachableMask(graph, target, reverse=True)
+        for i in np.flatnonzero(reverse)[:20]:
+            assert ReachableMask(graph, int(i))[target]
+    print("Reachability engine tests passed!")
+
+def test_batch_routing():
+    from batchRouting import BatchRouter, GroupByOrigin, RouteBatch, _AttachSharedGraph, _ShareGraph
+    import batchRouting
+    rng = random.Random(7)
+    graph = EUROPE.get_graph()
+    origins = [rng.randrange(graph.num_nodes) for _ in range(6)]
+    pairs = [(rng.choice(origins), rng.randrange(graph.num_nodes)) for _ in range(60)]
+    pairs += [(rng.randrange(graph.num_nodes), rng.randrange(graph.num_nodes)) for _ in range(10)]
+    pairs.append((origins[0], origins[0]))
+    chunks = GroupByOrigin(pairs, chunk_size=16)
+    assert sorted(p for chunk in chunks for _, queries in chunk for p, _ in queries) == list(range(len(pairs)))
+    
+    trees = {}
+    for workers in (1, 2):
+        results = list(BatchRouter(graph, workers=workers, chunk_size=16).route(pairs))
+        assert len(results) == len(pairs)
+        for (source, target), result in zip(pairs, results):
+            if source not in trees:
+                trees[source] = ShortestPathTree(graph, source)[0]
+            check_route(graph, result, source, target, trees[source][target])
+    
+    # Workers started without fork rebuild the graph from shared memory
+    blocks = []
+    try:
+        _AttachSharedGraph(graph.num_nodes, _ShareGraph(graph, blocks))
+        chunk, = GroupByOrigin(pairs[:5])
+        for position, route in batchRouting.RouteChunk(chunk):
+            source, target = pairs[position]
+            check_route(graph, route, source, target, trees[source][target])
+    finally:
+        for block in batchRouting.WorkerGraph().cache['shared_blocks'] + blocks:
+            block.close()
+        for block in blocks:
+            block.unlink()
+    
+    # Navigation numbers, with an unknown point in the middle
+    store = EUROPE.get_store()
+    numbers = [(int(store.numbers[s]), int(store.numbers[t])) for s, t in pairs[:3]]
+    results = list(RouteBatch(EUROPE, numbers[:1] + [(-5, numbers[0][1])] + numbers[1:], workers=1))
+    assert not results[1].found and len(results) == 4
+    assert [r.distance for r in results[:1] + results[2:]] == [trees[s][t] for s, t in pairs[:3]]
+    print("Batch routing tests passed!")
+
+def test_distance_matrix():
+    import tempfile
+    from distanceMatrix import AirportEndpoints
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for airspace in (CATALONIA, EUROPE):
+            graph = airspace.get_graph()
+            matrix = airspace.get_distance_matrix(workers=2, cache_dir=cache_dir)
+            icaos, departures, arrivals = AirportEndpoints(airspace)
+            assert matrix.icaos == icaos and matrix.distances.shape == (len(icaos), len(icaos))
+            assert (np.diag(matrix.distances) == 0).all()
+            for i in range(0, len(icaos), 5):
+                dist, _ = ShortestPathTree(graph, departures[i])
+                for j in range(len(icaos)):
+                    if i == j:
+                        continue
+                    expected = min((dist[t] for t in arrivals[j]), default=float('inf'))
+                    assert matrix.distance(icaos[i], icaos[j]) == expected
+                    route = matrix.route(icaos[i], icaos[j])
+                    if route.found:
+                        assert route.nodes[0] in departures[i] and route.nodes[-1] in arrivals[j]
+                        check_route(graph, route, route.nodes[0], route.nodes[-1], expected)
+            
+            # Served from memory, then from the cache file by a fresh computation
+            assert airspace.get_distance_matrix() is matrix
+            subset = icaos[:3]
+            small = airspace.get_distance_matrix(subset, workers=1, cache_dir=cache_dir)
+            assert (small.distances == matrix.distances[:3, :3]).all()
+            cached = airspace.get_distance_matrix(subset, cache_dir=cache_dir)
+            assert cached.version == small.version and (cached.parents == small.parents).all()
+        try:
+            EUROPE.get_distance_matrix(["NOWHERE"], cache_dir=cache_dir)
+            assert False, "unknown airport accepted"
+        except ValueError:
+            pass
+    print("Distance matrix tests passed!")
+
+def test_alt_landmarks():
+    import tempfile
+    from landmarks import BuildLandmarks
+    rng = random.Random(3)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for airspace in (CATALONIA, EUROPE):
+            graph = airspace.get_graph()
+            for method in ('farthest', 'airports'):
+                table = BuildLandmarks(airspace, 8, method, cache_dir=cache_dir)
+                assert len(table) == 8 and len(set(table.landmarks.tolist())) == 8
+                for i, landmark in enumerate(table.landmarks):
+                    assert table.forward[i][landmark] == 0 and table.backward[i][landmark] == 0
+                cached = BuildLandmarks(airspace, 8, method, cache_dir=cache_dir)
+                assert (cached.landmarks == table.landmarks).all() and (cached.forward == table.forward).all()
+            
+            # Bounds are admissible and consistent on every edge
+            table = airspace.get_landmarks(8, cache_dir=cache_dir)
+            origins = np.repeat(np.arange(graph.num_nodes), np.diff(graph.offsets))
+            for _ in range(5):
+                target = rng.randrange(graph.num_nodes)
+                h = table.heuristic(target, rng.randrange(graph.num_nodes))
+                dist, _ = ShortestPathTree(graph, target, reverse=True)
+                values = [h(u) for u in range(graph.num_nodes)]
+                assert all(values[u] <= dist[u] + 1e-9 for u in range(graph.num_nodes))
+                for u, v, w in zip(origins, graph.targets, graph.weights):
+                    assert values[u] <= w + values[v] + 1e-9
+            
+            airspace.get_landmarks(cache_dir=cache_dir)  # The default table 'alt' routes with
+            for _ in range(30):
+                source, target = rng.randrange(graph.num_nodes), rng.randrange(graph.num_nodes)
+                o, d = int(airspace.get_store().numbers[source]), int(airspace.get_store().numbers[target])
+                expected = Dijkstra(graph, source, target)
+                alt = FindRoute(airspace, o, d, 'alt')
+                check_route(graph, alt, source, target, expected.distance)
+                assert alt.settled <= expected.settled
+    print("ALT landmark tests passed!")
+
+def test_contraction_hierarchy():
+    import tempfile
+    from contraction import BuildContractionHierarchy, ContractionHierarchy
+    from navSegment import NavSegment
+    rng = random.Random(5)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for airspace in (CATALONIA, EUROPE):
+            graph = airspace.get_graph()
+            hierarchy = airspace.build_contraction_hierarchy(cache_dir=cache_dir)
+            with_core = BuildContractionHierarchy(graph, core_degree=4)
+            assert hierarchy.core_size == 0 and with_core.core_size > 0
+            for _ in range(60):
+                source, target = rng.randrange(graph.num_nodes), rng.randrange(graph.num_nodes)
+                expected = Dijkstra(graph, source, target).distance
+                check_route(graph, hierarchy.query(source, target), source, target, expected)
+                check_route(graph, with_core.query(source, target), source, target, expected)
+            
+            # Written to the cache, and saved and loaded explicitly
+            path = os.path.join(cache_dir, "hierarchy.npz")
+            assert hierarchy.save(path)
+            loaded = ContractionHierarchy.load(path)
+            assert loaded.version == hierarchy.version and (loaded.rank == hierarchy.rank).all()
+            assert all((a == b).all() for a, b in zip(loaded.up, hierarchy.up))
+            assert airspace.load_contraction_hierarchy(path)
+        
+        # A hierarchy that no longer matches the graph is not used
+        airspace = load_airspace("airspace_catalonia", "Cat", "Catalunya")
+        airspace.build_contraction_hierarchy(cache_dir=cache_dir)
+        path = os.path.join(cache_dir, "before.npz")
+        airspace.get_contraction_hierarchy().save(path)
+        store = airspace.get_store()
+        a, b = int(store.numbers[0]), int(store.numbers[-1])
+        assert airspace.add_segment(NavSegment(a, b, 0.5))
+        assert FindRoute(airspace, a, b, 'ch').distance == 0.5
+        assert not airspace.load_contraction_hierarchy(path)
+        assert airspace.build_contraction_hierarchy(cache_dir=cache_dir).query(
+            store.index_of(a), store.index_of(b)).distance == 0.5
+    print("Contraction hierarchy tests passed!")
+
+def test_bidirectional_search():
+    rng = random.Random(6)
+    for airspace in (CATALONIA, EUROPE):
+        graph = airspace.get_graph()
+        store = airspace.get_store()
+        settled = {'dijkstra': 0, 'bidijkstra': 0, 'biastar': 0}
+        for _ in range(60):
+            source, target = rng.randrange(graph.num_nodes), rng.randrange(graph.num_nodes)
+            o, d = int(store.numbers[source]), int(store.numbers[target])
+            expected = Dijkstra(graph, source, target)
+            settled['dijkstra'] += expected.settled
+            for method in ('bidijkstra', 'biastar'):
+                result = FindRoute(airspace, o, d, method)
+                check_route(graph, result, source, target, expected.distance)
+                settled[method] += result.settled
+        assert settled['biastar'] < settled['bidijkstra'] < settled['dijkstra']
+    
+    # Direct and trivial queries
+    graph = CATALONIA.get_graph()
+    u = next(u for u in range(graph.num_nodes) if graph.out_degree()[u])
+    v = int(graph.neighbors(u)[0][0])
+    assert BidirectionalDijkstra(graph, u, v).distance == Dijkstra(graph, u, v).distance
+    assert BidirectionalAStar(graph, u, u).nodes == [u]
+    print("Bidirectional search tests passed!")
+
+def test_k_shortest_routes():
+    from csrGraph import CSRGraph
+    from alternatives import KShortestRoutes, AlternativeRoutes, AirportAlternativeRoutes
+    
+    def all_routes(graph, sources, targets):
+        # Every loopless route by depth-first enumeration, shortest first
+        routes = []
+        def extend(nodes, cost):
+            if nodes[-1] in targets:
+                routes.append(cost)
+                return
+            for v, w in zip(*graph.neighbors(nodes[-1])):
+                if int(v) not in nodes:
+                    extend(nodes + [int(v)], cost + float(w))
+        for source in sources:
+            extend([source], 0.0)
+        return sorted(routes)
+    
+    rng = random.Random(8)
+    for _ in range(100):
+        edges = {(rng.randrange(9), rng.randrange(9)) for _ in range(rng.randrange(10, 30))}
+        edges = sorted((u, v) for u, v in edges if u != v)
+        graph = CSRGraph(9, [u for u, _ in edges], [v for _, v in edges],
+                         [float(rng.randrange(1, 10)) for _ in edges])
+        sources = rng.sample(range(9), rng.choice([1, 2]))
+        targets = [t for t in rng.sample(range(9), rng.choice([1, 2])) if t not in sources]
+        k = rng.randrange(1, 12)
+        routes = KShortestRoutes(graph, sources, targets, k)
+        assert [r.distance for r in routes] == all_routes(graph, sources, set(targets))[:k]
+        assert len({tuple(r.nodes) for r in routes}) == len(routes)
+    
+    graph = EUROPE.get_graph()
+    store = EUROPE.get_store()
+    for _ in range(10):
+        source, target = rng.randrange(graph.num_nodes), rng.randrange(graph.num_nodes)
+        o, d = int(store.numbers[source]), int(store.numbers[target])
+        routes = AlternativeRoutes(EUROPE, o, d, 10)
+        expected = Dijkstra(graph, source, target).distance
+        if expected == float('inf'):
+            assert routes == []
+            continue
+        check_route(graph, routes[0], source, target, expected)
+        for route in routes:
+            check_route(graph, route, source, target, route.distance)
+            assert len(set(route.nodes)) == len(route.nodes)
+        assert all(a.distance <= b.distance for a, b in zip(routes, routes[1:]))
+        assert len({tuple(r.nodes) for r in routes}) == len(routes)
+        
+        # Each accepted route shares at most half its length with every shorter one
+        diverse = AlternativeRoutes(EUROPE, o, d, 5, min_dissimilarity=0.5)
+        assert diverse[0].nodes == routes[0].nodes
+        for i, route in enumerate(diverse):
+            for other in diverse[:i]:
+                shared = {(u, v) for u, v in zip(other.nodes, other.nodes[1:])}
+                overlap = sum(graph.edge_weight(u, v) for u, v in zip(route.nodes, route.nodes[1:])
+                              if (u, v) in shared)
+                assert overlap <= 0.5 * route.distance + 1e-6
+    
+    # Airports: from any SID to any STAR, matching the distance matrix
+    matrix = CATALONIA.get_distance_matrix(use_cache=False)
+    origin, destination = next((o, d) for o in matrix.icaos for d in matrix.icaos
+                               if o != d and np.isfinite(matrix.distance(o, d)))
+    routes = AirportAlternativeRoutes(CATALONIA, origin, destination, 3)
+    assert abs(routes[0].distance - matrix.distance(origin, destination)) < 1e-6
+    try:
+        AirportAlternativeRoutes(CATALONIA, origin, "NOPE", 3)
+        assert False, "Expected ValueError for an unknown airport"
+    except ValueError:
+        pass
+    print("K shortest routes tests passed!")
+
+def test_pareto_routes():
+    from csrGraph import CSRGraph
+    from paretoRouting import ParetoRoutes, FindParetoRoutes, SegmentCosts
+    from aircraft import A320_CRUISING_SPEED_KMPH
+    
+    def pareto_front(graph, costs, source, target):
+        # Non-dominated cost vectors of every loopless route, by enumeration
+        totals = set()
+        edge_costs = costs[graph.edge_ids]
+        def extend(nodes, cost):
+            if nodes[-1] == target:
+                totals.add(tuple(cost))
+                return
+            for k in range(graph.offsets[nodes[-1]], graph.offsets[nodes[-1] + 1]):
+                if int(graph.targets[k]) not in nodes:
+                    extend(nodes + [int(graph.targets[k])], cost + edge_costs[k])
+        extend([source], np.zeros(costs.shape[1]))
+        return sorted(c for c in totals if not any(o != c and all(a <= b for a, b in zip(o, c)) for o in totals))
+    
+    rng = random.Random(9)
+    for _ in range(100):
+        edges = sorted((u, v) for u, v in {(rng.randrange(8), rng.randrange(8)) for _ in range(20)} if u != v)
+        costs = np.array([[rng.randrange(1, 6) for _ in range(3)] for _ in edges], dtype=float)
+        graph = CSRGraph(8, [u for u, _ in edges], [v for _, v in edges], costs[:, 0])
+        source, target = rng.sample(range(8), 2)
+        routes = ParetoRoutes(graph, source, target, costs)
+        assert [r.costs for r in routes] == pareto_front(graph, costs, source, target)
+        for route in routes:
+            assert route.nodes[0] == source and route.nodes[-1] == target
+    
+    graph = EUROPE.get_graph()
+    store = EUROPE.get_store()
+    speeds = np.random.default_rng(0).uniform(600, 900, graph.num_edges)
+    for _ in range(10):
+        source, target = rng.randrange(graph.num_nodes), rng.randrange(graph.num_nodes)
+        o, d = int(store.numbers[source]), int(store.numbers[target])
+        expected = Dijkstra(graph, source, target).distance
+        
+        # Constant speed and fuel flow: one route, as long as the shortest
+        routes = FindParetoRoutes(EUROPE, o, d)
+        if expected == float('inf'):
+            assert routes == []
+            continue
+        assert len(routes) == 1
+        check_route(graph, routes[0], source, target, expected)
+        assert abs(routes[0].costs[1] - expected / A320_CRUISING_SPEED_KMPH) < 1e-9
+        
+        # Per-segment speeds: the front trades distance for time, and bounded labels keep a subset
+        front = FindParetoRoutes(EUROPE, o, d, ('distance', 'time'), speeds=speeds)
+        bounded = FindParetoRoutes(EUROPE, o, d, ('distance', 'time'), max_labels=2, speeds=speeds)
+        assert abs(front[0].distance - expected) < 1e-6 and len(bounded) <= 2
+        assert {r.costs for r in bounded} <= {r.costs for r in front}
+        for a, b in zip(front, front[1:]):
+            assert a.costs[0] <= b.costs[0] and a.costs[1] > b.costs[1]
+        for route in front:
+            check_route(graph, route, source, target, route.distance)
+    try:
+        SegmentCosts(EUROPE, ('distance', 'noise'))
+        assert False, "Expected ValueError for an unknown criterion"
+    except ValueError:
+        pass
+    print("Pareto routing tests passed!")
+
+def run_all_tests():
+    print("Running routing tests...")
+    test_astar_matches_dijkstra()
+    test_heuristic_is_consistent()
+    test_find_route()
+    test_shortest_path_tree_cutoff()
+    test_reachability_engine()
+    test_batch_routing()
+    test_distance_matrix()
+    test_alt_landmarks()
+    test_contraction_hierarchy()
+    test_bidirectional_search()
+    test_k_shortest_routes()
+    test_pareto_routes()
+    print("All tests passed!")
+
+if __name__ == "__main__":
+    run_all_tests()